@@ -0,0 +1,242 @@
+"""
+Benchmarks of the public functions of stock_analyzer
+
+Every function is run on synthetic OHLCV data over a grid of row and column
+counts. The best wall time of a few repeats gives the throughput in values
+per second, and a separate run under tracemalloc gives the peak memory
+allocated by the call.
+
+Usage
+-----
+Run the benchmarks and print the results::
+
+    python -m benchmarks.bench_stock_analyzer
+
+Store the results as the new baseline::
+
+    python -m benchmarks.bench_stock_analyzer --save benchmarks/baseline.json
+
+Fail when any case is slower, or allocates more memory, than the baseline
+by more than the threshold factor::
+
+    python -m benchmarks.bench_stock_analyzer --compare \
+benchmarks/baseline.json --threshold 1.5
+
+Baselines depend on the machine, so compare against a baseline recorded on
+the same machine.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from stock_analyzer import correlation, stock_analyzer
+
+ROWS = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+COLUMNS = [1, 10, 100, 1000]
+FIELDS = ["Close", "Open", "High", "Low", "Volume"]
+# differences below these are timer and allocator noise
+NOISE = {"seconds": 0.005, "peak_bytes": 2 ** 20}
+
+
+def syntheticOHLCV(rows, columns, seed=0):
+    """
+    One-minute OHLCV bars of geometric random walks
+
+    Tickers are added until there are enough columns: the first ticker has
+    the columns Close, Open, High, Low and Volume, the second Close1,
+    Open1, ... and so on. With one column only Close is returned.
+
+    Parameters
+    ----------
+    rows : int number of bars columns : int number of columns seed : int
+        seed of the random generator
+
+    Returns
+    -------
+    pandas.core.frame.DataFrame bars indexed by minute
+    """
+    rng = np.random.default_rng(seed)
+    tickers = -(-columns // len(FIELDS))
+    close = 100 * np.exp(
+        np.cumsum(rng.normal(0, 0.01, size=(rows, tickers)), axis=0)
+    )
+    open_ = close * np.exp(rng.normal(0, 0.002, size=(rows, tickers)))
+    spread = np.abs(rng.normal(0, 0.005, size=(rows, tickers)))
+    fields = {
+        "Close": close,
+        "Open": open_,
+        "High": np.maximum(close, open_) * (1 + spread),
+        "Low": np.minimum(close, open_) * (1 - spread),
+        "Volume": rng.lognormal(15, 0.5, size=(rows, tickers)).round(),
+    }
+    data = {
+        field + (str(ticker) if ticker else ""): fields[field][:, ticker]
+        for ticker in range(tickers)
+        for field in FIELDS
+    }
+    index = pd.date_range("2000-01-01", periods=rows, freq="min", name="Date")
+    return pd.DataFrame(data, index=index).iloc[:, :columns]
+
+
+def _cases(data):
+    names = list(data.columns)
+    yield "summaryStats", lambda: stock_analyzer.summaryStats(data, names)
+    yield "movingAverage", lambda: stock_analyzer.movingAverage(
+        data, 50, ["movingAverage" + name for name in names]
+    )
+    yield "exponentialSmoothing", lambda: stock_analyzer.exponentialSmoothing(
+        data, ["exponentialSmoothing" + name for name in names], 0.3
+    )
+    yield "returnCorrelation", lambda: correlation.returnCorrelation(data)
+    # the vis functions plot a single column whatever the width of the data
+    if len(names) == 1:
+        yield "visMovingAverage", lambda: stock_analyzer.visMovingAverage(
+            data, "Close", 50
+        )
+        yield "visExpSmoothing", lambda: stock_analyzer.visExpSmoothing(
+            data, "Close", 0.3
+        )
+
+
+def _measure(function, repeat):
+    # one untimed call first, so that lazy imports and first-call setup are
+    # not counted in the timed runs
+    function()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(times), peak
+
+
+def runBenchmarks(rows=ROWS, columns=COLUMNS, max_elements=10 ** 7, repeat=3):
+    """
+    Time every public function on every size of the grid
+
+    Parameters
+    ----------
+    rows : list row counts columns : list column counts max_elements : int
+        sizes with more rows times columns are skipped repeat : int number
+        of timed runs per case, the best is kept
+
+    Returns
+    -------
+    list of dict one record per function and size with the best time in
+        seconds, the throughput in values per second and the peak memory
+        in bytes
+    """
+    results = []
+    for n_rows in rows:
+        for n_columns in columns:
+            if n_rows * n_columns > max_elements:
+                continue
+            data = syntheticOHLCV(n_rows, n_columns)
+            for name, function in _cases(data):
+                seconds, peak = _measure(function, repeat)
+                results.append(
+                    {
+                        "function": name,
+                        "rows": n_rows,
+                        "columns": n_columns,
+                        "seconds": seconds,
+                        "values_per_second": n_rows * n_columns / seconds,
+                        "peak_bytes": peak,
+                    }
+                )
+                print(
+                    f"{name:>22} {n_rows:>10} x {n_columns:<5}"
+                    f"{seconds:10.4f} s {n_rows * n_columns / seconds:12.3e}"
+                    f" values/s {peak / 2 ** 20:10.1f} MiB",
+                    flush=True,
+                )
+    return results
+
+
+def compareResults(results, baseline, threshold=1.5):
+    """
+    Cases that are slower or need more memory than the baseline by more
+    than ``threshold`` times
+
+    Times and sizes below the noise floor are raised to it first, so very
+    fast cases do not fail on timer jitter.
+
+    Returns
+    -------
+    list of str a description of every regression
+    """
+    expected = {
+        (case["function"], case["rows"], case["columns"]): case
+        for case in baseline["results"]
+    }
+    regressions = []
+    for case in results:
+        key = (case["function"], case["rows"], case["columns"])
+        if key not in expected:
+            continue
+        for metric in ["seconds", "peak_bytes"]:
+            ratio = max(case[metric], NOISE[metric]) / max(
+                expected[key][metric], NOISE[metric]
+            )
+            if ratio > threshold:
+                regressions.append(
+                    f"{key[0]} on {key[1]} x {key[2]}: {metric} went from "
+                    f"{expected[key][metric]:.4g} to {case[metric]:.4g} "
+                    f"({ratio:.2f} times)"
+                )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=ROWS)
+    parser.add_argument("--columns", type=int, nargs="+", default=COLUMNS)
+    parser.add_argument("--max-elements", type=int, default=10 ** 7)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", help="write the results to this file")
+    parser.add_argument("--compare", help="baseline file to compare with")
+    parser.add_argument("--threshold", type=float, default=1.5)
+    args = parser.parse_args(argv)
+
+    results = runBenchmarks(
+        args.rows, args.columns, args.max_elements, args.repeat
+    )
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(
+                {
+                    "machine": platform.machine(),
+                    "python": platform.python_version(),
+                    "numpy": np.__version__,
+                    "pandas": pd.__version__,
+                    "results": results,
+                },
+                file,
+                indent=1,
+            )
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compareResults(
+                results, json.load(file), args.threshold
+            )
+        for regression in regressions:
+            print("REGRESSION", regression)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
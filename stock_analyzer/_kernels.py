@@ -0,0 +1,1609 @@
+import numpy as np
+
+
+def _output(values, out):
+    """
+    Output array for a kernel: ``out`` when given, otherwise a new array of
+    the float type of ``values`` (float64 for non-float input)
+    """
+    if out is not None:
+        return out
+    dtype = values.dtype if values.dtype.kind == "f" else np.float64
+    return np.empty(values.shape, dtype=dtype)
+
+
+def rollingMean(values, window, stable=False, block=None, out=None):
+    """
+    Trailing moving average of every column of a 2-D array in O(n)
+
+    The first ``window - 1`` rows are warmed up by padding the series with
+    its first value, which matches the behaviour of ``movingAverage``.
+    Apart from ``out``, only buffers of a few thousand rows are allocated.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        2-D float array of shape (rows, columns), rows ordered in time
+    window : int
+        size of the sliding window
+    stable : bool
+        re-base the cumulative sum every ``block`` rows so that rounding
+        error does not grow with the length of the series. Always done for
+        float32 output, whose block sums are accumulated in float64
+    block : int or None
+        number of rows between two re-bases when ``stable`` is True, and
+        of the scratch buffers otherwise. Defaults to
+        ``max(4 * window, 4096)``
+    out : numpy.ndarray or None
+        array to write the result into. It may be ``values`` itself
+
+    Returns
+    -------
+    numpy.ndarray
+        array of the same shape as ``values`` holding the moving averages
+    """
+    out = _output(values, out)
+    n = values.shape[0]
+    if n == 0:
+        return out
+    if block is None:
+        block = max(4 * window, 4096)
+
+    # Shifting by the first row turns the warm-up padding into zeros and
+    # keeps the magnitude of the running sum small.
+    first = values[0].astype(out.dtype)
+    np.subtract(values, first, out=out)
+
+    if not stable and out.dtype == np.float64:
+        np.cumsum(out, axis=0, out=out)
+        # subtract the sum lagged by one window, from the bottom up so that
+        # the lagged rows are still untouched when they are read
+        for stop in range(n, window, -block):
+            start = max(stop - block, window)
+            out[start:stop] -= out[start - window: stop - window].copy()
+    else:
+        tail = out[:0].copy()
+        for start in range(0, n, block):
+            stop = min(start + block, n)
+            seg = out[start:stop]
+            extended = np.concatenate([tail, seg])
+            tail = extended[-window:].copy()
+            csum = np.cumsum(extended, axis=0, dtype=np.float64)
+            lead = len(extended) - len(seg)
+            # the window sums are taken in float64 and rounded to the output
+            # type once, as the running sums are far larger than them
+            sums = csum[lead:].copy()
+            head = max(window - lead, 0)
+            if head < len(seg):
+                sums[head:] -= csum[lead + head - window: len(csum) - window]
+            seg[...] = sums
+
+    out /= window
+    out += first
+    return out
+
+
+def expSmoothing(values, alpha, initial=None, out=None):
+    """
+    Exponential smoothing of every column of a 2-D array
+
+    Evaluates ``S_t = alpha * y_t + (1 - alpha) * S_{t-1}`` with
+    ``S_{-1} = y_0``. The recursion is unrolled in closed form over blocks
+    of rows, so the Python-level work is one iteration per block rather
+    than one per row. Block length is chosen so that the growing weights
+    ``(1 - alpha) ** -k`` never overflow.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        2-D float array of shape (rows, columns), rows ordered in time
+    alpha : float
+        the smoothing parameter, between 0 and 1
+    initial : numpy.ndarray or None
+        smoothed value of the row preceding ``values``. Defaults to the
+        first row, i.e. ``S_{-1} = y_0``
+    out : numpy.ndarray or None
+        array to write the result into. It may be ``values`` itself
+
+    Returns
+    -------
+    numpy.ndarray
+        array of the same shape as ``values`` holding the smoothed values
+    """
+    values = np.asarray(values)
+    out = _output(values, out)
+    n = values.shape[0]
+    if n == 0:
+        return out
+    prev = np.array(values[0] if initial is None else initial, out.dtype)
+    if alpha == 1:
+        out[...] = values
+        return out
+
+    beta = 1.0 - alpha
+    if beta == 1:
+        out[...] = prev
+        return out
+
+    # beta ** -block stays far below the largest float64
+    limit = np.log(np.finfo(np.float64).max) / 3
+    block = int(max(1, min(n, np.floor(limit / -np.log(beta)))))
+    scratch = None
+    if out.dtype != np.float64:
+        # like rollingMean, float32 blocks are accumulated in float64 and
+        # rounded to the output type once
+        block = min(block, 4096)
+        scratch = np.empty((block,) + values.shape[1:])
+        prev = np.array(values[0] if initial is None else initial, np.float64)
+    steps = np.arange(block, dtype=np.float64)
+    growth = beta ** -steps
+    decay = beta ** steps
+    shape = (-1,) + (1,) * (values.ndim - 1)
+    growth = growth.reshape(shape)
+    decay = decay.reshape(shape)
+
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        m = stop - start
+        seg = out[start:stop] if scratch is None else scratch[:m]
+        np.multiply(values[start:stop], growth[:m], out=seg)
+        np.cumsum(seg, axis=0, out=seg)
+        seg *= alpha
+        seg += beta * prev
+        seg *= decay[:m]
+        if scratch is not None:
+            out[start:stop] = seg
+            prev = seg[-1].copy()
+        else:
+            prev = seg[-1]
+    return out
+
+
+def _oneStepErrors(values, fits, prev, errors=None, mask=None):
+    """
+    Sums of the squared and absolute one-step-ahead errors of a block of
+    fits of shape (parameters, rows, columns), whose first row is predicted
+    by ``prev``. ``errors`` is an optional scratch array of that shape and
+    the errors of the rows where the optional ``mask`` is False are left out
+    """
+    if errors is None:
+        errors = np.empty(fits.shape)
+    np.subtract(values[:1], prev[:, None], out=errors[:, :1])
+    np.subtract(values[1:], fits[:, :-1], out=errors[:, 1:])
+    if mask is not None:
+        errors *= mask
+    squared = np.einsum("pnk,pnk->pk", errors, errors)
+    np.abs(errors, out=errors)
+    return squared, errors.sum(axis=1)
+
+
+def rollingMeanSweep(values, windows, fits=True):
+    """
+    ``rollingMean`` of a 2-D array for many windows from one cumulative sum
+
+    Besides the moving averages, the one-step-ahead errors of every window
+    are summed: the average up to row ``t - 1`` predicts row ``t``.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        2-D float array of shape (rows, columns), rows ordered in time
+    windows : sequence of int
+        window sizes
+    fits : bool
+        return the moving averages. With False only the errors are
+        computed and memory stays O(rows * columns)
+
+    Returns
+    -------
+    tuple
+        the moving averages of shape (windows, rows, columns) (None when
+        ``fits`` is False), and the sums of the squared and of the absolute
+        one-step-ahead errors, of shape (windows, columns)
+    """
+    n, k = values.shape
+    p = len(windows)
+    result = np.empty((p, n, k)) if fits else None
+    sse = np.zeros((p, k))
+    sae = np.zeros((p, k))
+    if n == 0:
+        return result, sse, sae
+
+    first = values[0]
+    csum = np.zeros((n + 1, k))
+    np.cumsum(values - first, axis=0, out=csum[1:])
+    fit = np.empty((n, k))
+    for i, window in enumerate(windows):
+        head = min(window - 1, n)
+        fit[:head] = csum[1: head + 1]
+        if head < n:
+            np.subtract(csum[window:], csum[: n + 1 - window], out=fit[head:])
+        fit /= window
+        fit += first
+        squared, absolute = _oneStepErrors(values, fit[None], first[None])
+        sse[i] = squared[0]
+        sae[i] = absolute[0]
+        if fits:
+            result[i] = fit
+    return result, sse, sae
+
+
+def expSmoothingSweep(values, alphas, fits=True, block=None, mask=None):
+    """
+    ``expSmoothing`` of a 2-D array for many alphas in one batched pass
+
+    All smoothing parameters are evaluated together with the blocked closed
+    form of ``expSmoothing``, the block length being set by the largest
+    alpha. The one-step-ahead errors of every alpha are summed on the way:
+    the smoothed value of row ``t - 1`` predicts row ``t``.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        2-D float array of shape (rows, columns), rows ordered in time
+    alphas : numpy.ndarray
+        smoothing parameters between 0 and 1, either of shape (alphas,) or
+        of shape (alphas, columns) to use different ones for every column
+    fits : bool
+        return the smoothed values. With False only the errors are computed
+        and memory stays O(alphas * columns * block)
+    block : int or None
+        largest number of rows per block. Defaults to about one million
+        elements per block
+    mask : numpy.ndarray or None
+        boolean array of the shape of ``values``, False for the rows to
+        leave out of the errors. Defaults to all rows
+
+    Returns
+    -------
+    tuple
+        the smoothed values of shape (alphas, rows, columns) (None when
+        ``fits`` is False), and the sums of the squared and of the absolute
+        one-step-ahead errors, of shape (alphas, columns)
+    """
+    n, k = values.shape
+    alphas = np.asarray(alphas, dtype=np.float64)
+    if alphas.ndim == 1:
+        alphas = alphas[:, None]
+    p = len(alphas)
+    result = np.empty((p, n, k)) if fits else None
+    sse = np.zeros((p, k))
+    sae = np.zeros((p, k))
+    if n == 0 or p == 0:
+        return result, sse, sae
+
+    # alpha = 1 copies the data; its beta is replaced to keep the weights
+    # finite and the fits are overwritten
+    copies = (alphas == 1)[:, None]
+    beta = np.where(alphas == 1, 1.0, 1.0 - alphas)
+    limit = np.log(np.finfo(np.float64).max) / 3
+    rate = -np.log(beta).min()
+    if block is None:
+        block = max(1, 2 ** 20 // max(p * k, 1))
+    if rate > 0:
+        block = min(block, max(1, int(np.floor(limit / rate))))
+    block = min(block, n)
+    steps = np.arange(block, dtype=np.float64)[None, :, None]
+    growth = beta[:, None] ** -steps
+    decay = beta[:, None] ** steps
+    weight = alphas[:, None]
+
+    first = values[0]
+    centered = values - first
+    prev = np.zeros((p, k))
+    buffer = np.empty((p, block, k))
+    errors = np.empty((p, block, k))
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        m = stop - start
+        seg = buffer[:, :m] if result is None else result[:, start:stop]
+        np.multiply(centered[None, start:stop], growth[:, :m], out=seg)
+        np.cumsum(seg, axis=1, out=seg)
+        seg *= weight
+        seg += (beta * prev)[:, None]
+        seg *= decay[:, :m]
+        if copies.any():
+            np.copyto(seg, centered[None, start:stop], where=copies)
+        squared, absolute = _oneStepErrors(
+            centered[start:stop],
+            seg,
+            prev,
+            errors[:, :m],
+            None if mask is None else mask[start:stop],
+        )
+        sse += squared
+        sae += absolute
+        prev = seg[:, -1].copy()
+    if fits:
+        result += first
+    return result, sse, sae
+
+
+def _padSegments(values, starts):
+    """
+    Lay the segments of a 2-D array side by side, each padded after its
+    last row with its last value
+
+    Returns
+    -------
+    tuple
+        the padded array of shape (longest segment, segments * columns),
+        the boolean mask of its rows holding data, and the segment and
+        position within the segment of every row of ``values``
+    """
+    n, k = values.shape
+    seg, lengths = _segmentIds(n, starts)
+    pos = np.arange(n) - starts[seg]
+    rows = lengths.max()
+    wide = np.repeat(values[starts + lengths - 1][None], rows, axis=0)
+    wide[pos, seg] = values
+    mask = np.arange(rows)[:, None] < lengths
+    mask = np.repeat(mask, k, axis=1)
+    return wide.reshape(rows, -1), mask, seg, pos
+
+
+def fitAlpha(values, starts=None, grid=11, rounds=4):
+    """
+    Smoothing parameter of every column minimizing the sum of the squared
+    one-step-ahead errors of ``expSmoothing``
+
+    All columns are fitted together by ``expSmoothingSweep``: a coarse
+    grid of alphas is evaluated first, then ``rounds`` finer grids centered
+    on the best alpha of every column, each one a third of the width of
+    the previous.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        2-D float array of shape (rows, columns), rows ordered in time
+    starts : numpy.ndarray or None
+        sorted first row of every segment, starting with 0. Every segment
+        then gets its own alphas
+    grid : int
+        number of alphas of the coarse grid
+    rounds : int
+        number of refinements
+
+    Returns
+    -------
+    numpy.ndarray
+        the alphas, of shape (columns,), or (segments, columns) with
+        ``starts``
+    """
+    k = values.shape[1]
+    mask = None
+    if starts is not None:
+        if len(starts) == 0:
+            return np.empty((0, k))
+        values, mask, _, _ = _padSegments(values, starts)
+
+    candidates = np.linspace(0.0, 1.0, grid)
+    sse = expSmoothingSweep(values, candidates, fits=False, mask=mask)[1]
+    best = candidates[sse.argmin(axis=0)]
+    step = 1.0 / (grid - 1)
+    offsets = np.linspace(-1.0, 1.0, 7)[:, None]
+    columns = np.arange(values.shape[1])
+    for _ in range(rounds):
+        candidates = np.clip(best + step * offsets, 0.0, 1.0)
+        sse = expSmoothingSweep(values, candidates, fits=False, mask=mask)[1]
+        best = candidates[sse.argmin(axis=0), columns]
+        step /= 3
+    return best if starts is None else best.reshape(-1, k)
+
+
+def expSmoothingAlphas(values, alphas, starts=None):
+    """
+    ``expSmoothing`` with a smoothing parameter per column
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        2-D float array of shape (rows, columns), rows ordered in time
+    alphas : numpy.ndarray
+        the smoothing parameters, of shape (columns,), or (segments,
+        columns) with ``starts``
+    starts : numpy.ndarray or None
+        sorted first row of every segment, starting with 0. Every segment
+        is smoothed separately
+
+    Returns
+    -------
+    numpy.ndarray
+        array of the same shape as ``values`` holding the smoothed values
+    """
+    if starts is None:
+        return expSmoothingSweep(values, alphas[None])[0][0]
+    if len(starts) == 0:
+        return np.empty(values.shape)
+    wide, _, seg, pos = _padSegments(values, starts)
+    fits = expSmoothingSweep(wide, alphas.reshape(1, -1))[0][0]
+    return fits.reshape(len(wide), len(starts), -1)[pos, seg]
+
+
+def accumulateStats(moments, values, block=None):
+    """
+    Merge the NaN-aware moments of the columns of a 2-D array into running
+    moments
+
+    The array is read once, in row blocks small enough to stay in cache.
+    Per-block moments are merged with the parallel form of Welford's
+    algorithm, which keeps the variance accurate for large means. Feeding
+    consecutive chunks of a series gives the moments of the whole series.
+
+    Parameters
+    ----------
+    moments : dict or None
+        running moments returned by a previous call, None to start afresh
+    values : numpy.ndarray
+        2-D float array of shape (rows, columns)
+    block : int or None
+        number of rows per block. Defaults to about one million elements
+        per block
+
+    Returns
+    -------
+    dict
+        arrays of length ``columns`` keyed by "count", "mean", "m2", "min"
+        and "max"
+    """
+    n, k = values.shape
+    if block is None:
+        block = max(1, 2 ** 20 // max(k, 1))
+    if moments is None:
+        moments = {
+            "count": np.zeros(k),
+            "mean": np.zeros(k),
+            "m2": np.zeros(k),
+            "min": np.full(k, np.nan),
+            "max": np.full(k, np.nan),
+        }
+    count = moments["count"]
+    mean = moments["mean"]
+    m2 = moments["m2"]
+    vmin = moments["min"]
+    vmax = moments["max"]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for start in range(0, n, block):
+            blk = values[start: start + block]
+            valid = ~np.isnan(blk)
+            nb = valid.sum(axis=0)
+            mean_b = np.where(valid, blk, 0).sum(axis=0) / nb
+            dev = np.where(valid, blk - mean_b, 0)
+            m2_b = np.einsum("ij,ij->j", dev, dev)
+
+            total = count + nb
+            delta = np.where(nb > 0, mean_b - mean, 0)
+            ratio = np.where(total > 0, nb / total, 0)
+            mean = mean + delta * ratio
+            m2 = m2 + np.where(nb > 0, m2_b, 0) + delta ** 2 * count * ratio
+            count = total
+
+            vmin = np.fmin(vmin, np.fmin.reduce(blk, axis=0))
+            vmax = np.fmax(vmax, np.fmax.reduce(blk, axis=0))
+
+    return {"count": count, "mean": mean, "m2": m2, "min": vmin, "max": vmax}
+
+
+def finishStats(moments):
+    """
+    Count, mean, minimum, maximum and sample standard deviation from the
+    running moments of accumulateStats
+    """
+    count = moments["count"]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        std = np.sqrt(moments["m2"] / (count - 1))
+    mean = moments["mean"].copy()
+    mean[count == 0] = np.nan
+    std[count < 2] = np.nan
+    return {
+        "count": count,
+        "mean": mean,
+        "min": moments["min"],
+        "max": moments["max"],
+        "std": std,
+    }
+
+
+def columnStats(values, block=None):
+    """
+    NaN-aware count, mean, minimum, maximum and sample standard deviation
+    of every column of a 2-D array
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        2-D float array of shape (rows, columns)
+    block : int or None
+        number of rows per block. Defaults to about one million elements
+        per block
+
+    Returns
+    -------
+    dict
+        arrays of length ``columns`` keyed by "count", "mean", "min", "max"
+        and "std". Columns without any valid value get NaN statistics
+    """
+    return finishStats(accumulateStats(None, values, block))
+
+
+def _segmentIds(n, starts):
+    lengths = np.diff(np.append(starts, n))
+    return np.repeat(np.arange(len(starts)), lengths), lengths
+
+
+def _windowSums(values, lagged, stable=False, block=None):
+    """
+    Sums of ``values[lagged[t]:t + 1]`` for every row ``t``, taken as
+    differences of running sums
+
+    With ``stable``, the running sum restarts at every block of ``block``
+    rows, reaching back to the first row any window of the block needs, so
+    its magnitude and rounding error do not grow with the length of the
+    series. Every block then costs its length plus the rows its windows
+    reach back over. ``block`` defaults to 4096 rows.
+    """
+    n = values.shape[0]
+    if not stable:
+        csum = np.zeros((n + 1,) + values.shape[1:])
+        np.cumsum(values, axis=0, out=csum[1:])
+        return csum[1:] - csum[lagged]
+
+    if block is None:
+        block = 4096
+    out = np.empty(values.shape)
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        lo = lagged[start:stop].min()
+        csum = np.zeros((stop - lo + 1,) + values.shape[1:])
+        np.cumsum(values[lo:stop], axis=0, out=csum[1:])
+        out[start:stop] = csum[start - lo + 1:] - csum[lagged[start:stop] - lo]
+    return out
+
+
+def segmentedRollingMean(values, starts, window, stable=False):
+    """
+    ``rollingMean`` applied independently to consecutive row segments
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        2-D float array of shape (rows, columns). Each segment holds one
+        series, rows ordered in time
+    starts : numpy.ndarray
+        sorted first row of every segment, starting with 0
+    window : int
+        size of the sliding window
+    stable : bool
+        re-base the running sums every ``max(4 * window, 4096)`` rows, as
+        in ``rollingMean``
+
+    Returns
+    -------
+    numpy.ndarray
+        array of the same shape as ``values`` holding the moving averages
+    """
+    n = values.shape[0]
+    if n == 0:
+        return np.empty(values.shape)
+    seg, lengths = _segmentIds(n, starts)
+    first = np.repeat(values[starts], lengths, axis=0)
+
+    # the window never reaches back past the start of its own segment
+    rows = np.arange(n)
+    lagged = np.maximum(rows - window + 1, starts[seg])
+    out = _windowSums(
+        values - first, lagged, stable, max(4 * window, 4096)
+    )
+    out /= window
+    out += first
+    return out
+
+
+def segmentedWeightedMean(values, starts, window):
+    """
+    Linearly weighted moving average applied independently to consecutive
+    row segments in O(n)
+
+    The newest row of a window has weight ``window`` and the oldest weight
+    1. The weighted sum follows ``N[t] = N[t - 1] + window * x[t] -
+    S[t - 1]``, ``S`` being the plain window sum, so it is a cumulative
+    sum of the values minus a cumulative sum of the window sums. As in
+    ``segmentedRollingMean``, the first ``window - 1`` rows of a segment
+    are warmed up by padding it with its first value.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        2-D float array of shape (rows, columns). Each segment holds one
+        series, rows ordered in time
+    starts : numpy.ndarray
+        sorted first row of every segment, starting with 0
+    window : int
+        size of the sliding window
+
+    Returns
+    -------
+    numpy.ndarray
+        array of the same shape as ``values`` holding the weighted averages
+    """
+    n = values.shape[0]
+    if n == 0:
+        return np.empty(values.shape)
+    seg, lengths = _segmentIds(n, starts)
+    first = np.repeat(values[starts], lengths, axis=0)
+    csum = np.zeros((n + 1,) + values.shape[1:])
+    np.cumsum(values - first, axis=0, out=csum[1:])
+
+    rows = np.arange(n)
+    base = starts[seg]
+    sums = csum[1:] - csum[np.maximum(rows - window + 1, base)]
+    lagged = np.zeros(csum.shape)
+    np.cumsum(sums, axis=0, out=lagged[1:])
+    out = csum[1:] - csum[base]
+    out *= window
+    out -= lagged[:-1]
+    out += lagged[base]
+    out /= window * (window + 1) / 2
+    out += first
+    return out
+
+
+def segmentedExpSmoothing(values, starts, alpha):
+    """
+    ``expSmoothing`` applied independently to consecutive row segments
+
+    The whole array is smoothed as one series and the carry-over into
+    every segment is then removed in closed form: it decays by a factor
+    ``1 - alpha`` per row.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        2-D float array of shape (rows, columns). Each segment holds one
+        series, rows ordered in time
+    starts : numpy.ndarray
+        sorted first row of every segment, starting with 0
+    alpha : float
+        the smoothing parameter, between 0 and 1
+
+    Returns
+    -------
+    numpy.ndarray
+        array of the same shape as ``values`` holding the smoothed values
+    """
+    n = values.shape[0]
+    if n == 0:
+        return np.empty(values.shape)
+    seg, lengths = _segmentIds(n, starts)
+    first = np.repeat(values[starts], lengths, axis=0)
+    out = expSmoothing(values - first, alpha)
+
+    carry = np.zeros((len(starts),) + values.shape[1:])
+    carry[1:] = out[starts[1:] - 1]
+    pos = np.arange(n) - starts[seg]
+    decay = (1.0 - alpha) ** (pos + 1)
+    out -= decay.reshape((-1,) + (1,) * (values.ndim - 1)) * carry[seg]
+    out += first
+    return out
+
+
+def _firstValid(values, valid, starts, lengths):
+    """
+    First non-NaN value of every segment and column, NaN where there is
+    none, repeated over the rows of the segment
+    """
+    n = values.shape[0]
+    rows = np.where(valid, np.arange(n).reshape(-1, 1), n)
+    first_rows = np.minimum.reduceat(rows, starts, axis=0)
+    first = np.take_along_axis(values, np.minimum(first_rows, n - 1), axis=0)
+    first[first_rows == n] = np.nan
+    return np.repeat(first, lengths, axis=0)
+
+
+def forwardFill(values, starts=None):
+    """
+    Replace every NaN by the last valid value before it in the same segment
+
+    Leading NaNs of a segment are left in place.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        2-D float array of shape (rows, columns), rows ordered in time
+    starts : numpy.ndarray or None
+        sorted first row of every segment, starting with 0. Defaults to a
+        single segment
+
+    Returns
+    -------
+    numpy.ndarray
+        a new array of the same shape as ``values``
+    """
+    n = values.shape[0]
+    if starts is None:
+        starts = np.zeros(1, dtype=int)
+    if n == 0:
+        return values.copy()
+    seg, _ = _segmentIds(n, starts)
+    rows = np.arange(n).reshape(-1, 1)
+    last = np.maximum.accumulate(
+        np.where(np.isnan(values), -1, rows), axis=0
+    )
+    # a last valid row in an earlier segment does not count
+    last[last < starts[seg].reshape(-1, 1)] = -1
+    filled = np.take_along_axis(values, np.maximum(last, 0), axis=0)
+    filled[last < 0] = np.nan
+    return filled
+
+
+def nanRollingMean(values, window, starts=None, propagate=False, stable=False):
+    """
+    NaN-aware ``segmentedRollingMean``
+
+    Running sums of the valid values and running counts of the valid rows
+    are kept side by side, so the cost stays O(n) whatever the number of
+    NaNs. Rows before the first valid value of their segment are NaN.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        2-D float array of shape (rows, columns), rows ordered in time
+    window : int
+        size of the sliding window
+    starts : numpy.ndarray or None
+        sorted first row of every segment, starting with 0. Defaults to a
+        single segment
+    propagate : bool
+        if False, NaNs are skipped and every window averages its valid
+        values. If True, every window holding a NaN averages to NaN
+    stable : bool
+        re-base the running sums every ``max(4 * window, 4096)`` rows, as
+        in ``rollingMean``
+
+    Returns
+    -------
+    numpy.ndarray
+        array of the same shape as ``values`` holding the moving averages
+    """
+    n = values.shape[0]
+    if n == 0:
+        return np.empty(values.shape)
+    if starts is None:
+        starts = np.zeros(1, dtype=int)
+    seg, lengths = _segmentIds(n, starts)
+    valid = ~np.isnan(values)
+    # the warm-up padding repeats the first valid value of the segment,
+    # which is zero once centered
+    first = _firstValid(values, valid, starts, lengths)
+
+    count = np.zeros((n + 1,) + values.shape[1:], dtype=np.int64)
+    np.cumsum(valid, axis=0, out=count[1:])
+
+    rows = np.arange(n)
+    lagged = np.maximum(rows - window + 1, starts[seg])
+    sums = _windowSums(
+        np.where(valid, values - first, 0),
+        lagged,
+        stable,
+        max(4 * window, 4096),
+    )
+    valid_rows = count[1:] - count[lagged]
+    seen = count[1:] - count[starts[seg]] > 0
+    padding = (window - (rows - lagged + 1)).reshape(-1, 1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if propagate:
+            out = sums / window
+            out[valid_rows + padding < window] = np.nan
+        else:
+            out = sums / (valid_rows + padding)
+    out += first
+    out[~seen] = np.nan
+    return out
+
+
+def timeWindowStarts(times, span, starts=None):
+    """
+    First row of the time window ending at every row
+
+    The window of a row holds the rows of the same segment whose time is
+    greater than the time of the row minus ``span``. Segments are searched
+    all at once: every segment is shifted past the end of the previous one
+    plus ``span``, which gives one increasing key for a single binary
+    search. Times are replaced by their ranks first if the shifted keys
+    would overflow.
+
+    Parameters
+    ----------
+    times : numpy.ndarray
+        int64 times, increasing within every segment
+    span : int
+        length of the window in the unit of ``times``
+    starts : numpy.ndarray or None
+        sorted first row of every segment, starting with 0. Defaults to a
+        single segment
+
+    Returns
+    -------
+    numpy.ndarray
+        int64 array of the first row of every window
+    """
+    n = len(times)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    if starts is None or len(starts) == 1:
+        return np.searchsorted(times, times - span, side="right")
+
+    seg, lengths = _segmentIds(n, starts)
+    stops = starts + lengths - 1
+    extents = (times[stops] - times[starts]).astype(np.float64) + span + 1
+    if extents.sum() < 2.0 ** 62:
+        extents = extents.astype(np.int64)
+        bases = np.cumsum(extents) - extents - times[starts]
+        keys = times + bases[seg]
+        return np.searchsorted(keys, keys - span, side="right")
+
+    unique, ranks = np.unique(times, return_inverse=True)
+    offset = seg.astype(np.int64) * (len(unique) + 1)
+    # rank of the first time inside the window
+    lower = np.searchsorted(unique, times - span, side="right")
+    return np.searchsorted(offset + ranks, offset + lower, side="left")
+
+
+def timeRollingMean(
+    values, times, span, starts=None, propagate=False, stable=False
+):
+    """
+    Moving average over trailing time windows of every column of a 2-D
+    array, for irregularly spaced rows
+
+    Every row averages the rows of its segment from the last ``span`` of
+    time, including itself. Windows are delimited by binary search and
+    summed from running sums, so no regular grid is built. NaN values are
+    skipped using running counts of the valid rows.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        2-D float array of shape (rows, columns), rows ordered in time
+    times : numpy.ndarray
+        int64 time of every row, increasing within every segment
+    span : int
+        length of the window in the unit of ``times``
+    starts : numpy.ndarray or None
+        sorted first row of every segment, starting with 0. Defaults to a
+        single segment
+    propagate : bool
+        if True, every window holding a NaN averages to NaN
+    stable : bool
+        re-base the running sums every 4096 rows, as in ``rollingMean``
+
+    Returns
+    -------
+    numpy.ndarray
+        array of the same shape as ``values`` holding the moving averages
+    """
+    n = values.shape[0]
+    if n == 0:
+        return np.empty(values.shape)
+    if starts is None:
+        starts = np.zeros(1, dtype=int)
+    _, lengths = _segmentIds(n, starts)
+    lagged = timeWindowStarts(times, span, starts)
+    valid = ~np.isnan(values)
+    first = _firstValid(values, valid, starts, lengths)
+
+    sums = _windowSums(np.where(valid, values - first, 0), lagged, stable)
+    count = np.zeros((n + 1,) + values.shape[1:], dtype=np.int64)
+    np.cumsum(valid, axis=0, out=count[1:])
+
+    valid_rows = count[1:] - count[lagged]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out = sums / valid_rows
+    if propagate:
+        rows = (np.arange(1, n + 1) - lagged).reshape(-1, 1)
+        out[valid_rows < rows] = np.nan
+    out += first
+    return out
+
+
+def nanExpSmoothing(values, alpha, starts=None, propagate=False):
+    """
+    NaN-aware ``segmentedExpSmoothing``
+
+    A NaN row leaves the smoothed value unchanged, i.e. the smoothing
+    parameter is zero there. The decay between two rows then depends on
+    the running count of valid rows, which keeps the blocked closed form of
+    ``expSmoothing``. Rows before the first valid value of their segment
+    are NaN.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        2-D float array of shape (rows, columns), rows ordered in time
+    alpha : float
+        the smoothing parameter, between 0 and 1
+    starts : numpy.ndarray or None
+        sorted first row of every segment, starting with 0. Defaults to a
+        single segment
+    propagate : bool
+        if False, NaNs are skipped. If True, every row from the first NaN
+        of a segment on is NaN
+
+    Returns
+    -------
+    numpy.ndarray
+        array of the same shape as ``values`` holding the smoothed values
+    """
+    n = values.shape[0]
+    if n == 0:
+        return np.empty(values.shape)
+    if starts is None:
+        starts = np.zeros(1, dtype=int)
+    seg, lengths = _segmentIds(n, starts)
+    valid = ~np.isnan(values)
+    first = _firstValid(values, valid, starts, lengths)
+    count = np.cumsum(valid, axis=0)
+    # valid rows of the segment up to and including every row
+    seg_count = count - (count[starts - 1] * (starts > 0)[:, None])[seg]
+
+    if alpha == 1:
+        out = forwardFill(values, starts)
+    elif alpha == 0:
+        out = first.copy()
+    else:
+        beta = 1.0 - alpha
+        limit = np.log(np.finfo(np.float64).max) / 3
+        block = int(max(1, min(n, np.floor(limit / -np.log(beta)))))
+        weighted = np.where(valid, alpha * (values - first), 0)
+        out = np.empty(values.shape)
+        prev = np.zeros(values.shape[1:])
+        base = np.zeros(values.shape[1:], dtype=np.int64)
+        for start in range(0, n, block):
+            stop = min(start + block, n)
+            steps = count[start:stop] - base
+            seg_out = out[start:stop]
+            np.cumsum(weighted[start:stop] * beta ** -steps, axis=0,
+                      out=seg_out)
+            seg_out += prev
+            seg_out *= beta ** steps
+            prev = seg_out[-1]
+            base = count[stop - 1]
+
+        # remove the carry-over from the previous segments, which decays by
+        # beta per valid row of the segment
+        carry = np.zeros((len(starts),) + values.shape[1:])
+        carry[1:] = out[starts[1:] - 1]
+        out -= beta ** seg_count * carry[seg]
+        out += first
+
+    out[seg_count == 0] = np.nan
+    if propagate:
+        nan_count = np.cumsum(~valid, axis=0)
+        seg_nan = nan_count - (
+            nan_count[starts - 1] * (starts > 0)[:, None]
+        )[seg]
+        out[seg_nan > 0] = np.nan
+    return out
+
+
+def holtSmoothing(values, alpha, beta, starts=None):
+    """
+    Holt's linear trend smoothing applied independently to consecutive row
+    segments
+
+    The level and the trend follow a linear recurrence with a constant
+    2 x 2 matrix, which is solved by a doubling scan: pass ``j`` adds the
+    state ``2 ** j`` rows back, propagated by the matching matrix power,
+    so log2(rows) vectorized passes are needed. Every segment starts with
+    its first value as level and the difference of its first two values
+    as trend.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        2-D float array of shape (rows, columns). Each segment holds one
+        series, rows ordered in time
+    alpha : float
+        the smoothing parameter of the level, between 0 and 1
+    beta : float
+        the smoothing parameter of the trend, between 0 and 1
+    starts : numpy.ndarray or None
+        sorted first row of every segment, starting with 0. Defaults to a
+        single segment
+
+    Returns
+    -------
+    tuple
+        the level and the trend, arrays of the same shape as ``values``
+    """
+    n = values.shape[0]
+    if n == 0:
+        return np.empty(values.shape), np.empty(values.shape)
+    if starts is None:
+        starts = np.zeros(1, dtype=int)
+    seg, lengths = _segmentIds(n, starts)
+    first = np.repeat(values[starts], lengths, axis=0)
+    centered = values - first
+    pos = np.arange(n) - starts[seg]
+
+    level = alpha * centered
+    trend = (alpha * beta) * centered
+    level[starts] = 0
+    trend[starts] = 0
+    pairs = starts[lengths > 1]
+    trend[pairs] = centered[pairs + 1]
+
+    power = np.array(
+        [[1 - alpha, 1 - alpha], [-alpha * beta, 1 - alpha * beta]]
+    )
+    shift = 1
+    while shift < lengths.max():
+        # both increments are taken from the state before the pass
+        add_level = power[0, 0] * level[:-shift] + power[0, 1] * trend[:-shift]
+        add_trend = power[1, 0] * level[:-shift] + power[1, 1] * trend[:-shift]
+        if len(starts) > 1:
+            crossing = pos[shift:] < shift
+            add_level[crossing] = 0
+            add_trend[crossing] = 0
+        level[shift:] += add_level
+        trend[shift:] += add_trend
+        power = power @ power
+        shift *= 2
+    level += first
+    return level, trend
+
+
+def oneStepVariance(values, predictions, starts=None):
+    """
+    Mean squared one-step-ahead error of every segment and column, the
+    prediction of row ``t`` being ``predictions[t - 1]``
+
+    Returns
+    -------
+    numpy.ndarray
+        array of shape (segments, columns), NaN for segments of one row
+    """
+    n = values.shape[0]
+    if starts is None:
+        starts = np.zeros(1 if n else 0, dtype=int)
+    if n == 0:
+        return np.empty((0,) + values.shape[1:])
+    _, lengths = _segmentIds(n, starts)
+    errors = np.empty(values.shape)
+    np.subtract(values[1:], predictions[:-1], out=errors[1:])
+    errors[starts] = 0
+    errors *= errors
+    sums = np.add.reduceat(errors, starts, axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return sums / (lengths - 1)[:, None]
+
+
+def smoothingForecast(
+    level, trend, variance, horizon, alpha, beta=None, z=None
+):
+    """
+    Point forecasts and prediction intervals of exponential smoothing
+
+    The forecast ``h`` steps ahead is ``level + h * trend``. The variance
+    of its error grows from the one-step-ahead ``variance`` as for the
+    additive error models of simple exponential smoothing and of Holt's
+    linear trend method.
+
+    Parameters
+    ----------
+    level, trend : numpy.ndarray
+        the last level and trend of every series
+    variance : numpy.ndarray
+        the one-step-ahead error variance of every series
+    horizon : int
+        number of steps to forecast
+    alpha : float or numpy.ndarray
+        the smoothing parameter of the level, for all or for every series
+    beta : float or None
+        the smoothing parameter of the trend, None without a trend
+    z : float or None
+        standard normal quantile of the interval, None for no interval
+
+    Returns
+    -------
+    tuple
+        the forecasts, and the lower and upper bounds of the intervals
+        (None without ``z``), each of shape (horizon,) + ``level.shape``
+    """
+    steps = np.arange(1, horizon + 1, dtype=np.float64).reshape(
+        (-1,) + (1,) * np.ndim(level)
+    )
+    mean = level + steps * trend
+    if z is None:
+        return mean, None, None
+    alpha = np.asarray(alpha)
+    if beta is None:
+        growth = alpha ** 2
+    else:
+        # beta of the error-correction form of Holt's method
+        slope = alpha * beta
+        growth = (
+            alpha ** 2
+            + alpha * slope * steps
+            + slope ** 2 * steps * (2 * steps - 1) / 6
+        )
+    half = z * np.sqrt(variance * (1 + (steps - 1) * growth))
+    return mean, mean - half, mean + half
+
+
+def priceReturns(prices, kind="log"):
+    """
+    Returns between consecutive rows of a 2-D array of prices
+
+    Parameters
+    ----------
+    prices : numpy.ndarray
+        2-D float array of shape (rows, columns), rows ordered in time
+    kind : str
+        "log" for log returns or "simple" for relative price changes
+
+    Returns
+    -------
+    numpy.ndarray
+        array of shape (rows - 1, columns), NaN where either price is NaN
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if kind == "log":
+            logs = np.log(prices)
+            return logs[1:] - logs[:-1]
+        return prices[1:] / prices[:-1] - 1
+
+
+def riskMeasures(
+    prices,
+    starts=None,
+    kind="log",
+    periods=252,
+    risk_free=0.0,
+    level=0.95,
+    benchmark=None,
+):
+    """
+    Return and risk measures of every column of a 2-D array of prices
+
+    Segments are laid out side by side (see ``_padSegments``) so that all
+    columns and segments are handled by the same vectorized reductions. NaN
+    returns are left out. The maximum drawdown comes from one running
+    maximum of the prices, and the value at risk from partial sorts
+    (``np.partition``) of the returns of the columns with the same number
+    of returns.
+
+    Parameters
+    ----------
+    prices : numpy.ndarray
+        2-D float array of shape (rows, columns), rows ordered in time
+    starts : numpy.ndarray or None
+        sorted first row of every segment, starting with 0. Every segment is
+        then measured separately
+    kind : str
+        "log" or "simple" returns
+    periods : int
+        number of returns per year, used to annualize
+    risk_free : float
+        annual risk-free rate, the target of the Sharpe and Sortino ratios
+    level : float
+        confidence level of the value at risk
+    benchmark : numpy.ndarray or None
+        1-D array of benchmark prices with one value per row. The beta of
+        every column against it is then added
+
+    Returns
+    -------
+    dict
+        arrays with one value per segment and column, segment by segment,
+        keyed by "annual_return", "annual_volatility", "sharpe", "sortino",
+        "max_drawdown" (negative), "var", "cvar" (positive losses per
+        period) and "beta"
+    """
+    k = prices.shape[1]
+    mask = None
+    if starts is not None:
+        if len(starts) == 0:
+            prices = np.empty((0, 0))
+        else:
+            prices, mask, _, _ = _padSegments(prices, starts)
+            if benchmark is not None:
+                benchmark = np.repeat(
+                    _padSegments(benchmark[:, None], starts)[0], k, axis=1
+                )
+    elif benchmark is not None:
+        benchmark = benchmark[:, None]
+    columns = prices.shape[1]
+
+    returns = priceReturns(prices, kind)
+    if mask is not None:
+        returns[~mask[1:]] = np.nan
+    valid = ~np.isnan(returns)
+    count = valid.sum(axis=0)
+    target = risk_free / periods
+    stats = {}
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(valid, returns, 0).sum(axis=0) / count
+        deviations = np.where(valid, returns - mean, 0)
+        std = np.sqrt((deviations * deviations).sum(axis=0) / (count - 1))
+        shortfall = np.minimum(np.where(valid, returns - target, 0), 0)
+        downside = np.sqrt((shortfall * shortfall).sum(axis=0) / count)
+        stats["annual_return"] = mean * periods
+        stats["annual_volatility"] = std * np.sqrt(periods)
+        stats["sharpe"] = (mean - target) / std * np.sqrt(periods)
+        stats["sortino"] = (mean - target) / downside * np.sqrt(periods)
+
+        if len(prices):
+            peak = np.fmax.accumulate(prices, axis=0)
+            stats["max_drawdown"] = np.fmin.reduce(prices / peak - 1, axis=0)
+        else:
+            stats["max_drawdown"] = np.full(columns, np.nan)
+
+    var = np.full(columns, np.nan)
+    cvar = np.full(columns, np.nan)
+    filled = np.where(valid, returns, np.inf)
+    for size in np.unique(count[count > 0]):
+        selected = np.flatnonzero(count == size)
+        position = (1 - level) * (size - 1)
+        lo = int(np.floor(position))
+        hi = min(lo + 1, size - 1)
+        part = np.partition(filled[:, selected], sorted({lo, hi}), axis=0)
+        quantile = part[lo] + (position - lo) * (part[hi] - part[lo])
+        var[selected] = -quantile
+        cvar[selected] = -part[: lo + 1].mean(axis=0)
+    stats["var"] = var
+    stats["cvar"] = cvar
+
+    if benchmark is not None:
+        market = priceReturns(benchmark, kind)
+        if mask is not None:
+            market[~mask[1:]] = np.nan
+        both = valid & ~np.isnan(market)
+        pairs = both.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            own = np.where(both, returns, 0)
+            own -= own.sum(axis=0) / pairs
+            market = np.where(both, market, 0)
+            market -= market.sum(axis=0) / pairs
+            own[~both] = 0
+            market[~both] = 0
+            stats["beta"] = (own * market).sum(axis=0) / (
+                market * market
+            ).sum(axis=0)
+    return stats
+
+
+def _covarianceFinish(gram, sums, pairs, correlation):
+    """
+    Covariance or correlation from the sums of the products, of the values
+    and of their squares over the rows valid for both columns
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if sums.ndim == 1:
+            gram -= np.multiply.outer(
+                sums.astype(gram.dtype), (sums / pairs).astype(gram.dtype)
+            )
+            gram /= pairs - 1
+            if correlation:
+                scale = np.sqrt(np.diag(gram)).copy()
+                gram /= scale[:, None]
+                gram /= scale[None, :]
+        else:
+            gram -= sums * sums.T / pairs
+            gram /= pairs - 1
+    if correlation:
+        np.clip(gram, -1, 1, out=gram)
+    return gram
+
+
+def covarianceMatrix(values, correlation=False, dtype=np.float64, block=None):
+    """
+    Covariance or correlation matrix of the columns of a 2-D array, over
+    the rows where both columns are valid
+
+    Columns are shifted by their mean and their products are accumulated
+    over blocks of rows with matrix products, so the work is done by BLAS
+    and only one block of rows is converted at a time. Without NaN values a
+    single product of the block with itself is needed; otherwise the
+    counts, sums and sums of squares of every pair of columns come from
+    three more products with the validity mask, as for
+    ``DataFrame.corr``.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        2-D float array of shape (rows, columns)
+    correlation : bool
+        return correlations instead of covariances
+    dtype : numpy.dtype
+        float type of the products and of the result. float32 halves the
+        memory and roughly doubles the speed
+    block : int or None
+        number of rows per block. Defaults to about one million elements
+
+    Returns
+    -------
+    numpy.ndarray
+        array of shape (columns, columns), NaN for pairs of columns with
+        fewer than two common rows
+    """
+    n, k = values.shape
+    dtype = np.dtype(dtype)
+    valid = ~np.isnan(values)
+    count = valid.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shift = np.where(count > 0, np.nansum(values, axis=0) / count, 0)
+    if block is None:
+        block = max(1, 2 ** 20 // max(k, 1))
+
+    gram = np.zeros((k, k), dtype=dtype)
+    if valid.all():
+        for start in range(0, n, block):
+            rows = (values[start: start + block] - shift).astype(dtype)
+            gram += rows.T @ rows
+        result = _covarianceFinish(
+            gram, np.zeros(k), np.float64(n), correlation
+        )
+        if n < 2:
+            result[...] = np.nan
+        return result
+
+    pairs = np.zeros((k, k), dtype=dtype)
+    sums = np.zeros((k, k), dtype=dtype)
+    squares = np.zeros((k, k), dtype=dtype) if correlation else None
+    for start in range(0, n, block):
+        mask = valid[start: start + block]
+        rows = np.where(mask, values[start: start + block] - shift, 0)
+        rows = rows.astype(dtype)
+        mask = mask.astype(dtype)
+        gram += rows.T @ rows
+        pairs += mask.T @ mask
+        # sums[i, j] adds up column i over the rows where column j is valid
+        sums += rows.T @ mask
+        if correlation:
+            squares += (rows * rows).T @ mask
+    result = _covarianceFinish(gram, sums, pairs, False)
+    if correlation:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            squares -= sums * sums / pairs
+            squares /= pairs - 1
+            result /= np.sqrt(squares * squares.T)
+        np.clip(result, -1, 1, out=result)
+    result[pairs < 2] = np.nan
+    return result
+
+
+def rollingCovariance(
+    values, window, step=1, correlation=False, dtype=np.float64
+):
+    """
+    Covariance or correlation matrices of the columns of a 2-D array over a
+    sliding window, every ``step`` rows
+
+    The sums of the products and of the values are carried from one window
+    to the next: the rows entering the window are added and the rows
+    leaving it removed, a rank-one update per row done as one matrix
+    product per step. Once as many rows as the window have been added the
+    sums are recomputed from scratch, which keeps the rounding error from
+    growing at no more than twice the cost.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        2-D float array of shape (rows, columns) without NaN values
+    window : int
+        number of rows per window, at least 2
+    step : int
+        number of rows between two windows
+    correlation : bool
+        return correlations instead of covariances
+    dtype : numpy.dtype
+        float type of the products and of the results
+
+    Returns
+    -------
+    generator
+        tuples of the last row of every full window and its matrix of shape
+        (columns, columns)
+    """
+    dtype = np.dtype(dtype)
+    shifted = values - values.mean(axis=0)
+    gram = sums = None
+    added = 0
+    last = None
+    for end in range(window - 1, len(values), step):
+        stop = end + 1
+        if last is None or added + stop - last >= window:
+            rows = shifted[stop - window: stop].astype(dtype)
+            gram = rows.T @ rows
+            sums = rows.sum(axis=0, dtype=np.float64)
+            added = 0
+        else:
+            entering = shifted[last:stop].astype(dtype)
+            leaving = shifted[last - window: stop - window].astype(dtype)
+            gram += entering.T @ entering
+            gram -= leaving.T @ leaving
+            sums += entering.sum(axis=0, dtype=np.float64)
+            sums -= leaving.sum(axis=0, dtype=np.float64)
+            added += stop - last
+        last = stop
+        yield end, _covarianceFinish(
+            gram.copy(), sums, np.float64(window), correlation
+        )
+
+
+def segmentedColumnStats(values, starts):
+    """
+    ``columnStats`` computed independently for consecutive row segments
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        2-D float array of shape (rows, columns)
+    starts : numpy.ndarray
+        sorted first row of every segment, starting with 0
+
+    Returns
+    -------
+    dict
+        arrays of shape (segments, columns) keyed by "count", "mean", "min",
+        "max", "std", "first" and "last"
+    """
+    n, k = values.shape
+    if len(starts) == 0:
+        empty = np.empty((0, k))
+        return {key: empty for key in
+                ["count", "mean", "min", "max", "std", "first", "last"]}
+    _, lengths = _segmentIds(n, starts)
+    valid = ~np.isnan(values)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        count = np.add.reduceat(valid, starts, axis=0).astype("float")
+        mean = np.add.reduceat(np.where(valid, values, 0), starts, axis=0)
+        mean /= count
+        dev = np.where(valid, values - np.repeat(mean, lengths, axis=0), 0)
+        m2 = np.add.reduceat(dev * dev, starts, axis=0)
+        std = np.sqrt(m2 / (count - 1))
+    std[count < 2] = np.nan
+    return {
+        "count": count,
+        "mean": mean,
+        "min": np.fmin.reduceat(values, starts, axis=0),
+        "max": np.fmax.reduceat(values, starts, axis=0),
+        "std": std,
+        "first": values[starts],
+        "last": values[starts + lengths - 1],
+    }
+
+
+def minMaxIndices(values, max_points):
+    """
+    Rows to keep when decimating several series for plotting
+
+    The rows are split into equal buckets and, for every column, the rows
+    holding the minimum and the maximum of each bucket are kept together
+    with the first and last row. Peaks and troughs of every series
+    therefore survive the decimation.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        2-D float array of shape (rows, columns), rows ordered in time
+    max_points : int
+        upper bound on the number of rows kept, at least
+        ``2 * columns + 2``
+
+    Returns
+    -------
+    numpy.ndarray
+        sorted indices of the rows to keep
+    """
+    n, k = values.shape
+    if n <= max_points:
+        return np.arange(n)
+
+    buckets = (max_points - 2) // (2 * max(k, 1))
+    size = -(-n // buckets)
+    padded = np.full((buckets * size, k), np.nan)
+    padded[:n] = values
+    padded = padded.reshape(buckets, size, k)
+
+    offsets = np.arange(buckets)[:, None] * size
+    missing = np.isnan(padded)
+    lows = np.where(missing, np.inf, padded).argmin(axis=1) + offsets
+    highs = np.where(missing, -np.inf, padded).argmax(axis=1) + offsets
+    keep = np.concatenate([[0, n - 1], lows.ravel(), highs.ravel()])
+    return np.unique(keep[keep < n])
+
+
+def rollingExtreme(values, window, ufunc=np.fmin):
+    """
+    Trailing rolling minimum (or maximum) of every column in O(n)
+
+    Uses the van Herk/Gil-Werman scheme: rows are cut into blocks of
+    ``window`` rows, and every window is the combination of a suffix of one
+    block and a prefix of the next. Both are running accumulations, so each
+    value is compared a constant number of times whatever the window size.
+    NaN values are ignored; windows reaching before the first row are
+    shortened.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        2-D float array of shape (rows, columns), rows ordered in time
+    window : int
+        size of the sliding window
+    ufunc : numpy.ufunc
+        ``np.fmin`` for the minimum, ``np.fmax`` for the maximum
+
+    Returns
+    -------
+    numpy.ndarray
+        array of the same shape as ``values``
+    """
+    n, k = values.shape
+    if n == 0 or window == 1:
+        return values.astype("float")
+    blocks = -(-(n + window - 1) // window)
+    padded = np.full((blocks * window, k), np.nan)
+    padded[window - 1: window - 1 + n] = values
+    padded = padded.reshape(blocks, window, k)
+
+    prefix = ufunc.accumulate(padded, axis=1).reshape(-1, k)
+    suffix = ufunc.accumulate(padded[:, ::-1], axis=1)[:, ::-1].reshape(-1, k)
+    return ufunc(suffix[:n], prefix[window - 1: window - 1 + n])
+
+
+def rollingColumnStats(values, window):
+    """
+    NaN-aware mean, minimum, maximum, sample standard deviation and return
+    over a trailing window ending at every row
+
+    Means and variances come from running sums of the values and their
+    squares, shifted by the column mean to limit cancellation. Minima and
+    maxima use ``rollingExtreme``. Windows reaching before the first row
+    are shortened.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        2-D float array of shape (rows, columns), rows ordered in time
+    window : int
+        size of the sliding window
+
+    Returns
+    -------
+    dict
+        arrays of the same shape as ``values`` keyed by "mean", "min", "max",
+        "std" and "return"
+    """
+    n, k = values.shape
+    valid = ~np.isnan(values)
+    shift = np.nan_to_num(columnStats(values)["mean"])
+    shifted = np.where(valid, values - shift, 0)
+    lo = np.maximum(np.arange(n) - window + 1, 0)
+
+    def windowSum(a):
+        csum = np.zeros((n + 1, k))
+        np.cumsum(a, axis=0, out=csum[1:])
+        return csum[1:] - csum[lo]
+
+    count = windowSum(valid)
+    s1 = windowSum(shifted)
+    s2 = windowSum(shifted * shifted)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = s1 / count
+        var = np.maximum(s2 - s1 * mean, 0) / (count - 1)
+        returns = (values - values[lo]) / values[lo]
+    mean += shift
+    mean[count == 0] = np.nan
+    std = np.sqrt(var)
+    std[count < 2] = np.nan
+    return {
+        "mean": mean,
+        "min": rollingExtreme(values, window, np.fmin),
+        "max": rollingExtreme(values, window, np.fmax),
+        "std": std,
+        "return": returns,
+    }
@@ -0,0 +1,213 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from ._kernels import expSmoothing, rollingMean
+from .stock_analyzer import (
+    _checkAlpha,
+    _checkWindow,
+    _newColumns,
+    _toDataFrame,
+    _toFloatBlock,
+)
+
+
+def _fingerprint(values):
+    """
+    Fast content hash of a 2-D float array, including its shape
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.asarray(values.shape, dtype="int64").tobytes())
+    digest.update(np.ascontiguousarray(values).data)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Memoizing cache for movingAverage and exponentialSmoothing results
+
+    Results are keyed by a content hash of the input values together with
+    the smoothing parameters, so the same numbers are never smoothed twice.
+    When the input extends a cached series by appending rows, only the new
+    rows are smoothed and the cached prefix is reused. Least recently used
+    results are evicted once ``maxsize`` entries or ``max_bytes`` bytes are
+    exceeded.
+
+    Parameters
+    ----------
+    maxsize : int maximum number of cached results. Default is 128 max_bytes
+        : int or None maximum total size of the cached arrays in bytes.
+        Default is no limit
+
+    Example
+    -------
+    >>> from stock_analyzer.cache import ResultCache
+    >>> cache = ResultCache(maxsize=32, max_bytes=2 ** 28)
+    >>> stock_analyzer.visMovingAverage(df, 'Close', 50, cache=cache)
+    >>> stock_analyzer.visMovingAverage(df, 'Close', 50, cache=cache)
+    >>> cache.info()
+    {'hits': 1, 'misses': 1, 'extensions': 0, 'entries': 1, 'bytes': 18048}
+    """
+
+    def __init__(self, maxsize=128, max_bytes=None):
+        if maxsize < 1:
+            raise ValueError(
+                "The value of maxsize must be a positive integer."
+            )
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.extensions = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def info(self):
+        """
+        Hit and miss counters and the current size of the cache
+
+        Returns
+        -------
+        dict counts of hits, misses and prefix extensions, the number of
+            cached results and their total size in bytes
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "extensions": self.extensions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def clear(self):
+        """
+        Drop all cached results and reset the counters
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.extensions = 0
+
+    def movingAverage(self, data, window, newColumnNames, stable=False):
+        """
+        Cached version of stock_analyzer.movingAverage
+
+        Parameters and return value are the same as for movingAverage.
+        """
+        data = _toDataFrame(data)
+        _checkWindow(window)
+        window = int(window)
+
+        def extend(values, prefix):
+            # rows that the first new window reaches back to, padded with
+            # the first value like movingAverage does
+            lo = len(prefix) - window + 1
+            head = values[max(lo, 0):]
+            if lo < 0:
+                head = np.concatenate(
+                    [np.repeat(values[:1], -lo, axis=0), head]
+                )
+            smoothed = rollingMean(head, window, stable=stable)
+            return smoothed[window - 1:]
+
+        smoothed = self._lookup(
+            data,
+            ("movingAverage", window, stable),
+            lambda values: rollingMean(values, window, stable=stable),
+            extend,
+        )
+        return pd.DataFrame(
+            smoothed,
+            index=data.index,
+            columns=_newColumns(data, newColumnNames),
+        )
+
+    def exponentialSmoothing(self, data, newColumnNames, alpha=0.3):
+        """
+        Cached version of stock_analyzer.exponentialSmoothing
+
+        Parameters and return value are the same as for exponentialSmoothing.
+        """
+        data = _toDataFrame(data)
+        _checkAlpha(alpha)
+
+        smoothed = self._lookup(
+            data,
+            ("exponentialSmoothing", alpha),
+            lambda values: expSmoothing(values, alpha),
+            lambda values, prefix: expSmoothing(
+                values[len(prefix):], alpha, initial=prefix[-1]
+            ),
+        )
+        return pd.DataFrame(
+            smoothed,
+            index=data.index,
+            columns=_newColumns(data, newColumnNames),
+        )
+
+    def _lookup(self, data, params, compute, extend):
+        values = _toFloatBlock(data)
+        key = (params, _fingerprint(values))
+
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached.copy()
+            prefix = self._findPrefix(params, values)
+
+        if prefix is None:
+            smoothed = compute(values)
+        else:
+            smoothed = np.concatenate([prefix, extend(values, prefix)])
+
+        with self._lock:
+            if prefix is None:
+                self.misses += 1
+            else:
+                self.extensions += 1
+            self._store(key, smoothed.copy())
+        return smoothed
+
+    def _findPrefix(self, params, values):
+        """
+        Most recently used cached result whose input is a leading block of
+        rows of ``values``
+        """
+        n, k = values.shape
+        checked = set()
+        for (entry_params, _), cached in reversed(self._entries.items()):
+            rows = cached.shape[0]
+            if (
+                entry_params != params
+                or cached.shape[1:] != (k,)
+                or not 0 < rows < n
+                or rows in checked
+            ):
+                continue
+            checked.add(rows)
+            prefix = self._entries.get((params, _fingerprint(values[:rows])))
+            if prefix is not None:
+                return prefix
+        return None
+
+    def _store(self, key, smoothed):
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key).nbytes
+        if self.max_bytes is not None and smoothed.nbytes > self.max_bytes:
+            return
+        self._entries[key] = smoothed
+        self._bytes += smoothed.nbytes
+        while len(self._entries) > self.maxsize or (
+            self.max_bytes is not None and self._bytes > self.max_bytes
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
@@ -0,0 +1,253 @@
+import numpy as np
+import pandas as pd
+
+from ._kernels import accumulateStats, finishStats
+from .stock_analyzer import _statsFrame, _toDataFrame, _toNumericBlock
+from .streaming import ExponentialSmoother, MovingAverageSmoother
+
+
+def _importPyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError(
+            "Reading and writing Parquet files needs the optional pyarrow \
+package. Please install it with pip install pyarrow."
+        )
+    return pyarrow
+
+
+def readNpyChunks(path, columns=None, chunk_rows=65536):
+    """
+    Read a .npy file in row chunks without loading it into memory
+
+    The file is memory-mapped, so only the rows of the current chunk are
+    read from disk.
+
+    Parameters
+    ----------
+    path : str path of a .npy file holding a 1-D or 2-D numeric array
+        columns : list optional column names of the chunks. Defaults to
+        0, 1, ... chunk_rows : int number of rows per chunk
+
+    Returns
+    -------
+    generator of pandas.core.frame.DataFrame consecutive chunks of the
+        array, indexed by their row positions in the file
+
+    Example
+    -------
+    >>> from stock_analyzer import chunked
+    >>> chunks = chunked.readNpyChunks('close.npy', columns=['Close'])
+    """
+    if not isinstance(chunk_rows, (int, np.integer)) or chunk_rows < 1:
+        raise ValueError("The value of chunk_rows must be a positive integer.")
+    array = np.load(path, mmap_mode="r")
+    if array.ndim not in (1, 2):
+        raise ValueError("The array must be one- or two-dimensional.")
+    if array.ndim == 1:
+        array = array[:, None]
+
+    return (
+        pd.DataFrame(
+            np.array(array[start: start + chunk_rows]),
+            index=pd.RangeIndex(start, min(start + chunk_rows, len(array))),
+            columns=columns,
+        )
+        for start in range(0, array.shape[0], chunk_rows)
+    )
+
+
+def readParquetChunks(path, columns=None):
+    """
+    Read a Parquet file one row group at a time
+
+    Needs the optional pyarrow package. The index stored by pandas is
+    restored on every chunk.
+
+    Parameters
+    ----------
+    path : str path of a Parquet file columns : list optional columns to
+        read. Defaults to all columns
+
+    Returns
+    -------
+    generator of pandas.core.frame.DataFrame the row groups of the file
+
+    Example
+    -------
+    >>> from stock_analyzer import chunked
+    >>> chunks = chunked.readParquetChunks('bars.parquet', ['Open', 'Close'])
+    """
+    pyarrow = _importPyarrow()
+    parquet_file = pyarrow.parquet.ParquetFile(path)
+    return (
+        parquet_file.read_row_group(
+            group, columns=columns, use_pandas_metadata=True
+        ).to_pandas()
+        for group in range(parquet_file.num_row_groups)
+    )
+
+
+def writeNpy(frames, path, rows):
+    """
+    Stream dataframes with the same columns into a .npy file
+
+    The file is created as a float64 memory map of ``rows`` rows and every
+    frame is written below the previous one, so the full result is never
+    held in memory. Column names and the index are not stored.
+
+    Parameters
+    ----------
+    frames : iterable of pandas.core.frame.DataFrame the chunks to write,
+        such as the output of chunkedMovingAverage path : str path of the
+        .npy file rows : int total number of rows of all frames
+    """
+    output = None
+    written = 0
+    for frame in frames:
+        values = frame.to_numpy(dtype="float")
+        if output is None:
+            output = np.lib.format.open_memmap(
+                path, mode="w+", dtype="float", shape=(rows, values.shape[1])
+            )
+        if written + values.shape[0] > rows:
+            raise ValueError("The frames have more rows than specified.")
+        output[written: written + values.shape[0]] = values
+        written += values.shape[0]
+    if written != rows:
+        raise ValueError("The frames have fewer rows than specified.")
+    if output is not None:
+        output.flush()
+        del output
+
+
+def writeParquet(frames, path):
+    """
+    Stream dataframes with the same columns into a Parquet file
+
+    Needs the optional pyarrow package. Every frame becomes one row group,
+    so readParquetChunks gives the same chunks back.
+
+    Parameters
+    ----------
+    frames : iterable of pandas.core.frame.DataFrame the chunks to write,
+        such as the output of chunkedExponentialSmoothing path : str path of
+        the Parquet file
+    """
+    pyarrow = _importPyarrow()
+    writer = None
+    try:
+        for frame in frames:
+            table = pyarrow.Table.from_pandas(frame)
+            if writer is None:
+                writer = pyarrow.parquet.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def chunkedSummaryStats(chunks, measurements=["High", "Low", "Open", "Close"]):
+    """
+    Generate summary statistics of a series that is read in chunks
+
+    Only the running moments of the measurements are kept between chunks,
+    so the series never has to fit in memory. The result is the same as
+    summaryStats on the concatenated chunks.
+
+    Parameters
+    ----------
+    chunks : iterable of pandas.core.frame.DataFrame consecutive chunks of
+        one series, such as the output of readParquetChunks measurements :
+        str columns to be summarized on
+
+    Returns
+    -------
+    pandas.core.frame.DataFrame a Pandas dataframe with the mean, minimum,
+        maximum, volatility and return of every measurement
+
+    Example
+    -------
+    >>> from stock_analyzer import chunked
+    >>> chunked.chunkedSummaryStats(chunked.readParquetChunks(
+    ... 'bars.parquet'), measurements=['Close'])
+    """
+    moments = None
+    first = last = None
+    for chunk in chunks:
+        values = _toNumericBlock(_toDataFrame(chunk), measurements)
+        if values.shape[0] == 0:
+            continue
+        if moments is None:
+            first = values[:1]
+        last = values[-1:]
+        moments = accumulateStats(moments, values)
+
+    if moments is None:
+        moments = accumulateStats(None, np.empty((0, len(measurements))))
+        first = last = np.empty((0, len(measurements)))
+    column_stats = finishStats(moments)
+    column_stats["first"] = first
+    column_stats["last"] = last
+    return _statsFrame(column_stats, measurements, None, None)
+
+
+def chunkedMovingAverage(chunks, window, newColumnNames):
+    """
+    Moving average of a series that is read in chunks
+
+    The last ``window`` rows are carried from chunk to chunk, so every
+    chunk of the result matches movingAverage on the concatenated chunks.
+
+    Parameters
+    ----------
+    chunks : iterable of pandas.core.frame.DataFrame consecutive chunks of
+        one series window : int size of the sliding window newColumnNames :
+        str new column names of the returned dataframes
+
+    Returns
+    -------
+    generator of pandas.core.frame.DataFrame the moving average of every
+        chunk, ready to be written with writeNpy or writeParquet
+
+    Example
+    -------
+    >>> from stock_analyzer import chunked
+    >>> chunked.writeParquet(chunked.chunkedMovingAverage(
+    ... chunked.readParquetChunks('bars.parquet'), 50, ['avgClose']),
+    ... 'avg.parquet')
+    """
+    smoother = MovingAverageSmoother(window, newColumnNames)
+    return (smoother.update(chunk) for chunk in chunks)
+
+
+def chunkedExponentialSmoothing(chunks, newColumnNames, alpha=0.3):
+    """
+    Exponential smoothing of a series that is read in chunks
+
+    The last smoothed row is carried from chunk to chunk, so every chunk of
+    the result matches exponentialSmoothing on the concatenated chunks.
+
+    Parameters
+    ----------
+    chunks : iterable of pandas.core.frame.DataFrame consecutive chunks of
+        one series newColumnNames : str new column names of the returned
+        dataframes alpha : float the smoothing parameter that defines the
+        weighting. It should be between 0 and 1
+
+    Returns
+    -------
+    generator of pandas.core.frame.DataFrame the smoothed values of every
+        chunk, ready to be written with writeNpy or writeParquet
+
+    Example
+    -------
+    >>> from stock_analyzer import chunked
+    >>> chunked.writeNpy(chunked.chunkedExponentialSmoothing(
+    ... chunked.readNpyChunks('close.npy'), ['expClose']), 'exp.npy',
+    ... rows=n)
+    """
+    smoother = ExponentialSmoother(newColumnNames, alpha=alpha)
+    return (smoother.update(chunk) for chunk in chunks)
@@ -0,0 +1,221 @@
+import numpy as np
+import pandas as pd
+
+from ._kernels import covarianceMatrix, priceReturns, rollingCovariance
+from .instrumentation import annotate, instrumented, phase
+from .stock_analyzer import (
+    _firstNanColumn,
+    _raiseNan,
+    _toDataFrame,
+    _toNumericBlock,
+)
+
+
+def _priceMatrix(data, measurement, by):
+    """
+    Prices of every ticker side by side, one row per time
+
+    Returns
+    -------
+    tuple a 2-D float64 array of shape (times, tickers), the times and the
+        tickers. Times a ticker has no price for are NaN
+    """
+    if by is not None:
+        if by in data.columns:
+            keys = data[by].to_numpy()
+            times = data.index
+        elif by in data.index.names:
+            keys = data.index.get_level_values(by).to_numpy()
+            times = data.index.droplevel(by)
+        else:
+            raise ValueError(
+                f"Your specified ticker column '{by}' is not a column name or \
+index level of the data."
+            )
+        prices = _toNumericBlock(data, [measurement])[:, 0]
+        ticker_codes, tickers = pd.factorize(keys)
+        if (ticker_codes < 0).any():
+            raise ValueError(f"Column '{by}' has missing tickers.")
+        time_codes, times = pd.factorize(times, sort=True)
+        values = np.full((len(times), len(tickers)), np.nan)
+        values[time_codes, ticker_codes] = prices
+        return values, times, pd.Index(tickers, name=by)
+
+    if isinstance(data.columns, pd.MultiIndex):
+        data = data.xs(measurement, axis=1, level=-1)
+    return (
+        _toNumericBlock(data, data.columns),
+        data.index,
+        data.columns,
+    )
+
+
+def _returnMatrix(data, measurement, by, returns, dtype):
+    """
+    Validate the arguments and compute the returns of every ticker
+    """
+    if returns not in ["log", "simple"]:
+        raise ValueError("The returns must be log or simple.")
+    dtype = np.dtype(dtype)
+    if dtype not in [np.float32, np.float64]:
+        raise ValueError("The dtype must be float32 or float64.")
+    with phase("coerce"):
+        data = _toDataFrame(data)
+        prices, times, tickers = _priceMatrix(data, measurement, by)
+    annotate(prices)
+    with phase("kernel"):
+        values = priceReturns(prices, returns)
+    return values, times, tickers, dtype
+
+
+def _matrixFrame(matrix, tickers):
+    return pd.DataFrame(matrix, index=tickers, columns=tickers, copy=False)
+
+
+@instrumented
+def returnCorrelation(
+    data, measurement="Close", by=None, returns="log", dtype="float64"
+):
+    """
+    Correlation matrix of the returns of a universe of tickers
+
+    The returns are shifted by their mean and multiplied block by block
+    with BLAS matrix products, so thousands of tickers are handled in the
+    time of one matrix product. Like DataFrame.corr, every pair of tickers
+    uses the times where both have a return.
+
+    Parameters
+    ----------
+    data : pandas.core.frame.DataFrame prices of the universe: one column
+        per ticker, (ticker, measurement) MultiIndex columns or a long-format
+        panel measurement : str column holding the price for MultiIndex
+        columns and long-format panels. Default is "Close" by : str column or
+        index level holding the ticker of a long-format panel. Its rows are
+        aligned on the remaining index returns : str "log" (default) or
+        "simple" returns between consecutive rows dtype : str "float64"
+        (default) or "float32" to halve the memory and time of the products
+
+    Returns
+    -------
+    pandas.core.frame.DataFrame a Pandas dataframe with the correlation of
+        every pair of tickers
+
+    Example
+    -------
+    >>> from stock_analyzer import correlation
+    >>> correlation.returnCorrelation(closes, dtype="float32")
+    """
+    values, _, tickers, dtype = _returnMatrix(
+        data, measurement, by, returns, dtype
+    )
+    with phase("kernel"):
+        matrix = covarianceMatrix(values, correlation=True, dtype=dtype)
+    with phase("output"):
+        return _matrixFrame(matrix, tickers)
+
+
+@instrumented
+def returnCovariance(
+    data, measurement="Close", by=None, returns="log", dtype="float64"
+):
+    """
+    Covariance matrix of the returns of a universe of tickers
+
+    Computed like returnCorrelation, with the sample covariance of every
+    pair of tickers over the times where both have a return.
+
+    Parameters
+    ----------
+    data : pandas.core.frame.DataFrame prices of the universe: one column
+        per ticker, (ticker, measurement) MultiIndex columns or a long-format
+        panel measurement : str column holding the price for MultiIndex
+        columns and long-format panels. Default is "Close" by : str column or
+        index level holding the ticker of a long-format panel returns : str
+        "log" (default) or "simple" returns between consecutive rows dtype :
+        str "float64" (default) or "float32"
+
+    Returns
+    -------
+    pandas.core.frame.DataFrame a Pandas dataframe with the covariance of
+        every pair of tickers
+
+    Example
+    -------
+    >>> from stock_analyzer import correlation
+    >>> correlation.returnCovariance(panel, by="ticker")
+    """
+    values, _, tickers, dtype = _returnMatrix(
+        data, measurement, by, returns, dtype
+    )
+    with phase("kernel"):
+        matrix = covarianceMatrix(values, dtype=dtype)
+    with phase("output"):
+        return _matrixFrame(matrix, tickers)
+
+
+@instrumented
+def rollingReturnCorrelation(
+    data,
+    window,
+    measurement="Close",
+    by=None,
+    step=1,
+    returns="log",
+    dtype="float64",
+    covariance=False,
+):
+    """
+    Correlation matrices of the returns of a universe of tickers over a
+    sliding window
+
+    Every matrix is updated from the previous one by adding the returns
+    entering the window and removing the ones leaving it, instead of being
+    recomputed, and the matrices are generated one at a time so that only
+    one is held in memory. Every ticker needs a return at every time.
+
+    Parameters
+    ----------
+    data : pandas.core.frame.DataFrame prices of the universe: one column
+        per ticker, (ticker, measurement) MultiIndex columns or a long-format
+        panel window : int number of returns per window, at least 2
+        measurement : str column holding the price for MultiIndex columns and
+        long-format panels. Default is "Close" by : str column or index level
+        holding the ticker of a long-format panel step : int number of rows
+        between two matrices. Default is 1 returns : str "log" (default) or
+        "simple" returns between consecutive rows dtype : str "float64"
+        (default) or "float32" covariance : bool generate covariance instead
+        of correlation matrices
+
+    Returns
+    -------
+    generator of tuple the time of the last return of every window and a
+        Pandas dataframe with the correlation of every pair of tickers
+
+    Example
+    -------
+    >>> from stock_analyzer import correlation
+    >>> for time, matrix in correlation.rollingReturnCorrelation(closes, 60,
+    ... step=20):
+    ...     print(time, matrix.values.mean())
+    """
+    if window < 2 or int(window) != window:
+        raise ValueError(
+            "The value of window must be an integer of 2 or more."
+        )
+    if step < 1 or int(step) != step:
+        raise ValueError("The value of step must be a positive integer.")
+    values, times, tickers, dtype = _returnMatrix(
+        data, measurement, by, returns, dtype
+    )
+    with phase("validate"):
+        column = _firstNanColumn(values)
+    if column is not None:
+        _raiseNan(tickers[column], values[:, column])
+
+    # the first return belongs to the second time
+    return (
+        (times[end + 1], _matrixFrame(matrix, tickers))
+        for end, matrix in rollingCovariance(
+            values, int(window), int(step), not covariance, dtype
+        )
+    )
@@ -0,0 +1,455 @@
+import numpy as np
+import pandas as pd
+
+from ._kernels import (
+    _segmentIds,
+    segmentedExpSmoothing,
+    segmentedRollingMean,
+    segmentedWeightedMean,
+)
+from .instrumentation import annotate, instrumented, phase
+from .stock_analyzer import (
+    _appendLevel,
+    _checkWindow,
+    _firstNanColumn,
+    _panelSegments,
+    _raiseNan,
+    _smoothBlock,
+    _smoothFrame,
+    _statsBlock,
+    _toDataFrame,
+    _toNumericBlock,
+)
+
+
+def _indicatorBlock(data, by):
+    """
+    Convert a single series or a panel into one float64 array, with the
+    first row of every ticker (a single segment for a single series)
+    """
+    with phase("coerce"):
+        data = _toDataFrame(data)
+    values, order, starts = _smoothBlock(data, by)
+    annotate(values)
+    if starts is None:
+        starts = np.zeros(1 if len(values) else 0, dtype=int)
+    return data, values, order, starts
+
+
+def _componentFrame(data, by, components, order):
+    """
+    Wrap the arrays of an indicator with several components into one
+    dataframe with a (measurement, component) column for every pair
+    """
+    names = list(components)
+    arrays = list(components.values())
+    n, k = arrays[0].shape
+    stacked = np.stack(arrays, axis=2).reshape(n, k * len(names))
+    columns = data.columns
+    if by is not None and by in columns:
+        columns = columns.drop(by)
+    columns = _appendLevel(columns, names)
+    if order is not None:
+        unsorted = np.empty_like(stacked)
+        unsorted[order] = stacked
+        stacked = unsorted
+    result = pd.DataFrame(
+        stacked, index=data.index, columns=columns, copy=False
+    )
+    if by is not None and by in data.columns:
+        label = (by,) + ("",) * (columns.nlevels - 1)
+        result.insert(0, label, data[by].values)
+    return result
+
+
+def _ema(values, starts, window):
+    return segmentedExpSmoothing(values, starts, 2 / (window + 1))
+
+
+@instrumented
+def weightedMovingAverage(data, window, newColumnNames, by=None):
+    """
+    Linearly weighted moving average of stock data
+
+    The newest row of every window has weight ``window`` and the oldest
+    weight 1. The average is computed in O(n) from cumulative sums, and the
+    first window - 1 rows are warmed up with the first value as in
+    movingAverage.
+
+    Parameters
+    ----------
+    data : pandas.core.frame.DataFrame input single series or panel window
+        : int size of the sliding window newColumnNames : str new column
+        names of the returned dataframe by : str column or index level
+        holding the ticker of a long-format panel. Data with (ticker,
+        measurement) MultiIndex columns is recognised without it
+
+    Returns
+    -------
+    pandas.core.frame.DataFrame a Pandas dataframe with the layout of the
+        data holding the weighted moving averages
+
+    Example
+    -------
+    >>> from stock_analyzer import indicators
+    >>> indicators.weightedMovingAverage(df[['Close']], 20, ['wmaClose'])
+    """
+    _checkWindow(window)
+    data, values, order, starts = _indicatorBlock(data, by)
+    with phase("kernel"):
+        smoothed = segmentedWeightedMean(values, starts, int(window))
+    with phase("output"):
+        return _smoothFrame(data, by, newColumnNames, smoothed, order)
+
+
+@instrumented
+def hullMovingAverage(data, window, newColumnNames, by=None):
+    """
+    Hull moving average of stock data
+
+    The weighted moving average, over the square root of the window, of
+    twice the weighted moving average over half the window minus the one
+    over the whole window. It follows the data with less lag than
+    movingAverage.
+
+    Parameters
+    ----------
+    data : pandas.core.frame.DataFrame input single series or panel window
+        : int size of the sliding window newColumnNames : str new column
+        names of the returned dataframe by : str column or index level
+        holding the ticker of a long-format panel. Data with (ticker,
+        measurement) MultiIndex columns is recognised without it
+
+    Returns
+    -------
+    pandas.core.frame.DataFrame a Pandas dataframe with the layout of the
+        data holding the Hull moving averages
+
+    Example
+    -------
+    >>> from stock_analyzer import indicators
+    >>> indicators.hullMovingAverage(df[['Close']], 20, ['hmaClose'])
+    """
+    _checkWindow(window)
+    window = int(window)
+    data, values, order, starts = _indicatorBlock(data, by)
+    with phase("kernel"):
+        fast = segmentedWeightedMean(values, starts, max(window // 2, 1))
+        fast *= 2
+        fast -= segmentedWeightedMean(values, starts, window)
+        smoothed = segmentedWeightedMean(
+            fast, starts, max(int(np.sqrt(window)), 1)
+        )
+    with phase("output"):
+        return _smoothFrame(data, by, newColumnNames, smoothed, order)
+
+
+@instrumented
+def doubleExponentialMovingAverage(data, window, newColumnNames, by=None):
+    """
+    Double exponential moving average (DEMA) of stock data
+
+    Twice the exponential moving average minus the exponential moving
+    average of it, which removes most of its lag. The moving averages use
+    exponential smoothing with alpha = 2 / (window + 1).
+
+    Parameters
+    ----------
+    data : pandas.core.frame.DataFrame input single series or panel window
+        : int period of the exponential moving averages newColumnNames :
+        str new column names of the returned dataframe by : str column or
+        index level holding the ticker of a long-format panel. Data with
+        (ticker, measurement) MultiIndex columns is recognised without it
+
+    Returns
+    -------
+    pandas.core.frame.DataFrame a Pandas dataframe with the layout of the
+        data holding the double exponential moving averages
+
+    Example
+    -------
+    >>> from stock_analyzer import indicators
+    >>> indicators.doubleExponentialMovingAverage(df[['Close']], 20,
+    ... ['demaClose'])
+    """
+    _checkWindow(window)
+    data, values, order, starts = _indicatorBlock(data, by)
+    with phase("kernel"):
+        once = _ema(values, starts, window)
+        smoothed = 2 * once
+        smoothed -= _ema(once, starts, window)
+    with phase("output"):
+        return _smoothFrame(data, by, newColumnNames, smoothed, order)
+
+
+@instrumented
+def tripleExponentialMovingAverage(data, window, newColumnNames, by=None):
+    """
+    Triple exponential moving average (TEMA) of stock data
+
+    Three times the exponential moving average, minus three times the one
+    of it, plus the one of that, which removes the lag of the first two.
+    The moving averages use exponential smoothing with alpha = 2 / (window
+    + 1).
+
+    Parameters
+    ----------
+    data : pandas.core.frame.DataFrame input single series or panel window
+        : int period of the exponential moving averages newColumnNames :
+        str new column names of the returned dataframe by : str column or
+        index level holding the ticker of a long-format panel. Data with
+        (ticker, measurement) MultiIndex columns is recognised without it
+
+    Returns
+    -------
+    pandas.core.frame.DataFrame a Pandas dataframe with the layout of the
+        data holding the triple exponential moving averages
+
+    Example
+    -------
+    >>> from stock_analyzer import indicators
+    >>> indicators.tripleExponentialMovingAverage(df[['Close']], 20,
+    ... ['temaClose'])
+    """
+    _checkWindow(window)
+    data, values, order, starts = _indicatorBlock(data, by)
+    with phase("kernel"):
+        once = _ema(values, starts, window)
+        twice = _ema(once, starts, window)
+        smoothed = _ema(twice, starts, window)
+        smoothed += 3 * (once - twice)
+    with phase("output"):
+        return _smoothFrame(data, by, newColumnNames, smoothed, order)
+
+
+@instrumented
+def macd(data, fast=12, slow=26, signal=9, by=None):
+    """
+    Moving average convergence divergence (MACD) of stock data
+
+    The MACD line is the fast minus the slow exponential moving average,
+    the signal line the exponential moving average of the MACD line and the
+    histogram their difference. The moving averages use exponential
+    smoothing with alpha = 2 / (period + 1).
+
+    Parameters
+    ----------
+    data : pandas.core.frame.DataFrame input single series or panel fast :
+        int period of the fast moving average slow : int period of the slow
+        moving average signal : int period of the signal line by : str
+        column or index level holding the ticker of a long-format panel.
+        Data with (ticker, measurement) MultiIndex columns is recognised
+        without it
+
+    Returns
+    -------
+    pandas.core.frame.DataFrame a Pandas dataframe with the index of the
+        data and a (measurement, component) column for the macd, signal and
+        histogram of every measurement
+
+    Example
+    -------
+    >>> from stock_analyzer import indicators
+    >>> indicators.macd(df[['Close']])
+    """
+    for window in [fast, slow, signal]:
+        _checkWindow(window)
+    data, values, order, starts = _indicatorBlock(data, by)
+    with phase("kernel"):
+        line = _ema(values, starts, fast)
+        line -= _ema(values, starts, slow)
+        signal_line = _ema(line, starts, signal)
+    with phase("output"):
+        return _componentFrame(
+            data,
+            by,
+            {
+                "macd": line,
+                "signal": signal_line,
+                "histogram": line - signal_line,
+            },
+            order,
+        )
+
+
+@instrumented
+def bollingerBands(data, window=20, width=2, by=None):
+    """
+    Bollinger Bands of stock data
+
+    The middle band is the moving average and the upper and lower bands lie
+    ``width`` standard deviations of the same window above and below it.
+    The standard deviation is the population one, computed with the moving
+    average of the squares, and the first window - 1 rows are warmed up
+    with the first value as in movingAverage.
+
+    Parameters
+    ----------
+    data : pandas.core.frame.DataFrame input single series or panel window
+        : int size of the sliding window width : float number of standard
+        deviations between the middle and the outer bands by : str column
+        or index level holding the ticker of a long-format panel. Data with
+        (ticker, measurement) MultiIndex columns is recognised without it
+
+    Returns
+    -------
+    pandas.core.frame.DataFrame a Pandas dataframe with the index of the
+        data and a (measurement, component) column for the middle, upper and
+        lower band of every measurement
+
+    Example
+    -------
+    >>> from stock_analyzer import indicators
+    >>> indicators.bollingerBands(df[['Close']], 20, 2)
+    """
+    _checkWindow(window)
+    if not isinstance(width, (int, float, np.number)) or width <= 0:
+        raise ValueError("The value of width must be positive.")
+    window = int(window)
+    data, values, order, starts = _indicatorBlock(data, by)
+    with phase("kernel"):
+        _, lengths = _segmentIds(len(values), starts)
+        first = np.repeat(values[starts], lengths, axis=0)
+        centered = values - first
+        middle = segmentedRollingMean(centered, starts, window)
+        spread = segmentedRollingMean(centered * centered, starts, window)
+        spread -= middle * middle
+        np.maximum(spread, 0, out=spread)
+        np.sqrt(spread, out=spread)
+        spread *= width
+        middle += first
+    with phase("output"):
+        return _componentFrame(
+            data,
+            by,
+            {
+                "middle": middle,
+                "upper": middle + spread,
+                "lower": middle - spread,
+            },
+            order,
+        )
+
+
+@instrumented
+def relativeStrengthIndex(data, newColumnNames, window=14, by=None):
+    """
+    Relative strength index (RSI) of stock data
+
+    The share, between 0 and 100, of the average gain in the sum of the
+    average gain and the average loss from row to row. Gains and losses are
+    averaged with Wilder's smoothing, exponential smoothing with alpha = 1 /
+    window, starting from the first row. Rows without any change so far are
+    NaN.
+
+    Parameters
+    ----------
+    data : pandas.core.frame.DataFrame input single series or panel
+        newColumnNames : str new column names of the returned dataframe
+        window : int period of the averages. Default is 14 by : str column
+        or index level holding the ticker of a long-format panel. Data with
+        (ticker, measurement) MultiIndex columns is recognised without it
+
+    Returns
+    -------
+    pandas.core.frame.DataFrame a Pandas dataframe with the layout of the
+        data holding the relative strength index
+
+    Example
+    -------
+    >>> from stock_analyzer import indicators
+    >>> indicators.relativeStrengthIndex(df[['Close']], ['rsiClose'])
+    """
+    _checkWindow(window)
+    data, values, order, starts = _indicatorBlock(data, by)
+    with phase("kernel"):
+        k = values.shape[1]
+        moves = np.zeros((len(values), 2 * k))
+        np.subtract(values[1:], values[:-1], out=moves[1:, :k])
+        moves[starts, :k] = 0
+        np.negative(moves[:, :k], out=moves[:, k:])
+        np.maximum(moves, 0, out=moves)
+        # gains and losses are smoothed in the same pass
+        averages = segmentedExpSmoothing(moves, starts, 1 / window)
+        total = averages[:, :k] + averages[:, k:]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            index = 100 * averages[:, :k] / total
+        index[total == 0] = np.nan
+    with phase("output"):
+        return _smoothFrame(data, by, newColumnNames, index, order)
+
+
+@instrumented
+def averageTrueRange(
+    data, window=14, measurements=["High", "Low", "Close"], by=None
+):
+    """
+    Average true range (ATR) of stock data
+
+    The true range of a row is the largest of its high minus its low and
+    the distances of its high and its low from the previous close. It is
+    averaged with Wilder's smoothing, exponential smoothing with alpha = 1 /
+    window, starting from the first row, whose true range is its high minus
+    its low.
+
+    Parameters
+    ----------
+    data : pandas.core.frame.DataFrame input single series or panel window :
+        int period of the average. Default is 14 measurements : list the
+        high, low and close columns, in this order by : str column or index
+        level holding the ticker of a long-format panel. Data with (ticker,
+        measurement) MultiIndex columns is recognised without it
+
+    Returns
+    -------
+    pandas.core.frame.DataFrame a Pandas dataframe with the index of the
+        data and an "atr" column, one per ticker for MultiIndex columns
+
+    Example
+    -------
+    >>> from stock_analyzer import indicators
+    >>> indicators.averageTrueRange(df)
+    """
+    _checkWindow(window)
+    if len(measurements) != 3:
+        raise ValueError(
+            "The measurements must be the high, low and close columns."
+        )
+    with phase("coerce"):
+        data = _toDataFrame(data)
+        if by is not None:
+            frame, _, order, starts = _panelSegments(data, by)
+            values = _toNumericBlock(frame, measurements)[order]
+            tickers = None
+        else:
+            values, _, tickers, _ = _statsBlock(data, measurements, None)
+            order = None
+            starts = np.zeros(1 if len(values) else 0, dtype=int)
+    annotate(values)
+    with phase("validate"):
+        column = _firstNanColumn(values)
+    if column is not None:
+        _raiseNan(measurements[column % 3], values[:, column])
+
+    with phase("kernel"):
+        high, low, close = (values[:, i::3] for i in range(3))
+        previous = np.empty(close.shape)
+        previous[1:] = close[:-1]
+        previous[starts] = close[starts]
+        true_range = high - low
+        np.maximum(true_range, np.abs(high - previous), out=true_range)
+        np.maximum(true_range, np.abs(low - previous), out=true_range)
+        atr = segmentedExpSmoothing(true_range, starts, 1 / window)
+
+    with phase("output"):
+        if tickers is None:
+            return _smoothFrame(data, by, ["atr"], atr, order)
+        return pd.DataFrame(
+            atr,
+            index=data.index,
+            columns=pd.MultiIndex.from_arrays(
+                [tickers, ["atr"] * len(tickers)],
+                names=data.columns.names[:1] + [None],
+            ),
+            copy=False,
+        )
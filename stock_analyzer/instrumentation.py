@@ -0,0 +1,303 @@
+import functools
+import logging
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+# Instrumentation is off unless a profile is open or a callback is
+# registered; the public functions then only pay for one check per call.
+_profiles = []
+_callbacks = []
+_lock = threading.Lock()
+_local = threading.local()
+_NOOP = nullcontext()
+
+
+class _Phase:
+    def __init__(self, record, name):
+        self.record = record
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        phases = self.record["phases"]
+        phases[self.name] = (
+            phases.get(self.name, 0.0) + time.perf_counter() - self.start
+        )
+
+
+def _currentRecord():
+    stack = getattr(_local, "stack", None)
+    return stack[-1] if stack else None
+
+
+def phase(name):
+    """
+    Context manager timing one phase of the public function being recorded,
+    such as "coerce", "validate", "kernel" or "output"
+    """
+    record = _currentRecord()
+    if record is None:
+        return _NOOP
+    return _Phase(record, name)
+
+
+def annotate(values):
+    """
+    Count an array allocated by the public function being recorded. The
+    first array annotated gives the rows and columns processed.
+    """
+    record = _currentRecord()
+    if record is None:
+        return
+    if record["rows"] is None:
+        record["rows"] = values.shape[0]
+        record["columns"] = values.shape[1] if values.ndim > 1 else 1
+    record["bytes"] += values.nbytes
+
+
+def instrumented(function):
+    """
+    Decorator recording every call of a public function while a profile is
+    open or a callback is registered
+    """
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if not (_profiles or _callbacks):
+            return function(*args, **kwargs)
+        return _recordCall(function, args, kwargs)
+
+    return wrapper
+
+
+def _recordCall(function, args, kwargs):
+    record = {
+        "function": function.__name__,
+        "seconds": 0.0,
+        "phases": {},
+        "rows": None,
+        "columns": None,
+        "bytes": 0,
+        "peak_bytes": None,
+        "error": None,
+    }
+    stack = _local.__dict__.setdefault("stack", [])
+    # peak memory is only measured for the outermost call, as resetting the
+    # peak would spoil the measurement of an enclosing call
+    trace = (
+        not stack
+        and tracemalloc.is_tracing()
+        and hasattr(tracemalloc, "reset_peak")
+    )
+    if trace:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+    stack.append(record)
+    start = time.perf_counter()
+    try:
+        return function(*args, **kwargs)
+    except Exception as error:
+        record["error"] = type(error).__name__
+        raise
+    finally:
+        record["seconds"] = time.perf_counter() - start
+        stack.pop()
+        if trace:
+            peak = tracemalloc.get_traced_memory()[1]
+            record["peak_bytes"] = peak - baseline
+        with _lock:
+            for profile in _profiles:
+                profile.records.append(record)
+            callbacks = list(_callbacks)
+        for callback in callbacks:
+            callback(record)
+
+
+class Profile:
+    """
+    Records of the calls of the public functions made inside a profile
+    block
+
+    Every record is a dict with the function name, the total and per-phase
+    wall time in seconds, the rows and columns processed, the bytes of the
+    arrays allocated, the peak traced memory (when tracing memory) and the
+    name of the exception raised, if any.
+    """
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.records = []
+
+    def asDict(self):
+        """
+        Totals per function
+
+        Returns
+        -------
+        dict for every function, the number of calls and errors, the total
+            time and time per phase, the values (rows times columns) and
+            bytes processed and the largest peak memory
+        """
+        summary = {}
+        for record in self.records:
+            total = summary.setdefault(
+                record["function"],
+                {
+                    "calls": 0,
+                    "errors": 0,
+                    "seconds": 0.0,
+                    "phases": {},
+                    "values": 0,
+                    "bytes": 0,
+                    "peak_bytes": None,
+                },
+            )
+            total["calls"] += 1
+            total["errors"] += record["error"] is not None
+            total["seconds"] += record["seconds"]
+            phases = total["phases"]
+            for name, seconds in record["phases"].items():
+                phases[name] = phases.get(name, 0.0) + seconds
+            if record["rows"] is not None:
+                total["values"] += record["rows"] * record["columns"]
+            total["bytes"] += record["bytes"]
+            if record["peak_bytes"] is not None:
+                total["peak_bytes"] = max(
+                    total["peak_bytes"] or 0, record["peak_bytes"]
+                )
+        return summary
+
+    def toPrometheus(self):
+        """
+        Totals per function in the Prometheus text exposition format
+        """
+        return toPrometheus(self.asDict())
+
+
+@contextmanager
+def profile(trace_memory=False):
+    """
+    Record every call of the public functions made inside the block
+
+    Parameters
+    ----------
+    trace_memory : bool also measure the peak memory of every call with
+        tracemalloc. This slows the calls down noticeably. Default is False
+
+    Example
+    -------
+    >>> from stock_analyzer import instrumentation, stock_analyzer
+    >>> with instrumentation.profile() as prof:
+    ...     stock_analyzer.movingAverage(df, 50, names)
+    >>> prof.records[0]["phases"]
+    {'coerce': 0.00021, 'validate': 2.1e-05, 'kernel': 6.4e-05, 'output':
+    2.5e-05}
+    """
+    result = Profile(trace_memory)
+    started = trace_memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    with _lock:
+        _profiles.append(result)
+    try:
+        yield result
+    finally:
+        with _lock:
+            _profiles.remove(result)
+        if started:
+            tracemalloc.stop()
+
+
+def register(callback):
+    """
+    Call ``callback(record)`` after every call of the public functions
+    until it is unregistered. Records are described in Profile
+    """
+    with _lock:
+        _callbacks.append(callback)
+
+
+def unregister(callback):
+    """
+    Stop calling a callback added with register
+    """
+    with _lock:
+        _callbacks.remove(callback)
+
+
+def loggingCallback(logger=None, level=logging.INFO):
+    """
+    Callback for register that logs one line per call
+
+    Parameters
+    ----------
+    logger : logging.Logger logger to write to. Defaults to the
+        "stock_analyzer" logger level : int logging level of the messages
+
+    Example
+    -------
+    >>> from stock_analyzer import instrumentation
+    >>> instrumentation.register(instrumentation.loggingCallback())
+    """
+    if logger is None:
+        logger = logging.getLogger("stock_analyzer")
+
+    def log(record):
+        phases = " ".join(
+            f"{name}={seconds:.6f}s"
+            for name, seconds in record["phases"].items()
+        )
+        logger.log(
+            level,
+            "%s rows=%s columns=%s bytes=%d seconds=%.6f %s%s",
+            record["function"],
+            record["rows"],
+            record["columns"],
+            record["bytes"],
+            record["seconds"],
+            phases,
+            "" if record["error"] is None else " error=" + record["error"],
+        )
+
+    return log
+
+
+def toPrometheus(summary):
+    """
+    Format the totals of Profile.asDict in the Prometheus text exposition
+    format
+
+    Returns
+    -------
+    str one counter per function for calls, errors, seconds, values and
+        bytes, and one per function and phase for seconds
+    """
+    metrics = [
+        ("calls", "Number of calls."),
+        ("errors", "Number of calls that raised an exception."),
+        ("seconds", "Wall time spent in the calls."),
+        ("values", "Number of values (rows times columns) processed."),
+        ("bytes", "Bytes of the arrays allocated by the calls."),
+    ]
+    lines = []
+    for key, description in metrics:
+        name = f"stock_analyzer_{key}_total"
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} counter")
+        for function, total in summary.items():
+            lines.append(f'{name}{{function="{function}"}} {total[key]}')
+
+    name = "stock_analyzer_phase_seconds_total"
+    lines.append(f"# HELP {name} Wall time spent in every phase of the calls.")
+    lines.append(f"# TYPE {name} counter")
+    for function, total in summary.items():
+        for phase_name, seconds in total["phases"].items():
+            lines.append(
+                f'{name}{{function="{function}",phase="{phase_name}"}} '
+                f"{seconds}"
+            )
+    return "\n".join(lines) + "\n"
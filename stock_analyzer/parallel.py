@@ -0,0 +1,303 @@
+import inspect
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from . import stock_analyzer
+from ._kernels import (
+    columnStats,
+    expSmoothing,
+    nanExpSmoothing,
+    nanRollingMean,
+    rollingMean,
+    segmentedColumnStats,
+    segmentedExpSmoothing,
+    segmentedRollingMean,
+)
+
+
+def _movingAverageKernels(params):
+    window = int(params["window"])
+    return (
+        lambda values: rollingMean(values, window, stable=params["stable"]),
+        lambda values, starts: segmentedRollingMean(
+            values, starts, window, params["stable"]
+        ),
+        lambda values, starts, propagate: nanRollingMean(
+            values, window, starts, propagate, params["stable"]
+        ),
+    )
+
+
+def _exponentialSmoothingKernels(params):
+    alpha = params["alpha"]
+    return (
+        lambda values: expSmoothing(values, alpha),
+        lambda values, starts: segmentedExpSmoothing(values, starts, alpha),
+        lambda values, starts, propagate: nanExpSmoothing(
+            values, alpha, starts, propagate
+        ),
+    )
+
+
+_SMOOTHERS = {
+    "movingAverage": _movingAverageKernels,
+    "exponentialSmoothing": _exponentialSmoothingKernels,
+}
+
+
+def _computeShard(task, input_buffer, output_buffer):
+    values = np.ndarray(
+        task["shape"], dtype="float", buffer=input_buffer, order=task["order"]
+    )
+    lo, hi = task["bounds"]
+    starts = task["starts"]
+    part = values[:, lo:hi] if starts is None else values[lo:hi]
+
+    if task["analysis"] == "summaryStats":
+        if starts is None:
+            result = columnStats(part, block=task["params"]["block"])
+            result["first"] = part[:1].copy()
+            result["last"] = part[-1:].copy()
+            return result
+        return segmentedColumnStats(part, starts)
+
+    params = task["params"]
+    kernel, segmentedKernel, nanKernel = _SMOOTHERS[task["analysis"]](params)
+    out = np.ndarray(
+        task["shape"], dtype="float", buffer=output_buffer, order=task["order"]
+    )
+    smoothed = stock_analyzer._nanSmooth(
+        part, starts, nanKernel, params["nan_policy"]
+    )
+    if starts is None:
+        out[:, lo:hi] = kernel(part) if smoothed is None else smoothed
+    else:
+        out[lo:hi] = (
+            segmentedKernel(part, starts) if smoothed is None else smoothed
+        )
+    return None
+
+
+def _runShard(task):
+    """
+    Run one shard of an analysis, in a worker process or in the caller
+
+    Shards of a wide frame are column ranges, shards of a long-format panel
+    are row ranges covering whole tickers. Smoothed values are written
+    straight into the shared output array; statistics are returned.
+    """
+    shm_in = shared_memory.SharedMemory(name=task["input"])
+    shm_out = None
+    try:
+        if "output" in task:
+            shm_out = shared_memory.SharedMemory(name=task["output"])
+        return _computeShard(
+            task, shm_in.buf, None if shm_out is None else shm_out.buf
+        )
+    finally:
+        shm_in.close()
+        if shm_out is not None:
+            shm_out.close()
+
+
+def _shards(values, starts, count):
+    """
+    Split the work into at most ``count`` shards of similar size
+
+    Returns
+    -------
+    list of tuple the bounds of every shard and the first row of every
+        ticker relative to the shard (None for column shards)
+    """
+    if starts is None:
+        edges = np.linspace(0, values.shape[1], count + 1).astype(int)
+        return [
+            ((lo, hi), None)
+            for lo, hi in zip(edges[:-1], edges[1:])
+            if hi > lo
+        ]
+
+    if len(starts) == 0:
+        return []
+
+    # cut at the first ticker starting after every multiple of rows / count
+    n = values.shape[0]
+    targets = np.linspace(0, n, count + 1)[1:-1]
+    cuts = np.unique(
+        np.concatenate(
+            [
+                [0],
+                starts[
+                    np.searchsorted(starts, targets).clip(max=len(starts) - 1)
+                ],
+                [n],
+            ]
+        )
+    )
+    return [
+        ((lo, hi), starts[(starts >= lo) & (starts < hi)] - lo)
+        for lo, hi in zip(cuts[:-1], cuts[1:])
+        if hi > lo
+    ]
+
+
+def analyzeUniverse(data, analysis, *args, max_workers=None, **kwargs):
+    """
+    Run summaryStats, movingAverage or exponentialSmoothing on a large
+    universe of tickers across a pool of worker processes
+
+    The input is converted to one float64 array which is placed in shared
+    memory, so workers read it without pickling. Wide frames are split by
+    columns, long-format panels by whole tickers. The merged result is the
+    same as calling the function directly.
+
+    Parameters
+    ----------
+    data : pandas.core.frame.DataFrame input single series or panel analysis
+        : str name of the function to run, one of "summaryStats",
+        "movingAverage" and "exponentialSmoothing" args, kwargs : arguments
+        of that function, such as window, newColumnNames, alpha or by
+        max_workers : int number of worker processes. Defaults to the number
+        of CPUs; 1 runs the shards in the calling process
+
+    Returns
+    -------
+    pandas.core.frame.DataFrame the output of the chosen function
+
+    Example
+    -------
+    >>> from stock_analyzer.parallel import analyzeUniverse
+    >>> analyzeUniverse(panel, "movingAverage", 50, ["movingAverageClose"],
+    ... by="ticker", max_workers=8)
+    """
+    if analysis not in ["summaryStats", *_SMOOTHERS]:
+        raise ValueError(
+            "The analysis must be one of summaryStats, movingAverage and \
+exponentialSmoothing."
+        )
+    function = getattr(stock_analyzer, analysis)
+    try:
+        bound = inspect.signature(function).bind(data, *args, **kwargs)
+    except TypeError as error:
+        raise TypeError(f"Invalid arguments for {analysis}: {error}")
+    bound.apply_defaults()
+    params = dict(bound.arguments)
+
+    try:
+        data = pd.DataFrame(params.pop("data"))
+    except ValueError:
+        raise ValueError(
+            "Your input data cannot be converted to a pandas dataframe."
+        )
+    by = params["by"]
+    dtype = params.pop("dtype", None)
+    out = params.pop("out", None)
+
+    if analysis == "summaryStats":
+        if params["risk"]:
+            raise ValueError(
+                "Risk statistics are not supported by analyzeUniverse."
+            )
+        if params["spans"] is not None:
+            raise ValueError(
+                "Time spans are not supported by analyzeUniverse."
+            )
+        values, starts, tickers, ticker_name = stock_analyzer._statsBlock(
+            data, params["measurements"], by
+        )
+        params["block"] = max(1, 2 ** 20 // max(values.shape[1], 1))
+    else:
+        if analysis == "movingAverage":
+            if stock_analyzer._timeSpan(params["window"]) is not None:
+                raise ValueError(
+                    "Time-based windows are not supported by analyzeUniverse."
+                )
+            stock_analyzer._checkWindow(params["window"])
+        else:
+            if isinstance(params["alpha"], str) and params["alpha"] == "auto":
+                raise ValueError(
+                    "alpha='auto' is not supported by analyzeUniverse."
+                )
+            stock_analyzer._checkAlpha(params["alpha"])
+        stock_analyzer._checkNanPolicy(params["nan_policy"])
+        dtype = stock_analyzer._checkOutput(data, by, dtype, out)
+        values, order, starts = stock_analyzer._smoothBlock(
+            data, by, nan_policy=params["nan_policy"]
+        )
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    shards = _shards(values, starts, max_workers)
+    # keep the memory layout of the serial path so that reductions add up
+    # in the same order
+    layout = "F" if np.isfortran(values) else "C"
+
+    shm_in = shared_memory.SharedMemory(
+        create=True, size=max(values.nbytes, 1)
+    )
+    shm_out = None
+    try:
+        shared = np.ndarray(
+            values.shape, dtype="float", buffer=shm_in.buf, order=layout
+        )
+        shared[...] = values
+        del values
+        task = {
+            "analysis": analysis,
+            "params": params,
+            "input": shm_in.name,
+            "shape": shared.shape,
+            "order": layout,
+        }
+        if analysis != "summaryStats":
+            shm_out = shared_memory.SharedMemory(
+                create=True, size=max(shared.nbytes, 1)
+            )
+            task["output"] = shm_out.name
+
+        tasks = [
+            dict(task, bounds=bounds, starts=shard_starts)
+            for bounds, shard_starts in shards
+        ]
+        if max_workers == 1 or len(tasks) <= 1:
+            results = [_runShard(shard_task) for shard_task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(_runShard, tasks))
+
+        if analysis == "summaryStats":
+            axis = 0 if starts is not None else -1
+            keys = ["mean", "min", "max", "std", "first", "last"]
+            if not results:
+                column_stats = {key: np.empty(0) for key in keys}
+            else:
+                column_stats = {
+                    key: np.concatenate(
+                        [result[key] for result in results], axis=axis
+                    )
+                    for key in keys
+                }
+            return stock_analyzer._statsFrame(
+                column_stats, params["measurements"], tickers, ticker_name
+            )
+
+        smoothed = np.ndarray(
+            shared.shape, dtype="float", buffer=shm_out.buf, order=layout
+        ).astype(dtype)
+        if out is not None and order is None:
+            out[...] = smoothed
+            smoothed = out
+        return stock_analyzer._smoothFrame(
+            data, by, params["newColumnNames"], smoothed, order, out
+        )
+    finally:
+        shared = None
+        shm_in.close()
+        shm_in.unlink()
+        if shm_out is not None:
+            shm_out.close()
+            shm_out.unlink()
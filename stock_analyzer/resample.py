@@ -0,0 +1,244 @@
+import numpy as np
+import pandas as pd
+
+from .instrumentation import annotate, instrumented, phase
+from .stock_analyzer import _rowIndex, _toDataFrame, _toNumericBlock
+
+
+_DAY = 86400 * 10 ** 9
+
+
+def _barOffset(freq):
+    try:
+        offset = pd.tseries.frequencies.to_offset(freq)
+    except ValueError:
+        raise ValueError(f"The frequency '{freq}' is not valid.")
+    if (isinstance(offset, pd.offsets.Tick) and offset.nanos <= 0) or (
+        isinstance(
+            offset, (pd.offsets.BusinessHour, pd.offsets.CustomBusinessHour)
+        )
+    ):
+        raise ValueError(f"The frequency '{freq}' is not valid.")
+    return offset
+
+
+def _barTimes(times, offset, origins):
+    """
+    Label of the bar of every nanosecond time, as given by DataFrame.resample
+
+    Fixed frequencies such as "5min" or "2D" are counted from the origins,
+    midnight of the first day of every series, and labeled by the start of
+    the bar. Calendar frequencies are resampled day by day with pandas, so
+    weekly, monthly, quarterly and yearly bars are labeled by their last day
+    and the others by their first day
+    """
+    if isinstance(offset, pd.offsets.Tick):
+        return times - (times - origins) % offset.nanos
+    days = np.unique(times // _DAY)
+    firsts = (
+        pd.Series(days, index=pd.DatetimeIndex(days * _DAY))
+        .resample(offset)
+        .first()
+        .dropna()
+    )
+    bins = np.searchsorted(firsts.to_numpy(), days, side="right") - 1
+    labels = firsts.index.asi8[bins]
+    return labels[np.searchsorted(days, times // _DAY)]
+
+
+def _midnights(times, tz):
+    """
+    Midnight of the day of every nanosecond time, in the time zone tz when
+    given, for times and midnights in UTC
+    """
+    if tz is None:
+        return times // _DAY * _DAY
+    zoned = pd.DatetimeIndex(times).tz_localize("UTC").tz_convert(tz)
+    return zoned.normalize().asi8
+
+
+def _validEdges(column, starts, ends):
+    """
+    First and last non-NaN value of every segment, NaN for segments without
+    any, as taken for the open and close by Resampler.ohlc
+    """
+    rows = np.arange(len(column))
+    valid = ~np.isnan(column)
+    first = np.minimum.reduceat(np.where(valid, rows, len(column)), starts)
+    last = np.maximum.reduceat(np.where(valid, rows, -1), starts)
+    column = np.append(column, np.nan)
+    return (
+        column[np.where(first <= ends, first, -1)],
+        column[np.where(last >= starts, last, -1)],
+    )
+
+
+def _tickerCodes(data, by):
+    if by in data.columns:
+        keys = data[by].to_numpy()
+    elif by in data.index.names:
+        keys = data.index.get_level_values(by).to_numpy()
+    else:
+        raise ValueError(
+            f"Your specified ticker column '{by}' is not a column name or \
+index level of the data."
+        )
+    codes, tickers = pd.factorize(keys, sort=True)
+    if (codes < 0).any():
+        raise ValueError(f"Column '{by}' has missing tickers.")
+    return codes, tickers
+
+
+@instrumented
+def resampleBars(
+    data,
+    freq,
+    price=None,
+    volume="Volume",
+    by=None,
+    columns=["Open", "High", "Low", "Close"],
+):
+    """
+    Aggregate ticks or bars into OHLCV bars of a lower frequency
+
+    The rows are put in time order (per ticker) once, the bar of every row
+    is found with integer arithmetic, and every output column is a single
+    segment reduction over the sorted rows (np.maximum.reduceat and the
+    like). Bars without any row are left out. The bars and their labels are
+    those of DataFrame.resample with its defaults: fixed frequencies count
+    from midnight of the first day (of every ticker) and are labeled by
+    their start, weekly, monthly, quarterly and yearly bars are labeled by
+    their last day. With a time zone, bars below a day keep their length
+    across daylight saving changes. The result has the layout of the input,
+    so it can be passed straight to summaryStats, movingAverage,
+    exponentialSmoothing and the other functions, with the same by.
+
+    Parameters
+    ----------
+    data : pandas.core.frame.DataFrame ticks or bars with a DatetimeIndex, or
+        a datetime level in a MultiIndex freq : str frequency of the bars,
+        either fixed such as "30s", "5min" or "1D", or a calendar period such
+        as "W" or "M" price : str column holding the tick prices. Without it
+        the data is taken as bars with the columns given in columns volume :
+        str column holding the volumes, or None to leave out the Volume and
+        VWAP columns by : str column or index level holding the ticker of a
+        long-format panel. Every ticker gets its own bars columns : list the
+        open, high, low and close columns of bar data, in this order
+
+    Returns
+    -------
+    pandas.core.frame.DataFrame a Pandas dataframe indexed by the label of
+        every bar with the Open, High, Low, Close, Volume and VWAP columns,
+        and the ticker column first for a long-format panel. The VWAP weighs
+        the tick prices, or the typical price (high + low + close) / 3 of
+        bars, by their volume
+
+    Example
+    -------
+    >>> from stock_analyzer import resample, stock_analyzer
+    >>> daily = resample.resampleBars(ticks, "1D", price="Price",
+    ... by="ticker")
+    >>> stock_analyzer.summaryStats(daily, ["Close", "VWAP"], by="ticker")
+    """
+    if price is None and len(columns) != 4:
+        raise ValueError(
+            "The columns must be the open, high, low and close columns."
+        )
+    offset = _barOffset(freq)
+    with phase("coerce"):
+        data = _toDataFrame(data)
+        try:
+            index = _rowIndex(data)
+        except ValueError:
+            raise ValueError("Resampling needs data with a DatetimeIndex.")
+        tz = index.tz
+        # as DataFrame.resample does, fixed frequencies below a day count in
+        # UTC from local midnight, so bars keep their length across daylight
+        # saving changes, while days and calendar periods follow the clock
+        zone = None
+        if isinstance(offset, pd.offsets.Tick) and not isinstance(
+            offset, pd.offsets.Day
+        ):
+            zone = tz
+        elif tz is not None:
+            index = index.tz_localize(None)
+        times = index.values.astype("datetime64[ns]").view("int64")
+        names = [price] if price is not None else list(columns)
+        if volume is not None:
+            names.append(volume)
+        values = _toNumericBlock(data, names)
+        codes, tickers = (None, None) if by is None else _tickerCodes(data, by)
+    annotate(values)
+
+    with phase("kernel"):
+        # one stable sort puts every bar of every ticker in one run of rows
+        if codes is None:
+            if (np.diff(times) < 0).any():
+                order = np.argsort(times, kind="stable")
+                times, values = times[order], values[order]
+        elif (np.diff(codes) < 0).any() or (
+            np.diff(times)[np.diff(codes) == 0] < 0
+        ).any():
+            order = np.lexsort((times, codes))
+            times, values, codes = times[order], values[order], codes[order]
+
+        n = len(times)
+        # fixed frequencies count from midnight of the first day of every
+        # ticker, as DataFrame.resample and groupby(...).resample do
+        origins = _midnights(times[:1], zone)
+        if codes is not None and n:
+            firsts = np.flatnonzero(np.diff(codes, prepend=-1))
+            counts = np.diff(np.append(firsts, n))
+            origins = np.repeat(_midnights(times[firsts], zone), counts)
+        bars = _barTimes(times, offset, origins)
+        change = bars[1:] != bars[:-1]
+        if codes is not None:
+            change |= codes[1:] != codes[:-1]
+        starts = np.flatnonzero(np.concatenate([[n > 0], change]))
+        ends = np.append(starts[1:], n) - 1
+
+        out = np.empty((len(starts), 6 if volume is not None else 4))
+        if price is not None:
+            prices = values[:, 0]
+            opens = high = low = closes = prices
+        else:
+            opens, high, low, closes = values[:, :4].T
+            prices = (values[:, 1] + values[:, 2] + values[:, 3]) / 3
+        if n:
+            # missing prices are skipped, as by Resampler.ohlc
+            out[:, 0] = _validEdges(opens, starts, ends)[0]
+            out[:, 3] = _validEdges(closes, starts, ends)[1]
+            out[:, 1] = np.fmax.reduceat(high, starts)
+            out[:, 2] = np.fmin.reduceat(low, starts)
+        if volume is not None:
+            # missing prices and volumes are skipped, as by pandas' sum
+            volumes = values[:, -1]
+            volumes = np.where(np.isnan(volumes), 0.0, volumes)
+            weighted = prices * volumes
+            weighted[np.isnan(weighted)] = 0.0
+            if n:
+                out[:, 4] = np.add.reduceat(volumes, starts)
+                out[:, 5] = np.add.reduceat(weighted, starts)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                out[:, 5] /= out[:, 4]
+    annotate(out)
+
+    with phase("output"):
+        bar_index = pd.DatetimeIndex(bars[starts], name=index.name)
+        if zone is not None:
+            bar_index = bar_index.tz_localize("UTC").tz_convert(zone)
+        elif tz is not None:
+            bar_index = bar_index.tz_localize(
+                tz, ambiguous=True, nonexistent="shift_forward"
+            )
+        result = pd.DataFrame(
+            out,
+            index=bar_index,
+            columns=["Open", "High", "Low", "Close", "Volume", "VWAP"][
+                : out.shape[1]
+            ],
+            copy=False,
+        )
+        if codes is not None:
+            result.insert(0, by, tickers[codes[starts]])
+        return result
@@ -0,0 +1,102 @@
+import pandas as pd
+
+from ._kernels import riskMeasures
+from .instrumentation import annotate, instrumented, phase
+from .stock_analyzer import (
+    _panelSegments,
+    _statsBlock,
+    _statsLabels,
+    _toDataFrame,
+    _toNumericBlock,
+)
+
+
+def _checkRiskArguments(returns, periods, level):
+    if returns not in ["log", "simple"]:
+        raise ValueError("The returns must be log or simple.")
+    if periods <= 0:
+        raise ValueError("The value of periods must be positive.")
+    if not 0 < level < 1:
+        raise ValueError("The value of level must be between 0 and 1.")
+
+
+def _benchmarkPrices(data, benchmark, by):
+    """
+    Benchmark prices in the row order of the measurements
+    """
+    if benchmark not in data.columns:
+        raise ValueError(
+            f"Your specified benchmark '{benchmark}' is not a column name of \
+the data."
+        )
+    prices = _toNumericBlock(data, [benchmark])[:, 0]
+    if by is not None:
+        prices = prices[_panelSegments(data, by)[2]]
+    return prices
+
+
+@instrumented
+def riskStats(
+    data,
+    measurements=["Close"],
+    by=None,
+    returns="log",
+    periods=252,
+    risk_free=0.0,
+    level=0.95,
+    benchmark=None,
+):
+    """
+    Generate return and risk statistics for profile stock data
+
+    All measurements and tickers are handled together by vectorized
+    reductions over their returns. The rows are laid out as in the output
+    of summaryStats, so both tables can be joined column by column; use
+    summaryStats with risk=True to get them in one table.
+
+    Parameters
+    ----------
+    data : pandas.core.frame.DataFrame input single series or panel
+        measurements : list columns holding the prices to be measured. Default
+        is ["Close"] by : str column or index level holding the ticker of a
+        long-format panel. Data with (ticker, measurement) MultiIndex columns
+        is recognised without it returns : str "log" (default) or "simple"
+        returns between consecutive rows periods : int number of rows per
+        year, used to annualize. Default is 252 trading days risk_free : float
+        annual risk-free rate subtracted in the Sharpe and Sortino ratios.
+        Default is 0 level : float confidence level of the value at risk.
+        Default is 0.95 benchmark : str optional column holding benchmark
+        prices, such as an index, to measure the beta against. For
+        MultiIndex columns it is a (ticker, measurement) pair
+
+    Returns
+    -------
+    pandas.core.frame.DataFrame a Pandas dataframe with the annualized mean
+        return and volatility, the Sharpe and Sortino ratios, the maximum
+        drawdown (a negative fraction of the peak), the historical value at
+        risk and conditional value at risk (positive losses per row) and,
+        with a benchmark, the beta of every measurement (and ticker)
+
+    Example
+    -------
+    >>> from stock_analyzer import risk
+    >>> risk.riskStats(df, measurements=["Close", "Adj Close"])
+    """
+    _checkRiskArguments(returns, periods, level)
+    with phase("coerce"):
+        data = _toDataFrame(data)
+        values, starts, tickers, ticker_name = _statsBlock(
+            data, measurements, by
+        )
+        prices = None
+        if benchmark is not None:
+            prices = _benchmarkPrices(data, benchmark, by)
+    annotate(values)
+    with phase("kernel"):
+        stats = riskMeasures(
+            values, starts, returns, periods, risk_free, level, prices
+        )
+    with phase("output"):
+        return pd.DataFrame(
+            {**_statsLabels(measurements, tickers, ticker_name), **stats}
+        )
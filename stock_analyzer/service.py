@@ -0,0 +1,527 @@
+import argparse
+import asyncio
+import hashlib
+import inspect
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from . import stock_analyzer
+from .cache import _fingerprint
+
+_ANALYSES = ["summaryStats", "movingAverage", "exponentialSmoothing"]
+# ticker column of the panels that batched requests are merged into
+_BATCH_KEY = "__request__"
+
+
+def _bindArguments(analysis, data, args, kwargs):
+    """
+    Validate the arguments of an analysis like a direct call would
+
+    Returns
+    -------
+    tuple the input as a dataframe and the remaining arguments by name
+    """
+    function = getattr(stock_analyzer, analysis)
+    try:
+        bound = inspect.signature(function).bind(data, *args, **kwargs)
+    except TypeError as error:
+        raise TypeError(f"Invalid arguments for {analysis}: {error}")
+    bound.apply_defaults()
+    params = dict(bound.arguments)
+    return stock_analyzer._toDataFrame(params.pop("data")), params
+
+
+def _requestKey(analysis, data, params):
+    """
+    Content hash identifying a request, or None for requests that must not
+    be shared, such as ones writing into an out array
+    """
+    if params.get("out") is not None:
+        return None
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((analysis, sorted(params.items()))).encode())
+    dtypes = data.dtypes.tolist()
+    labels = (list(data.columns), dtypes, list(data.index.names))
+    digest.update(repr(labels).encode())
+    index = data.index.to_numpy()
+    if index.dtype.kind in "iufM" and stock_analyzer._isFloatCompatible(
+        dtypes
+    ):
+        # numeric inputs are hashed as raw bytes, several times faster
+        digest.update(_fingerprint(data.to_numpy(dtype="float")).encode())
+        digest.update(np.ascontiguousarray(index).view("uint8").data)
+    else:
+        digest.update(
+            pd.util.hash_pandas_object(data, index=True).values.data
+        )
+    return digest.hexdigest()
+
+
+def _batchGroup(analysis, data, params):
+    """
+    Requests with the same group are merged into one long-format panel.
+    Only single series without options that depend on the whole input are
+    merged; the group is None for the others
+    """
+    if (
+        params["by"] is not None
+        or len(data) == 0
+        or isinstance(data.columns, pd.MultiIndex)
+        or _BATCH_KEY in data.columns
+        or params.get("out") is not None
+        or params.get("spans") is not None
+        or params.get("alpha") == "auto"
+        or not isinstance(params.get("window", 0), (int, float, np.number))
+    ):
+        return None
+    return repr((analysis, list(data.columns), sorted(params.items())))
+
+
+def _compute(analysis, frames, params):
+    """
+    Run one analysis on the inputs of one or more requests
+
+    Several inputs are stacked into a long-format panel with one ticker per
+    request and computed in one call, then split again. If the panel fails,
+    every input is computed on its own so that errors reach only the
+    requests causing them.
+
+    Returns
+    -------
+    list of tuple for every input, whether it succeeded and its result or
+        the exception raised
+    """
+    function = getattr(stock_analyzer, analysis)
+    if len(frames) > 1:
+        try:
+            results = _batch(function, frames, params)
+            return [(True, result) for result in results]
+        except Exception:
+            pass
+    outcomes = []
+    for frame in frames:
+        try:
+            outcomes.append((True, function(frame, **params)))
+        except Exception as error:
+            outcomes.append((False, error))
+    return outcomes
+
+
+def _batch(function, frames, params):
+    lengths = np.array([len(frame) for frame in frames])
+    panel = pd.concat(frames)
+    panel.insert(0, _BATCH_KEY, np.repeat(np.arange(len(frames)), lengths))
+    result = function(panel, **dict(params, by=_BATCH_KEY))
+    result = result.drop(columns=_BATCH_KEY)
+
+    if function.__name__ == "summaryStats":
+        # one row per request and measurement, in order of the requests
+        rows = len(params["measurements"])
+        return [
+            result.iloc[i * rows:(i + 1) * rows].reset_index(drop=True)
+            for i in range(len(frames))
+        ]
+    ends = np.cumsum(lengths)
+    parts = []
+    for frame, lo, hi in zip(frames, ends - lengths, ends):
+        part = result.iloc[lo:hi]
+        part.index = frame.index
+        parts.append(part)
+    return parts
+
+
+class AnalysisService:
+    """
+    Asynchronous front end of summaryStats, movingAverage and
+    exponentialSmoothing for event-loop based servers
+
+    The computations run on a bounded pool of workers, so the event loop is
+    never blocked. Concurrent requests with the same input and arguments
+    are computed once, and every caller gets its own copy of the result.
+    Requests for single series
+    arriving within ``batch_delay`` seconds of each other, with the same
+    columns and arguments, are stacked into one long-format panel and
+    computed in one vectorized call, as if every request were a ticker.
+
+    Parameters
+    ----------
+    max_workers : int number of worker threads. Default is the default of
+        ThreadPoolExecutor executor : concurrent.futures.Executor optional
+        pool to run the computations on instead, such as a
+        ProcessPoolExecutor batch_delay : float seconds to wait for more
+        requests to batch with the first one. 0 disables batching. Default
+        is 0.002 max_batch : int number of requests that starts a batch
+        without waiting. Default is 64
+
+    Example
+    -------
+    >>> from stock_analyzer.service import AnalysisService
+    >>> service = AnalysisService(max_workers=4)
+    >>> stats = await asyncio.gather(*(service.summaryStats(df, ["Close"])
+    ... for df in frames))
+    >>> service.info()
+    """
+
+    def __init__(
+        self, max_workers=None, executor=None, batch_delay=0.002, max_batch=64
+    ):
+        if batch_delay < 0:
+            raise ValueError("The value of batch_delay must not be negative.")
+        if max_batch < 1 or int(max_batch) != max_batch:
+            raise ValueError(
+                "The value of max_batch must be a positive integer."
+            )
+        self._owned = executor is None
+        self._executor = (
+            ThreadPoolExecutor(max_workers=max_workers)
+            if executor is None
+            else executor
+        )
+        self.batch_delay = batch_delay
+        self.max_batch = int(max_batch)
+        self._inflight = {}
+        self._pending = {}
+        self.requests = 0
+        self.coalesced = 0
+        self.batches = 0
+        self.computations = 0
+
+    def info(self):
+        """
+        Request counters of the service
+
+        Returns
+        -------
+        dict counts of requests, of requests sharing the result of an
+            identical one in flight, of batches of several requests, of
+            computations run on the pool and of requests in flight
+        """
+        return {
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "batches": self.batches,
+            "computations": self.computations,
+            "inflight": len(self._inflight),
+        }
+
+    def close(self):
+        """
+        Shut down the worker pool, unless it was passed in
+        """
+        if self._owned:
+            self._executor.shutdown()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    async def summaryStats(self, data, *args, **kwargs):
+        """
+        Asynchronous stock_analyzer.summaryStats
+
+        Parameters and return value are the same as for summaryStats.
+        """
+        return await self._submit("summaryStats", data, args, kwargs)
+
+    async def movingAverage(self, data, *args, **kwargs):
+        """
+        Asynchronous stock_analyzer.movingAverage
+
+        Parameters and return value are the same as for movingAverage.
+        """
+        return await self._submit("movingAverage", data, args, kwargs)
+
+    async def exponentialSmoothing(self, data, *args, **kwargs):
+        """
+        Asynchronous stock_analyzer.exponentialSmoothing
+
+        Parameters and return value are the same as for
+        exponentialSmoothing.
+        """
+        return await self._submit("exponentialSmoothing", data, args, kwargs)
+
+    async def _submit(self, analysis, data, args, kwargs):
+        data, params = _bindArguments(analysis, data, args, kwargs)
+        self.requests += 1
+        key = _requestKey(analysis, data, params)
+        future = self._inflight.get(key) if key is not None else None
+        if future is not None:
+            self.coalesced += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            if key is not None:
+                self._inflight[key] = future
+                future.add_done_callback(
+                    lambda _: self._inflight.pop(key, None)
+                )
+            self._enqueue(analysis, data, params, future)
+        # a cancelled caller must not cancel the callers sharing the future,
+        # and every caller, the first included, gets a dataframe of its own
+        return (await asyncio.shield(future)).copy()
+
+    def _enqueue(self, analysis, data, params, future):
+        group = None
+        if self.batch_delay > 0:
+            group = _batchGroup(analysis, data, params)
+        if group is None:
+            self._start(analysis, params, [(data, future)])
+            return
+
+        batch = self._pending.setdefault(group, [])
+        batch.append((data, future))
+        if len(batch) == 1:
+            asyncio.get_running_loop().call_later(
+                self.batch_delay, self._flush, group, batch, analysis, params
+            )
+        if len(batch) >= self.max_batch:
+            self._flush(group, batch, analysis, params)
+
+    def _flush(self, group, batch, analysis, params):
+        # the timer of a batch flushed for being full finds a new batch or
+        # none under its group
+        if self._pending.get(group) is not batch:
+            return
+        del self._pending[group]
+        self._start(analysis, params, batch)
+
+    def _start(self, analysis, params, requests):
+        self.computations += 1
+        if len(requests) > 1:
+            self.batches += 1
+        frames = [data for data, _ in requests]
+        futures = [future for _, future in requests]
+        loop = asyncio.get_running_loop()
+        task = loop.run_in_executor(
+            self._executor, _compute, analysis, frames, params
+        )
+
+        def deliver(task):
+            if task.cancelled():
+                outcomes = [(False, asyncio.CancelledError())] * len(futures)
+            elif task.exception() is not None:
+                outcomes = [(False, task.exception())] * len(futures)
+            else:
+                outcomes = task.result()
+            for future, (ok, value) in zip(futures, outcomes):
+                if future.done():
+                    continue
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+
+        task.add_done_callback(deliver)
+
+
+_default = None
+
+
+def _defaultService():
+    global _default
+    if _default is None:
+        _default = AnalysisService()
+    return _default
+
+
+async def asummaryStats(data, *args, **kwargs):
+    """
+    Run summaryStats without blocking the event loop
+
+    Uses a shared AnalysisService with the default settings, so concurrent
+    calls are coalesced and batched. Parameters and return value are the
+    same as for summaryStats.
+
+    Example
+    -------
+    >>> from stock_analyzer.service import asummaryStats
+    >>> stats = await asummaryStats(df, measurements=["Open", "Close"])
+    """
+    return await _defaultService().summaryStats(data, *args, **kwargs)
+
+
+async def amovingAverage(data, *args, **kwargs):
+    """
+    Run movingAverage without blocking the event loop
+
+    Uses the shared AnalysisService of asummaryStats. Parameters and return
+    value are the same as for movingAverage.
+    """
+    return await _defaultService().movingAverage(data, *args, **kwargs)
+
+
+async def aexponentialSmoothing(data, *args, **kwargs):
+    """
+    Run exponentialSmoothing without blocking the event loop
+
+    Uses the shared AnalysisService of asummaryStats. Parameters and return
+    value are the same as for exponentialSmoothing.
+    """
+    return await _defaultService().exponentialSmoothing(
+        data, *args, **kwargs
+    )
+
+
+def _frameFromJson(payload):
+    """
+    Dataframe of a request body in the "split" layout of DataFrame.to_json,
+    with ISO dates in the index turned into a DatetimeIndex
+    """
+    try:
+        data = pd.DataFrame(
+            payload["data"],
+            index=payload.get("index"),
+            columns=payload["columns"],
+        )
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(
+            "The data must have the columns, index and data of \
+DataFrame.to_json(orient='split')."
+        )
+    if data.index.dtype == object:
+        try:
+            data.index = pd.DatetimeIndex(data.index)
+        except (TypeError, ValueError):
+            pass
+    return data
+
+
+async def _respond(writer, status, body):
+    reasons = {
+        200: "OK",
+        400: "Bad Request",
+        404: "Not Found",
+        500: "Internal Server Error",
+    }
+    content = body.encode()
+    writer.write(
+        f"HTTP/1.1 {status} {reasons[status]}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(content)}\r\n"
+        f"Connection: close\r\n\r\n".encode()
+        + content
+    )
+    await writer.drain()
+    writer.close()
+
+
+async def _handle(service, reader, writer):
+    """
+    Answer one HTTP request: POST /<analysis> with a JSON body holding the
+    data and the keyword arguments of the analysis
+    """
+    try:
+        method, path, _ = (await reader.readline()).decode().split(" ", 2)
+        length = 0
+        while True:
+            line = (await reader.readline()).decode().strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        body = await reader.readexactly(length)
+    except (ValueError, asyncio.IncompleteReadError):
+        await _respond(writer, 400, json.dumps({"error": "Bad request."}))
+        return
+
+    analysis = path.strip("/")
+    if method != "POST" or analysis not in _ANALYSES:
+        await _respond(
+            writer, 404, json.dumps({"error": f"Unknown path {path}."})
+        )
+        return
+    try:
+        payload = json.loads(body)
+        if not isinstance(payload, dict):
+            raise ValueError("The request body must be a JSON object.")
+        data = _frameFromJson(payload.get("data", {}))
+        result = await getattr(service, analysis)(
+            data, **payload.get("args", {})
+        )
+        content = result.to_json(orient="split", date_format="iso")
+    except (ValueError, TypeError, KeyError) as error:
+        await _respond(writer, 400, json.dumps({"error": str(error)}))
+        return
+    except Exception as error:
+        # the client always gets an answer, whatever went wrong
+        await _respond(
+            writer,
+            500,
+            json.dumps({"error": f"{type(error).__name__}: {error}"}),
+        )
+        return
+    await _respond(writer, 200, content)
+
+
+async def startServer(host="127.0.0.1", port=8000, service=None):
+    """
+    Start a small HTTP server answering analysis requests, for local use and
+    load tests
+
+    Every request is a POST to /summaryStats, /movingAverage or
+    /exponentialSmoothing with a JSON body {"data": ..., "args": {...}},
+    where data is a dataframe in the layout of
+    DataFrame.to_json(orient="split") and args holds the keyword arguments
+    of the analysis. The result is returned in the same layout.
+
+    Parameters
+    ----------
+    host : str address to listen on. Default is "127.0.0.1" port : int port
+        to listen on, 0 for any free port. Default is 8000 service :
+        AnalysisService service answering the requests. Default is a new one
+        with the default settings
+
+    Returns
+    -------
+    asyncio.Server the started server
+
+    Example
+    -------
+    >>> from stock_analyzer.service import startServer
+    >>> server = await startServer(port=8080)
+    >>> await server.serve_forever()
+    """
+    if service is None:
+        service = AnalysisService()
+    return await asyncio.start_server(
+        lambda reader, writer: _handle(service, reader, writer), host, port
+    )
+
+
+def main(argv=None):
+    """
+    Command line entry point: python -m stock_analyzer.service
+    """
+    parser = argparse.ArgumentParser(
+        description="Serve stock_analyzer analyses over HTTP."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-delay", type=float, default=0.002)
+    parser.add_argument("--max-batch", type=int, default=64)
+    options = parser.parse_args(argv)
+
+    async def run():
+        async with AnalysisService(
+            options.workers,
+            batch_delay=options.batch_delay,
+            max_batch=options.max_batch,
+        ) as service:
+            server = await startServer(options.host, options.port, service)
+            async with server:
+                await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
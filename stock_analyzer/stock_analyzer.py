@@ -1,9 +1,41 @@
+from statistics import NormalDist
+
 import numpy as np
 import pandas as pd
-import altair as alt
+
+from ._kernels import (
+    columnStats,
+    expSmoothing,
+    expSmoothingAlphas,
+    expSmoothingSweep,
+    fitAlpha,
+    forwardFill,
+    holtSmoothing,
+    minMaxIndices,
+    nanExpSmoothing,
+    nanRollingMean,
+    oneStepVariance,
+    riskMeasures,
+    rollingColumnStats,
+    rollingMean,
+    rollingMeanSweep,
+    segmentedColumnStats,
+    segmentedExpSmoothing,
+    segmentedRollingMean,
+    smoothingForecast,
+    timeRollingMean,
+)
+from .instrumentation import annotate, instrumented, phase
 
 
-def summaryStats(data, measurements=["High", "Low", "Open", "Close"]):
+@instrumented
+def summaryStats(
+    data,
+    measurements=["High", "Low", "Open", "Close"],
+    by=None,
+    spans=None,
+    risk=False,
+):
     """
     Generate summary statistics for profile stock data
 
@@ -13,14 +45,23 @@ def summaryStats(data, measurements=["High", "Low", "Open", "Close"]):
         input data. It should be convertable to a pandas dataframe measurements
         : str columns to be summarized on. All elements should be column names
         of data. The calculation of statistics will be based on the specified
-        measurement of stock price.
+        measurement of stock price. by : str column or index level holding the
+        ticker of a long-format panel. Statistics are then computed for every
+        ticker. Data with (ticker, measurement) MultiIndex columns is
+        recognised without it spans : list optional time spans ending at the
+        last row, each either a number of rows or, for a DatetimeIndex, an
+        offset such as "7D". Statistics are then computed for every span
+        risk : bool also add the return and risk statistics of risk.riskStats,
+        with its default settings, as columns
 
     Returns
     -------
     pandas.core.frame.DataFrame a Pandas dataframe that contains summary
         statistics for the specified columns of the data. Statistics calculated
         include mean price, minimum price, maximum price, volatility and
-        return.
+        return. Panels get one row per ticker and measurement, with the ticker
+        in the first column. With spans, there is one row per span and
+        measurement, starting with the start_date and end_date of the span.
 
     Example
     -------
@@ -36,63 +77,584 @@ def summaryStats(data, measurements=["High", "Low", "Open", "Close"]):
 
     [2 rows x 6 columns]
     """
-    try:
-        data = pd.DataFrame(data)
-    except ValueError:
+    with phase("coerce"):
+        try:
+            data = pd.DataFrame(data)
+        except ValueError:
+            raise ValueError(
+                "Your input data cannot be converted to a pandas dataframe."
+            )
+
+    if spans is not None:
+        return _spanStats(data, measurements, by, spans, risk)
+
+    with phase("coerce"):
+        values, starts, tickers, ticker_name = _statsBlock(
+            data, measurements, by
+        )
+    annotate(values)
+    with phase("kernel"):
+        if starts is None:
+            column_stats = columnStats(values)
+            column_stats["first"] = values[:1]
+            column_stats["last"] = values[-1:]
+        else:
+            column_stats = segmentedColumnStats(values, starts)
+        risk_stats = riskMeasures(values, starts) if risk else {}
+    with phase("output"):
+        frame = _statsFrame(column_stats, measurements, tickers, ticker_name)
+        return _addColumns(frame, risk_stats)
+
+
+def _addColumns(frame, columns):
+    for name, values in columns.items():
+        frame[name] = values
+    return frame
+
+
+def _spanStart(index, span):
+    """
+    Position of the first row of a time span ending at the last row
+    """
+    if isinstance(span, (int, np.integer)):
+        if span < 1:
+            raise ValueError("The time spans must be positive.")
+        return max(len(index) - int(span), 0)
+    if not isinstance(index, pd.DatetimeIndex):
         raise ValueError(
-            "Your input data cannot be converted to a pandas dataframe."
+            "Time spans given as offsets need data with a DatetimeIndex."
         )
-    else:
-        stats = {
-            "measurement": [],
-            "mean": [],
-            "min": [],
-            "max": [],
-            "volatility": [],
-            "return": [],
+    start = index[-1] - pd.tseries.frequencies.to_offset(span)
+    return int(index.searchsorted(start, side="right"))
+
+
+def _spanStats(data, measurements, by, spans, risk=False):
+    """
+    summaryStats for several time spans ending at the last row
+    """
+    if by is not None or isinstance(data.columns, pd.MultiIndex):
+        raise ValueError("Time spans are only supported for a single series.")
+    with phase("coerce"):
+        values = _toNumericBlock(data, measurements)
+    annotate(values)
+    if len(values) == 0:
+        raise ValueError("Time spans need at least one row of data.")
+
+    frames = []
+    for span in spans:
+        start = _spanStart(data.index, span)
+        part = values[start:]
+        with phase("kernel"):
+            column_stats = columnStats(part)
+            column_stats["first"] = part[:1]
+            column_stats["last"] = part[-1:]
+            risk_stats = riskMeasures(part) if risk else {}
+        with phase("output"):
+            frame = _statsFrame(column_stats, measurements, None, None)
+            frame = _addColumns(frame, risk_stats)
+            frame.insert(0, "start_date", data.index[start])
+            frame.insert(1, "end_date", data.index[-1])
+        frames.append(frame)
+    with phase("output"):
+        return pd.concat(frames, ignore_index=True)
+
+
+def _statsBlock(data, measurements, by):
+    """
+    Collect the measurements of a single series or a panel into one 2-D
+    float64 array
+
+    Returns
+    -------
+    tuple the array, the first row of every ticker for long-format panels
+        (None otherwise), the tickers (None for a single series) and the
+        name of the ticker column of the summary
+    """
+    if by is not None:
+        data, tickers, order, starts = _panelSegments(data, by)
+        values = _toNumericBlock(data, measurements)[order]
+        return values, starts, tickers, by
+
+    if isinstance(data.columns, pd.MultiIndex):
+        tickers = data.columns.get_level_values(0).unique()
+        columns = pd.MultiIndex.from_product([tickers, measurements])
+        missing = ~columns.isin(data.columns)
+        if missing.any():
+            _raiseMissingMeasurement(columns[missing][0][1])
+        values = _toNumericBlock(data, columns)
+        return values, None, tickers, data.columns.names[0] or "ticker"
+
+    return _toNumericBlock(data, measurements), None, None, None
+
+
+def _statsFrame(column_stats, measurements, tickers, ticker_name):
+    """
+    Assemble the output of summaryStats from per-column statistics ordered
+    ticker by ticker
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = (column_stats["last"] - column_stats["first"]) / (
+            column_stats["first"]
+        )
+    if returns.size == 0:
+        returns = np.full(column_stats["mean"].shape, np.nan)
+
+    stats = {
+        **_statsLabels(measurements, tickers, ticker_name),
+        "mean": column_stats["mean"].ravel(),
+        "min": column_stats["min"].ravel(),
+        "max": column_stats["max"].ravel(),
+        "volatility": column_stats["std"].ravel(),
+        "return": returns.ravel(),
+    }
+    return pd.DataFrame(stats)
+
+
+def _statsLabels(measurements, tickers, ticker_name):
+    """
+    Ticker and measurement columns of a table with one row per ticker and
+    measurement
+    """
+    labels = {
+        "measurement": np.tile(
+            np.array(measurements, dtype=object),
+            1 if tickers is None else len(tickers),
+        )
+    }
+    if tickers is not None:
+        labels = {
+            ticker_name: np.repeat(
+                np.asarray(tickers, dtype=object), len(measurements)
+            ),
+            **labels,
         }
-        for measurement in measurements:
-            if measurement not in list(data.columns):
-                raise ValueError(
-                    f"Your specified measurement '{measurement}' is not a \
+    return labels
+
+
+def _raiseMissingMeasurement(measurement):
+    raise ValueError(
+        f"Your specified measurement '{measurement}' is not a \
                     column name of the data. \
             Please double check the column names in data."
+    )
+
+
+def _isFloatCompatible(dtypes):
+    return all(
+        isinstance(dtype, np.dtype) and dtype.kind in "biuf"
+        for dtype in dtypes
+    )
+
+
+def _toNumericBlock(data, measurements):
+    """
+    Convert the specified columns of a dataframe into one 2-D float64 array,
+    keeping missing values as NaN
+
+    Parameters
+    ----------
+    data : pandas.core.frame.DataFrame input Pandas dataframe measurements :
+        list columns to convert
+
+    Returns
+    -------
+    numpy.ndarray an array of shape (rows, measurements)
+    """
+    for measurement in measurements:
+        if measurement not in data.columns:
+            _raiseMissingMeasurement(measurement)
+
+    selected = data[list(measurements)]
+    if _isFloatCompatible(selected.dtypes):
+        return selected.to_numpy(dtype="float")
+
+    values = np.empty((len(data), len(measurements)), dtype="float")
+    for i, measurement in enumerate(measurements):
+        data_measurement = data[measurement]
+        if not pd.api.types.is_numeric_dtype(data_measurement):
+            try:
+                data_measurement = pd.to_numeric(data_measurement)
+            except ValueError:
+                raise ValueError(
+                    f"Data in column '{measurement}' of your input data \
+                        cannot be converted to \
+            numeric format."
                 )
+        values[:, i] = data_measurement.to_numpy(
+            dtype="float", na_value=np.nan
+        )
+    return values
+
+
+def _panelSegments(data, by):
+    """
+    Group the rows of a long-format panel by ticker
+
+    Parameters
+    ----------
+    data : pandas.core.frame.DataFrame long-format panel by : str column or
+        index level holding the ticker
+
+    Returns
+    -------
+    tuple the dataframe without the ticker column, the tickers in order of
+        first appearance, the row order that makes every ticker contiguous
+        (keeping the time order within a ticker) and the first sorted row of
+        every ticker
+    """
+    if by in data.columns:
+        keys = data[by].to_numpy()
+        data = data.drop(columns=by)
+    elif by in data.index.names:
+        keys = data.index.get_level_values(by).to_numpy()
+    else:
+        raise ValueError(
+            f"Your specified ticker column '{by}' is not a column name or \
+index level of the data."
+        )
+
+    codes, tickers = pd.factorize(keys)
+    if (codes < 0).any():
+        raise ValueError(f"Column '{by}' has missing tickers.")
+    order = np.argsort(codes, kind="stable")
+    counts = np.bincount(codes, minlength=len(tickers))
+    starts = np.cumsum(counts) - counts
+    return data, tickers, order, starts
+
+
+def _newColumns(data, newColumnNames):
+    """
+    Column labels of a smoothed dataframe. For (ticker, measurement)
+    MultiIndex columns, newColumnNames renames the measurements in order of
+    first appearance and the tickers are kept.
+    """
+    if not isinstance(data.columns, pd.MultiIndex):
+        return newColumnNames
+    measurements = data.columns.get_level_values(-1)
+    renamed = dict(zip(measurements.unique(), newColumnNames))
+    levels = [
+        data.columns.get_level_values(i)
+        for i in range(data.columns.nlevels - 1)
+    ]
+    return pd.MultiIndex.from_arrays(
+        levels + [[renamed[name] for name in measurements]],
+        names=data.columns.names,
+    )
+
+
+def _smoothBlock(data, by, dtype="float", nan_policy="raise"):
+    """
+    Convert a single series or a panel into one 2-D float array
+
+    Returns
+    -------
+    tuple the array, the row order that makes every ticker of a long-format
+        panel contiguous and the first sorted row of every ticker (both None
+        when by is None)
+    """
+    if by is None:
+        return _toFloatBlock(data, dtype, nan_policy=nan_policy), None, None
+    with phase("coerce"):
+        frame, _, order, starts = _panelSegments(data, by)
+    values = _toFloatBlock(frame, dtype, nan_policy=nan_policy)
+    with phase("coerce"):
+        return values[order], order, starts
+
+
+def _smoothFrame(data, by, newColumnNames, smoothed, order, out=None):
+    """
+    Wrap smoothed values into a dataframe with the layout of the input,
+    without copying them
+    """
+    if order is None:
+        return pd.DataFrame(
+            smoothed,
+            index=data.index,
+            columns=_newColumns(data, newColumnNames),
+            copy=False,
+        )
+
+    unsorted = np.empty_like(smoothed) if out is None else out
+    unsorted[order] = smoothed
+    result = pd.DataFrame(
+        unsorted, index=data.index, columns=newColumnNames, copy=False
+    )
+    if by in data.columns:
+        result.insert(0, by, data[by].values)
+    return result
+
+
+def _smoothPanel(
+    data,
+    by,
+    newColumnNames,
+    kernel,
+    segmentedKernel,
+    dtype,
+    out,
+    nanKernel=None,
+    nan_policy="raise",
+):
+    """
+    Apply a smoothing kernel to a single series, a MultiIndex-column panel or
+    a long-format panel and wrap the result into a dataframe of the same
+    layout. Blocks with NaN values go through nanKernel(values, starts,
+    propagate) unless the nan_policy is "raise"
+    """
+    _checkNanPolicy(nan_policy)
+    dtype = _checkOutput(data, by, dtype, out)
+    if by is None:
+        # the converted block is private, so it is smoothed in place
+        values = _toFloatBlock(data, dtype, out, nan_policy)
+        annotate(values)
+        with phase("kernel"):
+            smoothed = _nanSmooth(values, None, nanKernel, nan_policy)
+            if smoothed is None:
+                smoothed = kernel(values, values)
             else:
-                data_measurement = data[measurement]
+                values[...] = smoothed
+                smoothed = values
+        with phase("output"):
+            return _smoothFrame(data, by, newColumnNames, smoothed, None)
+
+    values, order, starts = _smoothBlock(data, by, dtype, nan_policy)
+    annotate(values)
+    with phase("kernel"):
+        smoothed = _nanSmooth(values, starts, nanKernel, nan_policy)
+        if smoothed is None:
+            smoothed = segmentedKernel(values, starts)
+        smoothed = smoothed.astype(dtype, copy=False)
+    annotate(smoothed)
+    with phase("output"):
+        return _smoothFrame(data, by, newColumnNames, smoothed, order, out)
+
+
+def _checkOutput(data, by, dtype, out):
+    """
+    Validate the dtype and the optional output array of a smoother
+
+    Returns
+    -------
+    numpy.dtype the float type of the result
+    """
+    if out is not None:
+        shape = data.shape
+        if by is not None and by in data.columns:
+            shape = (shape[0], shape[1] - 1)
+        if not isinstance(out, np.ndarray) or out.shape != shape:
+            raise ValueError(
+                "The out array must have the shape of the smoothed data."
+            )
+        dtype = out.dtype
+    dtype = np.dtype(dtype)
+    if dtype not in [np.float32, np.float64]:
+        raise ValueError("The dtype must be float32 or float64.")
+    return dtype
+
+
+def _toDataFrame(data):
+    try:
+        return pd.DataFrame(data)
+    except ValueError:
+        raise ValueError(
+            "Your input data cannot be converted to a pandas dataframe."
+        )
+
+
+def _checkWindow(window):
+    if window < 1 or int(window) != window:
+        raise ValueError("The value of window must be a positive integer.")
+
+
+def _checkAlpha(alpha):
+    if not isinstance(alpha, (int, float, np.number)) or not 0 <= alpha <= 1:
+        raise ValueError("The value of alpha must between 0 and 1.")
+
+
+def _toFloatBlock(data, dtype="float", out=None, nan_policy="raise"):
+    """
+    Convert every column of a dataframe into one new 2-D float array
+
+    Parameters
+    ----------
+    data : pandas.core.frame.DataFrame input Pandas dataframe dtype : str or
+        numpy.dtype float type of the array out : numpy.ndarray optional
+        array of shape (rows, columns) to fill instead of allocating one
+        nan_policy : str "raise" (default) to reject NaN values, any other
+        policy keeps them
+
+    Returns
+    -------
+    numpy.ndarray an array of shape (rows, columns) with the column values
+    """
+    with phase("coerce"):
+        if out is None and _isFloatCompatible(data.dtypes):
+            values = data.to_numpy(dtype=dtype, copy=True)
+        else:
+            values = np.empty(data.shape, dtype=dtype) if out is None else out
+            for i, name in enumerate(data.columns):
                 try:
-                    data_measurement = pd.to_numeric(data_measurement)
+                    values[:, i] = data[name].values.astype(dtype)
+                except TypeError:
+                    raise TypeError(
+                        "Type of Column %s isn't a string \
+        or a number "
+                        % name
+                    )
                 except ValueError:
                     raise ValueError(
-                        f"Data in column '{measurement}' of your input data \
-                        cannot be converted to \
-            numeric format."
-                    )
-                else:
-                    stats["measurement"].append(measurement)
-                    stats["mean"].append(data_measurement.mean())
-                    stats["min"].append(data_measurement.min())
-                    stats["max"].append(data_measurement.max())
-                    stats["volatility"].append(data_measurement.std())
-                    stats["return"].append(
-                        (
-                            list(data_measurement)[-1]
-                            - list(data_measurement)[0]
-                        )
-                        / list(data_measurement)[0]
+                        "Column %s can't be converted to floating point"
+                        % name
                     )
-        return pd.DataFrame(stats)
 
+    if nan_policy == "raise":
+        with phase("validate"):
+            column = _firstNanColumn(values)
+        if column is not None:
+            _raiseNan(data.columns[column], values[:, column])
+    return values
 
-def movingAverage(data, window, newColumnNames):
+
+def _firstNanColumn(values):
+    """
+    Position of the first column of a 2-D array holding a NaN, or None
+    """
+    # a column sum is NaN if the column holds a NaN (or opposite infinite
+    # values), which avoids a boolean mask of the whole array
+    with np.errstate(invalid="ignore", over="ignore"):
+        suspects = np.flatnonzero(np.isnan(np.add.reduce(values, axis=0)))
+    for column in suspects:
+        if np.isnan(values[:, column]).any():
+            return column
+    return None
+
+
+def _raiseNan(name, column, shown=5):
+    positions = np.flatnonzero(np.isnan(column))
+    rows = ", ".join(str(row) for row in positions[:shown])
+    if len(positions) > shown:
+        rows += ", ..."
+    raise ValueError(
+        f"Column {name} has {len(positions)} NaN values at rows [{rows}]."
+    )
+
+
+def _checkNanPolicy(nan_policy):
+    if nan_policy not in ["raise", "skip", "ffill", "propagate"]:
+        raise ValueError(
+            "The nan_policy must be one of raise, skip, ffill and propagate."
+        )
+
+
+def _nanSmooth(values, starts, nanKernel, nan_policy):
+    """
+    Smooth a block with the NaN-aware kernel when the nan_policy lets NaN
+    values through and there are any
+
+    Returns
+    -------
+    numpy.ndarray or None the smoothed float64 block, None when the block
+        has no NaN and the regular kernel applies
+    """
+    if nan_policy == "raise" or _firstNanColumn(values) is None:
+        return None
+    if nan_policy == "ffill":
+        values = forwardFill(values, starts)
+    return nanKernel(values, starts, nan_policy == "propagate")
+
+
+@instrumented
+def rollingStats(data, window, measurements=["High", "Low", "Open", "Close"]):
+    """
+    Generate summary statistics over a sliding window ending at every row
+
+    Parameters
+    ----------
+    data: ndarray (structured or homogeneous), Iterable, dict, or DataFrame
+        input data. It should be convertable to a pandas dataframe window :
+        int size of the sliding window (number of rows). The first window - 1
+        rows use the rows available so far measurements : str columns to be
+        summarized on. All elements should be column names of data
+
+    Returns
+    -------
+    pandas.core.frame.DataFrame a Pandas dataframe with the index of the data
+        and a (measurement, statistic) column for the mean price, minimum
+        price, maximum price, volatility and return of every measurement
+
+    Example
+    -------
+    >>> from stock_analyzer import stock_analyzer
+    >>> import pandas_datareader.data as web
+    >>> df = web.DataReader('^GSPC', data_source='yahoo', start='2012-01-01',
+    ... end='2020-12-17')
+    >>> stock_analyzer.rollingStats(df, 21, measurements=["Close"])
+                      Close              ...
+                       mean          min  ...  volatility    return
+    Date                                  ...
+    2012-01-03  1277.060059  1277.060059  ...         NaN  0.000000
+    2012-01-04  1277.120056  1277.060059  ...    0.084850  0.000188
+    ...                 ...          ...  ...         ...       ...
+    2020-12-17  3639.592365  3557.540039  ...   42.186214  0.028624
+
+    [2256 rows x 10 columns]
+    """
+    with phase("coerce"):
+        data = _toDataFrame(data)
+        _checkWindow(window)
+        values = _toNumericBlock(data, measurements)
+    annotate(values)
+    with phase("kernel"):
+        stats = rollingColumnStats(values, int(window))
+
+    names = ["mean", "min", "max", "volatility", "return"]
+    keys = ["mean", "min", "max", "std", "return"]
+    with phase("output"):
+        return pd.DataFrame(
+            np.stack([stats[key] for key in keys], axis=2).reshape(
+                len(data), -1
+            ),
+            index=data.index,
+            columns=pd.MultiIndex.from_product([measurements, names]),
+        )
+
+
+@instrumented
+def movingAverage(
+    data,
+    window,
+    newColumnNames,
+    stable=False,
+    by=None,
+    dtype="float64",
+    out=None,
+    nan_policy="raise",
+):
     """
     Using moving average method to profile stock data
 
     Parameters
     ----------
-    data : pandas.core.frame.DataFrame input Pandas dataframe window : int size
-        of the sliding window to compute the moving average newColumnNames :
-        str new column names after creating moving average dataframe
+    data : pandas.core.frame.DataFrame input Pandas dataframe window : int or
+        str size of the sliding window to compute the moving average, either
+        a number of rows or, for data with a DatetimeIndex, a time span such
+        as "30min" or "20D". A time window averages the rows of the last
+        span of time, however irregularly they are spaced newColumnNames :
+        str new column names after creating moving average dataframe stable :
+        bool re-base the running sum periodically so that very long series
+        do not accumulate rounding error. Default is False by : str column or
+        index level holding the ticker of a long-format panel. Every ticker
+        is smoothed separately, in the row order of the data. Data with
+        (ticker, measurement) MultiIndex columns is recognised without it, and
+        newColumnNames then renames the measurements dtype : str "float64"
+        (default) or "float32" to halve the memory of the result out :
+        numpy.ndarray optional float32 or float64 array with the shape of the
+        data. The result is computed in place in it and the returned dataframe
+        wraps it without a copy nan_policy : str how NaN values are handled:
+        "raise" (default) rejects them, "skip" averages the valid values of
+        every window, "ffill" carries the last valid value forward and
+        "propagate" makes every window holding a NaN NaN. Rows before the
+        first valid value are NaN
 
     Returns
     -------
@@ -124,61 +686,161 @@ def movingAverage(data, window, newColumnNames):
     [2256 rows x 6 columns]
 
     """
+    with phase("coerce"):
+        try:
+            data = pd.DataFrame(data)
+        except ValueError:
+            raise ValueError(
+                "Your input data cannot be converted to a pandas dataframe."
+            )
+
+    span = _timeSpan(window)
+    if span is not None:
+        return _timeMovingAverage(
+            data, span, newColumnNames, by, dtype, out, nan_policy, stable
+        )
+
+    _checkWindow(window)
+    window = int(window)
+    df_avgs = _smoothPanel(
+        data,
+        by,
+        newColumnNames,
+        lambda values, out: rollingMean(
+            values, window, stable=stable, out=out
+        ),
+        lambda values, starts: segmentedRollingMean(
+            values, starts, window, stable
+        ),
+        dtype,
+        out,
+        lambda values, starts, propagate: nanRollingMean(
+            values, window, starts, propagate, stable
+        ),
+        nan_policy,
+    )
+    return df_avgs
+
+
+def _timeSpan(window):
+    """
+    Length in nanoseconds of a time-based window such as "30min", None for
+    a window counted in rows
+    """
+    if isinstance(window, (int, float, np.number)):
+        return None
     try:
-        data = pd.DataFrame(data)
+        span = pd.Timedelta(window)
     except ValueError:
+        span = pd.NaT
+    if span is pd.NaT or span <= pd.Timedelta(0):
         raise ValueError(
-            "Your input data cannot be converted to a pandas dataframe."
+            "The value of window must be a positive integer or a positive \
+time span such as '30min'."
         )
+    return span.value
 
-    avgs = []
 
-    for name in data.columns:
-        try:
-            values = data[name].values.astype("float")
-        except TypeError:
-            raise TypeError(
-                "Type of Column %s isn't a string \
-        or a number "
-                % name
-            )
-        except ValueError:
-            raise ValueError(
-                "Column %s can't be converted to floating point" % name
-            )
+def _rowTimes(data):
+    """
+    Nanosecond times of the rows of data with a DatetimeIndex, or with a
+    datetime level in a MultiIndex
+    """
+    return _rowIndex(data).values.astype("datetime64[ns]").view("int64")
 
-        _nan_locations = np.argwhere(np.isnan(values))
-        if _nan_locations.shape[0] > 0:
+
+def _rowIndex(data):
+    """
+    The DatetimeIndex, or datetime level of a MultiIndex, of data
+    """
+    index = data.index
+    if isinstance(index, pd.MultiIndex):
+        index = next(
+            (
+                level
+                for level in (
+                    index.get_level_values(i) for i in range(index.nlevels)
+                )
+                if isinstance(level, pd.DatetimeIndex)
+            ),
+            None,
+        )
+    if not isinstance(index, pd.DatetimeIndex):
+        raise ValueError("Time-based windows need data with a DatetimeIndex.")
+    return index
+
+
+def _timeMovingAverage(
+    data, span, newColumnNames, by, dtype, out, nan_policy, stable=False
+):
+    """
+    movingAverage over trailing time windows of ``span`` nanoseconds
+    """
+    _checkNanPolicy(nan_policy)
+    dtype = _checkOutput(data, by, dtype, out)
+    with phase("coerce"):
+        times = _rowTimes(data)
+    values, order, starts = _smoothBlock(data, by, dtype, nan_policy)
+    annotate(values)
+    if order is not None:
+        times = times[order]
+
+    with phase("validate"):
+        decreasing = np.diff(times) < 0
+        if starts is not None:
+            decreasing[starts[1:] - 1] = False
+        if decreasing.any():
             raise ValueError(
-                (
-                    "Column {} has Nan at " + "{} " * _nan_locations.shape[0]
-                ).format(name, *_nan_locations)
+                "The DatetimeIndex must be increasing for time-based windows."
             )
 
-        values = np.insert(values, 0, [values[0] for i in range(window - 1)])
-        avg = [
-            np.average(values[(i - window + 1): (i + 1)])
-            for i in range(window - 1, len(values))
-        ]
-        avgs.append(avg)
-
-    df_avgs = pd.DataFrame(
-        np.array(avgs).T, index=data.index, columns=newColumnNames
-    )
-    return df_avgs
+    with phase("kernel"):
+        if nan_policy == "ffill":
+            values = forwardFill(values, starts)
+        smoothed = timeRollingMean(
+            values, times, span, starts, nan_policy == "propagate", stable
+        ).astype(dtype, copy=False)
+    if out is not None and order is None:
+        out[...] = smoothed
+        smoothed = out
+    with phase("output"):
+        return _smoothFrame(data, by, newColumnNames, smoothed, order, out)
 
 
-def exponentialSmoothing(data, newColumnNames, alpha=0.3):
+@instrumented
+def exponentialSmoothing(
+    data,
+    newColumnNames,
+    alpha=0.3,
+    by=None,
+    dtype="float64",
+    out=None,
+    nan_policy="raise",
+):
 
     """
     Using exponential smoothing method to profile stock data
 
     Parameters
     ----------
-    data : pandas.core.frame.DataFrame input Pandas dataframe alpha : float the
-        smoothing parameter that defines the weighting. It should be between 0
-        and 1 newColumnNames : str new column names after creating moving
-        average dataframe
+    data : pandas.core.frame.DataFrame input Pandas dataframe alpha : float
+        or str the smoothing parameter that defines the weighting. It
+        should be between 0 and 1, or "auto" to use the alpha of every
+        column (and ticker) given by optimalAlpha. The alphas used are then
+        stored in the attrs["alpha"] of the result newColumnNames : str new
+        column names after creating moving average dataframe by : str
+        column or index level holding the ticker of a long-format panel.
+        Every ticker is smoothed separately, in the row order of the data.
+        Data with (ticker, measurement) MultiIndex columns is recognised
+        without it, and newColumnNames then renames the measurements dtype
+        : str "float64" (default) or "float32" to halve the memory of the
+        result out : numpy.ndarray optional float32 or float64 array with
+        the shape of the data. The result is computed in place in it and
+        the returned dataframe wraps it without a copy nan_policy : str how
+        NaN values are handled: "raise" (default) rejects them, "skip"
+        keeps the smoothed value unchanged over them, "ffill" carries the
+        last valid value forward and "propagate" makes every row from the
+        first NaN on NaN. Rows before the first valid value are NaN
 
     Returns
     -------
@@ -210,127 +872,548 @@ def exponentialSmoothing(data, newColumnNames, alpha=0.3):
     [2256 rows x 6 columns]
     """
 
-    try:
-        data = pd.DataFrame(data)
-    except ValueError:
-        raise ValueError(
-            "Your input data cannot be converted to a pandas dataframe."
-        )
-
-    if alpha < 0 or alpha > 1:
-        raise ValueError("The value of alpha must between 0 and 1.")
-
-    smoothed = []
-    for name in data.columns:
+    with phase("coerce"):
         try:
-            values = data[name].values.astype("float")
-        except TypeError:
-            raise TypeError(
-                "Type of Column %s isn't a string \
-        or a number "
-                % name
-            )
+            data = pd.DataFrame(data)
         except ValueError:
             raise ValueError(
-                "Column %s can't be converted to floating point" % name
+                "Your input data cannot be converted to a pandas dataframe."
             )
 
-        _nan_locations = np.argwhere(np.isnan(values))
-        if _nan_locations.shape[0] > 0:
-            raise ValueError(
-                (
-                    "Column {} has Nan at " + "{} " * _nan_locations.shape[0]
-                ).format(name, *_nan_locations)
-            )
+    if isinstance(alpha, str) and alpha == "auto":
+        return _autoExponentialSmoothing(
+            data, newColumnNames, by, dtype, out, nan_policy
+        )
+    _checkAlpha(alpha)
+
+    df_smoothed = _smoothPanel(
+        data,
+        by,
+        newColumnNames,
+        lambda values, out: expSmoothing(values, alpha, out=out),
+        lambda values, starts: segmentedExpSmoothing(values, starts, alpha),
+        dtype,
+        out,
+        lambda values, starts, propagate: nanExpSmoothing(
+            values, alpha, starts, propagate
+        ),
+        nan_policy,
+    )
+    return df_smoothed
+
+
+def _autoExponentialSmoothing(
+    data, newColumnNames, by, dtype, out, nan_policy
+):
+    """
+    exponentialSmoothing with the fitted alpha of every column and ticker
+    """
+    if nan_policy != "raise":
+        raise ValueError("alpha='auto' only supports the nan_policy raise.")
+    fitted = {}
+
+    def kernel(values, out):
+        fitted["alpha"] = fitAlpha(values)
+        out[...] = expSmoothingAlphas(values, fitted["alpha"])
+        return out
+
+    def segmentedKernel(values, starts):
+        fitted["alpha"] = fitAlpha(values, starts)
+        return expSmoothingAlphas(values, fitted["alpha"], starts)
 
-        pred = []
-        values = data[name].values
-        St_prev = values[0]
-        for i in range(len(values)):
-            yt = values[i]
-            St = alpha * yt + St_prev * (1 - alpha)
-            pred.append(St)
-            St_prev = St
-        smoothed.append(pred)
-    df_smoothed = pd.DataFrame(
-        np.array(smoothed).T, index=data.index, columns=newColumnNames
+    df_smoothed = _smoothPanel(
+        data, by, newColumnNames, kernel, segmentedKernel, dtype, out
+    )
+    df_smoothed.attrs["alpha"] = _alphaResult(
+        data, by, _newColumns(data, newColumnNames), fitted["alpha"]
     )
     return df_smoothed
 
 
-def visMovingAverage(data, name, window):
+def _alphaResult(data, by, columns, alphas):
     """
-    Visualizing trends of stock by using moving average
+    Label fitted alphas: a Series over the columns, or a dataframe of
+    tickers by columns for a long-format panel
+    """
+    if by is None:
+        return pd.Series(alphas, index=columns, name="alpha")
+    return pd.DataFrame(alphas, index=_tickers(data, by), columns=columns)
+
+
+def _tickers(data, by):
+    """
+    Tickers of a long-format panel in order of first appearance
+    """
+    if by in data.columns:
+        keys = data[by]
+    else:
+        keys = data.index.get_level_values(by)
+    return pd.Index(pd.unique(keys), name=by)
+
+
+@instrumented
+def optimalAlpha(data, by=None):
+    """
+    Find the exponential smoothing parameter that fits every column best
+
+    The alpha of every column, and of every ticker of a panel, minimizes
+    the squared one-step-ahead error, predicting each row by the smoothed
+    value of the row before. All columns and tickers are fitted together
+    on a grid of alphas that is refined around the best one, to a
+    resolution of about 0.001.
 
     Parameters
     ----------
-    data : pandas.core.frame.DataFrame input pandas dataframe of stock of
-        interest name : str column to be used in moving average calculation
-        (such as Close, Adj Close) window : int size of the window (number of
-        days) used in moving average calculation
+    data : pandas.core.frame.DataFrame input single series or panel by :
+        str column or index level holding the ticker of a long-format panel.
+        Every ticker is then fitted separately, in the row order of the data
 
     Returns
     -------
-    altair.vegalite.v4.api.LayerChart an Altair plot object containing the plot
-        of original movement and the moving average of the stock of interest
+    pandas.core.series.Series or pandas.core.frame.DataFrame the alpha of
+        every column, or a dataframe with the alpha of every ticker (rows)
+        and measurement (columns) for a long-format panel
 
     Example
     -------
-    >>> df = web.DataReader('^GSPC', data_source='yahoo', start='2012-01-01',
-    ... end='2020-12-17')
-    >>> visMovingAverage(df,'Close', 50)
+    >>> from stock_analyzer import stock_analyzer
+    >>> alphas = stock_analyzer.optimalAlpha(panel, by="ticker")
+    """
+    data = _toDataFrame(data)
+    values, _, starts = _smoothBlock(data, by)
+    annotate(values)
+    with phase("kernel"):
+        alphas = fitAlpha(values, starts)
+    columns = data.columns
+    if by is not None and by in columns:
+        columns = columns.drop(by)
+    with phase("output"):
+        return _alphaResult(data, by, columns, alphas)
+
+
+@instrumented
+def forecast(
+    data,
+    horizon,
+    method="exponentialSmoothing",
+    window=20,
+    alpha=0.3,
+    beta=None,
+    by=None,
+    interval=0.95,
+):
     """
-    if name not in data.columns:
+    Forecast stock data beyond its last row with a moving average or
+    exponential smoothing
+
+    The moving average and simple exponential smoothing forecast the last
+    fitted value for every step ahead; with a beta, Holt's linear trend
+    method adds the last fitted trend once per step. Prediction intervals
+    assume normal errors whose variance is the mean squared one-step-ahead
+    error of the fit, growing with the number of steps as for exponential
+    smoothing. A moving average of window w is treated as exponential
+    smoothing with alpha = 2 / (w + 1), which has the same mean age of the
+    data. All columns and tickers are forecast together.
+
+    Parameters
+    ----------
+    data : pandas.core.frame.DataFrame input single series or panel horizon
+        : int number of steps to forecast method : str "exponentialSmoothing"
+        (default) or "movingAverage" window : int size of the sliding window
+        of the moving average alpha : float or str the smoothing parameter of
+        exponential smoothing, between 0 and 1, or "auto" to use the alpha
+        given by optimalAlpha for every column and ticker beta : float
+        optional smoothing parameter of the trend, between 0 and 1. Adds a
+        linear trend to exponential smoothing by : str column or index level
+        holding the ticker of a long-format panel. Every ticker is then
+        forecast separately, in the row order of the data interval : float
+        coverage of the prediction intervals, between 0 and 1, or None for
+        point forecasts only. Default is 0.95
+
+    Returns
+    -------
+    pandas.core.frame.DataFrame a Pandas dataframe indexed by the step ahead
+        (and by ticker for a long-format panel) with a (measurement,
+        statistic) column for the forecast and the lower and upper bounds of
+        the prediction interval of every measurement
+
+    Example
+    -------
+    >>> from stock_analyzer import stock_analyzer
+    >>> stock_analyzer.forecast(panel, 5, alpha="auto", by="ticker")
+    """
+    data = _toDataFrame(data)
+    if not isinstance(horizon, (int, np.integer)) or horizon < 1:
+        raise ValueError("The value of horizon must be a positive integer.")
+    if interval is not None and not 0 < interval < 1:
+        raise ValueError("The value of interval must be between 0 and 1.")
+    auto = isinstance(alpha, str) and alpha == "auto"
+    if method == "movingAverage":
+        if beta is not None:
+            raise ValueError(
+                "A trend is only supported for exponentialSmoothing."
+            )
+        _checkWindow(window)
+        window = int(window)
+    elif method == "exponentialSmoothing":
+        if not auto:
+            _checkAlpha(alpha)
+        if beta is not None:
+            if auto:
+                raise ValueError("alpha='auto' is not supported with a beta.")
+            if not isinstance(beta, (int, float, np.number)) or not (
+                0 <= beta <= 1
+            ):
+                raise ValueError("The value of beta must between 0 and 1.")
+    else:
         raise ValueError(
-            "Your input name does not match with the dataframe column name! \
-            Please enter valid column name!"
+            "The method must be movingAverage or exponentialSmoothing."
+        )
+
+    values, _, starts = _smoothBlock(data, by)
+    annotate(values)
+    if len(values) == 0:
+        raise ValueError("Forecasting needs at least one row of data.")
+    if starts is None:
+        starts = np.zeros(1, dtype=int)
+
+    with phase("kernel"):
+        trend = 0
+        if method == "movingAverage":
+            fits = segmentedRollingMean(values, starts, window)
+            alpha = 2 / (window + 1)
+            predictions = fits
+        elif beta is not None:
+            fits, trends = holtSmoothing(values, alpha, beta, starts)
+            predictions = fits + trends
+        else:
+            if auto:
+                alpha = fitAlpha(values, starts)
+                fits = expSmoothingAlphas(values, alpha, starts)
+            else:
+                fits = segmentedExpSmoothing(values, starts, alpha)
+            predictions = fits
+        ends = np.append(starts[1:], len(values)) - 1
+        if beta is not None:
+            trend = trends[ends]
+        variance = oneStepVariance(values, predictions, starts)
+        z = None if interval is None else NormalDist().inv_cdf(
+            0.5 + interval / 2
+        )
+        paths = smoothingForecast(
+            fits[ends], trend, variance, horizon, alpha, beta, z
         )
 
-    df_avgs = movingAverage(
-        data, window, [movingAverage.__name__ + name for name in data.columns]
+    with phase("output"):
+        return _forecastFrame(data, by, paths, horizon)
+
+
+def _forecastFrame(data, by, paths, horizon):
+    """
+    Arrange forecasts of shape (horizon, series, columns) with the columns
+    of the data, one row per step (and ticker)
+    """
+    names = ["forecast", "lower", "upper"]
+    if paths[1] is None:
+        names, paths = names[:1], paths[:1]
+    # (series, horizon, columns, statistics)
+    stacked = np.stack(paths, axis=-1).transpose(1, 0, 2, 3)
+    columns = data.columns
+    if by is not None and by in columns:
+        columns = columns.drop(by)
+    columns = _appendLevel(columns, names)
+    steps = pd.RangeIndex(1, horizon + 1, name="step")
+    if by is None:
+        index = steps
+    else:
+        index = pd.MultiIndex.from_product([_tickers(data, by), steps])
+    return pd.DataFrame(
+        stacked.reshape(len(index), -1), index=index, columns=columns
     )
 
+
+def _appendLevel(columns, names):
+    """
+    Column labels with one column per name under every column, the names
+    forming a new last level
+    """
+    return pd.MultiIndex.from_tuples(
+        [
+            (*column, name) if isinstance(column, tuple) else (column, name)
+            for column in columns
+            for name in names
+        ],
+        names=list(columns.names) + [None],
+    )
+
+
+@instrumented
+def movingAverageSweep(data, windows, output="frame"):
+    """
+    Moving averages of stock data for many window sizes at once
+
+    All windows are computed from one shared cumulative sum, after
+    converting and validating the data once. The one-step-ahead error of
+    every window, predicting each row by the moving average up to the row
+    before, measures how well it fits.
+
+    Parameters
+    ----------
+    data : pandas.core.frame.DataFrame input Pandas dataframe windows : list
+        of int sizes of the sliding window output : str "frame" (default)
+        for a tidy dataframe of the moving averages, "array" for an array
+        of shape (windows, rows, columns), or None to compute only the
+        errors
+
+    Returns
+    -------
+    tuple the moving averages in the chosen output, and a Pandas dataframe
+        with the mean squared error (mse) and mean absolute error (mae) of
+        every window and measurement
+
+    Example
+    -------
+    >>> from stock_analyzer import stock_analyzer
+    >>> fits, errors = stock_analyzer.movingAverageSweep(df[['Close']],
+    ... range(5, 251), output=None)
+    >>> errors.nsmallest(1, 'mse')
+    """
+    data = _toDataFrame(data)
+    windows = [int(window) for window in _checkSweep(windows, _checkWindow)]
+    _checkSweepOutput(output)
+    values = _toFloatBlock(data)
+    annotate(values)
+    with phase("kernel"):
+        fits, sse, sae = rollingMeanSweep(
+            values, windows, fits=output is not None
+        )
+    with phase("output"):
+        return _sweepResult(data, "window", windows, fits, sse, sae, output)
+
+
+@instrumented
+def exponentialSmoothingSweep(data, alphas, output="frame"):
+    """
+    Exponential smoothing of stock data for many alphas at once
+
+    All smoothing parameters are evaluated in one batched pass over the
+    data, after converting and validating it once. The one-step-ahead error
+    of every alpha, predicting each row by the smoothed value of the row
+    before, measures how well it fits.
+
+    Parameters
+    ----------
+    data : pandas.core.frame.DataFrame input Pandas dataframe alphas : list
+        of float smoothing parameters, each between 0 and 1 output : str
+        "frame" (default) for a tidy dataframe of the smoothed values,
+        "array" for an array of shape (alphas, rows, columns), or None to
+        compute only the errors
+
+    Returns
+    -------
+    tuple the smoothed values in the chosen output, and a Pandas dataframe
+        with the mean squared error (mse) and mean absolute error (mae) of
+        every alpha and measurement
+
+    Example
+    -------
+    >>> from stock_analyzer import stock_analyzer
+    >>> import numpy as np
+    >>> fits, errors = stock_analyzer.exponentialSmoothingSweep(
+    ... df[['Close']], np.linspace(0.01, 0.99, 99), output=None)
+    >>> errors.nsmallest(1, 'mse')
+    """
+    data = _toDataFrame(data)
+    alphas = [float(alpha) for alpha in _checkSweep(alphas, _checkAlpha)]
+    _checkSweepOutput(output)
+    values = _toFloatBlock(data)
+    annotate(values)
+    with phase("kernel"):
+        fits, sse, sae = expSmoothingSweep(
+            values, alphas, fits=output is not None
+        )
+    with phase("output"):
+        return _sweepResult(data, "alpha", alphas, fits, sse, sae, output)
+
+
+def _checkSweep(parameters, check):
+    parameters = list(np.atleast_1d(parameters))
+    if len(parameters) == 0:
+        raise ValueError("At least one parameter value must be given.")
+    for parameter in parameters:
+        check(parameter)
+    return parameters
+
+
+def _checkSweepOutput(output):
+    if output not in ["frame", "array", None]:
+        raise ValueError("The output must be frame, array or None.")
+
+
+def _sweepResult(data, name, parameters, fits, sse, sae, output):
+    """
+    Arrange the fits and the one-step-ahead errors of a sweep
+    """
+    n, k = len(data), data.shape[1]
+    p = len(parameters)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        errors = pd.DataFrame(
+            {
+                name: np.repeat(parameters, k),
+                "measurement": np.tile(np.array(data.columns, object), p),
+                "mse": (sse / (n - 1)).ravel(),
+                "mae": (sae / (n - 1)).ravel(),
+            }
+        )
+    if output == "frame":
+        index_name = "index" if data.index.name is None else data.index.name
+        fits = pd.DataFrame(
+            {
+                name: np.repeat(parameters, n * k),
+                index_name: np.tile(np.repeat(data.index, k), p),
+                "measurement": np.tile(
+                    np.array(data.columns, object), p * n
+                ),
+                "value": fits.ravel(),
+            }
+        )
+    return fits, errors
+
+
+def _plotColumns(data, name):
+    """
+    Validate the column, or list of columns, to be plotted
+    """
+    names = [name] if isinstance(name, str) else list(name)
+    for column in names:
+        if column not in data.columns:
+            raise ValueError(
+                "Your input name does not match with the dataframe column \
+name! \
+            Please enter valid column name!"
+            )
+    return names
+
+
+def _smoothingChart(data, names, smoothed, title, max_points=None):
+    """
+    Layer the raw and the smoothed series of every plotted column over one
+    shared chart dataframe, decimated to at most max_points rows
+    """
+    # altair and its schemas are slow to import and only needed for plots
+    import altair as alt
+
     if data.index.name is None:
         index_name = "index"
     else:
         index_name = data.index.name
 
-    plot_a = (
-        alt.Chart(
-            data.reset_index(),
-            title="Stock Price History with Simple Moving Average",
+    columns = {
+        index_name: data.index,
+        **{name: data[name].values for name in names},
+        **{name: smoothed[name].values for name in smoothed.columns},
+    }
+    if max_points is not None:
+        if max_points < 4 * len(names) + 2:
+            raise ValueError(
+                "The value of max_points is too small to keep the extremes \
+of every plotted series."
+            )
+        series = np.column_stack(
+            [
+                pd.to_numeric(values, errors="coerce").astype("float")
+                for values in list(columns.values())[1:]
+            ]
         )
-        .mark_line()
-        .encode(
-            x=index_name,
-            y=alt.Y(name, title="Price"),
-            color=alt.value("#0abab5"),
+        rows = minMaxIndices(series, max_points)
+        columns = {key: values[rows] for key, values in columns.items()}
+    chart_data = pd.DataFrame(columns)
+
+    layers = []
+    for name, smoothed_name in zip(names, smoothed.columns):
+        layers.append(
+            alt.Chart()
+            .mark_line()
+            .encode(
+                x=index_name,
+                y=alt.Y(name, title="Price"),
+                color=alt.value("#0abab5"),
+            )
         )
-    )
-    plot_b = (
-        alt.Chart(df_avgs.reset_index())
-        .mark_line()
-        .encode(
-            x=index_name,
-            y=movingAverage.__name__ + name,
-            color=alt.value("#00008b"),
+        layers.append(
+            alt.Chart()
+            .mark_line()
+            .encode(
+                x=index_name,
+                y=smoothed_name,
+                color=alt.value("#00008b"),
+            )
         )
+    return alt.layer(*layers, data=chart_data, title=title)
+
+
+@instrumented
+def visMovingAverage(data, name, window, cache=None, max_points=None):
+    """
+    Visualizing trends of stock by using moving average
+
+    Parameters
+    ----------
+    data : pandas.core.frame.DataFrame input pandas dataframe of stock of
+        interest name : str or list column, or list of columns, to be used in
+        moving average calculation (such as Close, Adj Close). Only these
+        columns are smoothed window : int size of the window (number of days)
+        used in moving average calculation cache :
+        stock_analyzer.cache.ResultCache optional cache to reuse moving
+        averages computed by earlier calls max_points : int optional maximum
+        number of rows embedded in the chart. Longer series are decimated,
+        keeping the minimum and maximum of every series in each bucket
+
+    Returns
+    -------
+    altair.vegalite.v4.api.LayerChart an Altair plot object containing the plot
+        of original movement and the moving average of the stock of interest
+
+    Example
+    -------
+    >>> df = web.DataReader('^GSPC', data_source='yahoo', start='2012-01-01',
+    ... end='2020-12-17')
+    >>> visMovingAverage(df,'Close', 50)
+    """
+    names = _plotColumns(data, name)
+
+    smoother = movingAverage if cache is None else cache.movingAverage
+    df_avgs = smoother(
+        data[names], window, [movingAverage.__name__ + name for name in names]
     )
 
-    sma_plot = plot_a + plot_b
+    with phase("chart"):
+        sma_plot = _smoothingChart(
+            data,
+            names,
+            df_avgs,
+            "Stock Price History with Simple Moving Average",
+            max_points,
+        )
     return sma_plot
 
 
-def visExpSmoothing(data, name, alpha):
+@instrumented
+def visExpSmoothing(data, name, alpha, cache=None, max_points=None):
     """
     Visualizing trends of stock by using exponential smoothing
 
     Parameters
     ----------
     data : pandas.core.frame.DataFrame input pandas dataframe of stock of
-        interest name : str column to be used in exponential smoothing
-        calculation (such as Close, Adj Close) alpha :float the smoothing
-        parameter that defines the weighting. It should be between 0 and 1
+        interest name : str or list column, or list of columns, to be used in
+        exponential smoothing calculation (such as Close, Adj Close). Only
+        these columns are smoothed alpha :float the smoothing parameter that
+        defines the weighting. It should be between 0 and 1 cache :
+        stock_analyzer.cache.ResultCache optional cache to reuse smoothed
+        values computed by earlier calls max_points : int optional maximum
+        number of rows embedded in the chart. Longer series are decimated,
+        keeping the minimum and maximum of every series in each bucket
 
     Returns
     -------
@@ -344,44 +1427,25 @@ def visExpSmoothing(data, name, alpha):
     ... end='2020-12-17')
     >>> visExpSmoothing(df,'Close', 0.3)
     """
-    if name not in data.columns:
-        raise ValueError(
-            "Your input name does not match with the dataframe column name! \
-            Please enter valid column name!"
-        )
+    names = _plotColumns(data, name)
 
-    df_smoothed = exponentialSmoothing(
-        data,
-        [exponentialSmoothing.__name__ + name for name in data.columns],
+    smoother = (
+        exponentialSmoothing
+        if cache is None
+        else cache.exponentialSmoothing
+    )
+    df_smoothed = smoother(
+        data[names],
+        [exponentialSmoothing.__name__ + name for name in names],
         alpha,
     )
 
-    if data.index.name is None:
-        index_name = "index"
-    else:
-        index_name = data.index.name
-
-    plot_c = (
-        alt.Chart(
-            data.reset_index(),
-            title="Stock Price History with Exponential Smoothing",
-        )
-        .mark_line()
-        .encode(
-            x=index_name,
-            y=alt.Y(name, title="Price"),
-            color=alt.value("#0abab5"),
-        )
-    )
-    plot_d = (
-        alt.Chart(df_smoothed.reset_index())
-        .mark_line()
-        .encode(
-            x=index_name,
-            y=exponentialSmoothing.__name__ + name,
-            color=alt.value("#00008b"),
+    with phase("chart"):
+        expsm_plot = _smoothingChart(
+            data,
+            names,
+            df_smoothed,
+            "Stock Price History with Exponential Smoothing",
+            max_points,
         )
-    )
-
-    expsm_plot = plot_c + plot_d
     return expsm_plot
@@ -0,0 +1,166 @@
+import numpy as np
+import pandas as pd
+
+from ._kernels import expSmoothing
+from .stock_analyzer import (
+    _checkAlpha,
+    _checkWindow,
+    _toDataFrame,
+    _toFloatBlock,
+)
+
+
+class MovingAverageSmoother:
+    """
+    Incremental moving average of stock data
+
+    Feeding a dataframe through ``update`` in consecutive batches returns
+    the same values as calling ``movingAverage`` once on the concatenated
+    data. Each update costs O(k) for a batch of k rows: the last ``window``
+    values are kept in a ring buffer next to their running sum.
+
+    Parameters
+    ----------
+    window : int size of the sliding window to compute the moving average
+        newColumnNames : str new column names of the returned dataframes
+
+    Example
+    -------
+    >>> from stock_analyzer.streaming import MovingAverageSmoother
+    >>> smoother = MovingAverageSmoother(100, ['movingAverage' + name for
+    ... name in df.columns])
+    >>> smoother.update(df.iloc[:-1])
+    >>> smoother.update(df.iloc[-1:])
+                movingAverageHigh  ...  movingAverageAdj Close
+    Date                           ...
+    2020-12-17        3477.611902  ...             3457.304402
+
+    [1 rows x 6 columns]
+    """
+
+    def __init__(self, window, newColumnNames):
+        _checkWindow(window)
+        self.window = int(window)
+        self.newColumnNames = newColumnNames
+        self._first = None
+        self._ring = None
+        self._sum = None
+        self._pos = 0
+
+    def update(self, new_rows):
+        """
+        Append rows to the series and return their moving averages
+
+        Parameters
+        ----------
+        new_rows : pandas.core.frame.DataFrame rows that follow the data
+            seen so far, with the same columns
+
+        Returns
+        -------
+        pandas.core.frame.DataFrame a Pandas dataframe with the moving
+            average of each new row
+        """
+        data = _toDataFrame(new_rows)
+        values = _toFloatBlock(data)
+        k = values.shape[0]
+        w = self.window
+
+        if self._first is None:
+            if k == 0:
+                return pd.DataFrame(
+                    values, index=data.index, columns=self.newColumnNames
+                )
+            # Rows are stored shifted by the first value, so the warm-up
+            # padding of movingAverage is an all-zero buffer.
+            self._first = values[0].copy()
+            self._ring = np.zeros((w, values.shape[1]))
+            self._sum = np.zeros(values.shape[1])
+        elif values.shape[1] != self._ring.shape[1]:
+            raise ValueError(
+                "The number of columns must not change between updates."
+            )
+
+        centered = values - self._first
+        slots = (self._pos + np.arange(min(k, w))) % w
+        outgoing = self._ring[slots]
+        if k > w:
+            outgoing = np.concatenate([outgoing, centered[: k - w]])
+
+        sums = np.cumsum(centered - outgoing, axis=0)
+        sums += self._sum
+        if k > 0:
+            self._sum = sums[-1].copy()
+
+        kept = np.arange(max(k - w, 0), k)
+        self._ring[(self._pos + kept) % w] = centered[kept]
+        self._pos = (self._pos + k) % w
+
+        sums /= w
+        sums += self._first
+        return pd.DataFrame(
+            sums, index=data.index, columns=self.newColumnNames
+        )
+
+
+class ExponentialSmoother:
+    """
+    Incremental exponential smoothing of stock data
+
+    Feeding a dataframe through ``update`` in consecutive batches returns
+    the same values as calling ``exponentialSmoothing`` once on the
+    concatenated data. Only the last smoothed row is kept between updates.
+
+    Parameters
+    ----------
+    newColumnNames : str new column names of the returned dataframes alpha :
+        float the smoothing parameter that defines the weighting. It should
+        be between 0 and 1
+
+    Example
+    -------
+    >>> from stock_analyzer.streaming import ExponentialSmoother
+    >>> smoother = ExponentialSmoother(['exponentialSmoothing' + name for
+    ... name in df.columns])
+    >>> smoother.update(df.iloc[:-1])
+    >>> smoother.update(df.iloc[-1:])
+                exponentialSmoothingHigh  ...  exponentialSmoothingAdj Close
+    Date                                  ...
+    2020-12-17               3704.902102  ...                    3694.068209
+
+    [1 rows x 6 columns]
+    """
+
+    def __init__(self, newColumnNames, alpha=0.3):
+        _checkAlpha(alpha)
+        self.alpha = alpha
+        self.newColumnNames = newColumnNames
+        self._last = None
+
+    def update(self, new_rows):
+        """
+        Append rows to the series and return their smoothed values
+
+        Parameters
+        ----------
+        new_rows : pandas.core.frame.DataFrame rows that follow the data
+            seen so far, with the same columns
+
+        Returns
+        -------
+        pandas.core.frame.DataFrame a Pandas dataframe with the exponential
+            smoothing fit of each new row
+        """
+        data = _toDataFrame(new_rows)
+        values = _toFloatBlock(data)
+        if self._last is not None and values.shape[1] != self._last.shape[0]:
+            raise ValueError(
+                "The number of columns must not change between updates."
+            )
+
+        smoothed = expSmoothing(values, self.alpha, initial=self._last)
+        if smoothed.shape[0] > 0:
+            self._last = smoothed[-1].copy()
+        return pd.DataFrame(
+            smoothed, index=data.index, columns=self.newColumnNames
+        )
@@ -0,0 +1,83 @@
+from stock_analyzer import stock_analyzer
+from stock_analyzer.cache import ResultCache
+from pytest import raises
+from pandas.testing import assert_frame_equal
+import pandas as pd
+import numpy as np
+
+
+def test_ResultCache():
+    rng = np.random.default_rng(0)
+    source = pd.DataFrame(
+        rng.normal(100, 5, size=(200, 3)), columns=["1", "2", "3"]
+    )
+    names = ["smooth" + name for name in source.columns]
+    cache = ResultCache(maxsize=4)
+
+    # repeated calls are served from the cache
+    for _ in range(3):
+        assert_frame_equal(
+            cache.movingAverage(source, 10, names),
+            stock_analyzer.movingAverage(source, 10, names),
+        )
+    assert cache.info()["hits"] == 2
+    assert cache.info()["misses"] == 1
+    assert cache.info()["bytes"] == 200 * 3 * 8
+
+    # parameters are part of the key
+    cache.movingAverage(source, 11, names)
+    assert cache.info()["misses"] == 2
+
+    # appended rows reuse the cached prefix
+    longer = pd.concat(
+        [
+            source,
+            pd.DataFrame(
+                rng.normal(100, 5, size=(50, 3)), columns=["1", "2", "3"]
+            ),
+        ],
+        ignore_index=True,
+    )
+    for window in [10, 300]:
+        cache.movingAverage(source, window, names)
+        assert_frame_equal(
+            cache.movingAverage(longer, window, names),
+            stock_analyzer.movingAverage(longer, window, names),
+        )
+    cache.exponentialSmoothing(source, names, 0.2)
+    assert_frame_equal(
+        cache.exponentialSmoothing(longer, names, 0.2),
+        stock_analyzer.exponentialSmoothing(longer, names, 0.2),
+    )
+    assert cache.info()["extensions"] == 3
+
+    # least recently used entries are evicted
+    assert cache.info()["entries"] == 4
+    cache = ResultCache(maxsize=10, max_bytes=200 * 3 * 8 * 2)
+    for alpha in [0.1, 0.2, 0.3]:
+        cache.exponentialSmoothing(source, names, alpha)
+    assert cache.info()["entries"] == 2
+    cache.exponentialSmoothing(source, names, 0.1)
+    assert cache.info()["misses"] == 4
+
+    cache.clear()
+    assert cache.info() == {
+        "hits": 0,
+        "misses": 0,
+        "extensions": 0,
+        "entries": 0,
+        "bytes": 0,
+    }
+
+    # vis functions accept a cache
+    stock_analyzer.visMovingAverage(source, "2", 5, cache=cache)
+    stock_analyzer.visExpSmoothing(source, "2", 0.5, cache=cache)
+    stock_analyzer.visExpSmoothing(source, "2", 0.5, cache=cache)
+    assert cache.info()["hits"] == 1
+
+    with raises(ValueError) as execinfo_1:
+        ResultCache(maxsize=0)
+    assert (
+        str(execinfo_1.value)
+        == "The value of maxsize must be a positive integer."
+    )
@@ -0,0 +1,110 @@
+from stock_analyzer import chunked, stock_analyzer
+from pytest import importorskip, raises
+from pandas.testing import assert_frame_equal
+import pandas as pd
+import numpy as np
+
+
+def test_npy_chunks(tmp_path):
+    rng = np.random.default_rng(0)
+    source = rng.normal(100, 5, size=(1000, 3))
+    np.save(tmp_path / "bars.npy", source)
+    frame = pd.DataFrame(source, columns=["High", "Low", "Close"])
+    names = ["avgHigh", "avgLow", "avgClose"]
+
+    chunks = list(
+        chunked.readNpyChunks(
+            tmp_path / "bars.npy", columns=frame.columns, chunk_rows=37
+        )
+    )
+    assert len(chunks) == 28
+    assert_frame_equal(pd.concat(chunks), frame)
+
+    # moving averages stream from one memory-mapped file to another
+    chunked.writeNpy(
+        chunked.chunkedMovingAverage(
+            chunked.readNpyChunks(tmp_path / "bars.npy", chunk_rows=37),
+            50,
+            names,
+        ),
+        tmp_path / "avg.npy",
+        rows=len(source),
+    )
+    assert np.allclose(
+        np.load(tmp_path / "avg.npy"),
+        stock_analyzer.movingAverage(frame, 50, names).values,
+    )
+
+    assert_frame_equal(
+        chunked.chunkedSummaryStats(
+            chunked.readNpyChunks(
+                tmp_path / "bars.npy", columns=frame.columns, chunk_rows=37
+            ),
+            measurements=["High", "Close"],
+        ),
+        stock_analyzer.summaryStats(frame, measurements=["High", "Close"]),
+    )
+
+    with raises(ValueError) as execinfo_1:
+        chunked.readNpyChunks(tmp_path / "bars.npy", chunk_rows=0)
+    assert (
+        str(execinfo_1.value)
+        == "The value of chunk_rows must be a positive integer."
+    )
+
+    with raises(ValueError) as execinfo_2:
+        chunked.writeNpy(
+            chunked.readNpyChunks(tmp_path / "bars.npy"),
+            tmp_path / "short.npy",
+            rows=10,
+        )
+    assert str(execinfo_2.value) == "The frames have more rows than specified."
+
+    with raises(ValueError) as execinfo_3:
+        chunked.chunkedMovingAverage([], 0, names)
+    assert (
+        str(execinfo_3.value)
+        == "The value of window must be a positive integer."
+    )
+
+
+def test_parquet_chunks(tmp_path):
+    pyarrow = importorskip("pyarrow")
+    importorskip("pyarrow.parquet")
+    rng = np.random.default_rng(1)
+    frame = pd.DataFrame(
+        rng.normal(100, 5, size=(500, 2)),
+        columns=["Open", "Close"],
+        index=pd.date_range("2021-01-01", periods=500, freq="H", name="Date"),
+    )
+    pyarrow.parquet.write_table(
+        pyarrow.Table.from_pandas(frame),
+        tmp_path / "bars.parquet",
+        row_group_size=64,
+    )
+    names = ["expOpen", "expClose"]
+
+    chunks = list(chunked.readParquetChunks(tmp_path / "bars.parquet"))
+    assert len(chunks) == 8
+    assert_frame_equal(pd.concat(chunks), frame, check_freq=False)
+
+    chunked.writeParquet(
+        chunked.chunkedExponentialSmoothing(
+            chunked.readParquetChunks(tmp_path / "bars.parquet"),
+            names,
+            alpha=0.2,
+        ),
+        tmp_path / "exp.parquet",
+    )
+    streamed = pd.concat(chunked.readParquetChunks(tmp_path / "exp.parquet"))
+    expected = stock_analyzer.exponentialSmoothing(frame, names, alpha=0.2)
+    assert streamed.index.equals(expected.index)
+    assert np.allclose(streamed.values, expected.values)
+
+    assert_frame_equal(
+        chunked.chunkedSummaryStats(
+            chunked.readParquetChunks(tmp_path / "bars.parquet", ["Close"]),
+            measurements=["Close"],
+        ),
+        stock_analyzer.summaryStats(frame, measurements=["Close"]),
+    )
@@ -0,0 +1,90 @@
+from stock_analyzer import correlation
+from pytest import raises
+import pandas as pd
+import numpy as np
+
+
+def _closes(rows=120, tickers=5, seed=0):
+    rng = np.random.default_rng(seed)
+    shocks = rng.normal(0, 0.01, size=(rows, tickers))
+    shocks[:, 1] += shocks[:, 0]
+    return pd.DataFrame(
+        100 * np.exp(shocks.cumsum(axis=0)),
+        index=pd.bdate_range("2020-01-01", periods=rows, name="Date"),
+        columns=[f"T{i}" for i in range(tickers)],
+    )
+
+
+def test_return_matrices():
+    closes = _closes()
+    log_returns = np.log(closes).diff()
+
+    corr = correlation.returnCorrelation(closes)
+    assert corr.index.to_list() == closes.columns.to_list()
+    assert np.allclose(corr, log_returns.corr())
+    assert np.allclose(
+        correlation.returnCovariance(closes, returns="simple"),
+        closes.pct_change().cov(),
+    )
+    single = correlation.returnCorrelation(closes, dtype="float32")
+    assert single.values.dtype == np.float32
+    assert np.allclose(single, corr, atol=1e-5)
+
+    # tickers without prices on some days use the days both have returns
+    panel = (
+        closes.stack()
+        .rename("Close")
+        .reset_index(level=1)
+        .rename(columns={"level_1": "ticker"})
+        .sample(frac=0.8, random_state=0)
+    )
+    prices = panel.pivot(columns="ticker", values="Close").sort_index()
+    for function, reference in [
+        (correlation.returnCorrelation, np.log(prices).diff().corr()),
+        (correlation.returnCovariance, np.log(prices).diff().cov()),
+    ]:
+        result = function(panel, by="ticker")
+        assert np.allclose(
+            result, reference.loc[result.index, result.columns]
+        )
+
+    wide = pd.concat({"Close": closes, "Open": closes * 2}, axis=1)
+    wide = wide.swaplevel(axis=1)
+    assert np.allclose(correlation.returnCorrelation(wide), corr)
+
+
+def test_rolling():
+    closes = _closes()
+    log_returns = np.log(closes).diff().iloc[1:]
+    matrices = list(
+        correlation.rollingReturnCorrelation(closes, 30, step=7)
+    )
+    assert len(matrices) == len(range(29, 119, 7))
+    for time, matrix in matrices:
+        window = log_returns.loc[:time].iloc[-30:]
+        assert len(window) == 30
+        assert np.allclose(matrix, window.corr())
+
+    time, matrix = list(
+        correlation.rollingReturnCorrelation(closes, 10, covariance=True)
+    )[-1]
+    assert time == closes.index[-1]
+    assert np.allclose(matrix, log_returns.iloc[-10:].cov())
+
+    with raises(ValueError) as execinfo_1:
+        correlation.rollingReturnCorrelation(closes, 1)
+    assert (
+        str(execinfo_1.value)
+        == "The value of window must be an integer of 2 or more."
+    )
+
+    closes.iloc[5, 2] = np.nan
+    with raises(ValueError) as execinfo_2:
+        correlation.rollingReturnCorrelation(closes, 10)
+    assert (
+        str(execinfo_2.value) == "Column T2 has 2 NaN values at rows [4, 5]."
+    )
+
+    with raises(ValueError) as execinfo_3:
+        correlation.returnCorrelation(closes, returns="excess")
+    assert str(execinfo_3.value) == "The returns must be log or simple."
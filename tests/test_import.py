@@ -0,0 +1,30 @@
+import subprocess
+import sys
+
+# seconds allowed for importing the analysis functions in a fresh
+# interpreter; most of it is spent importing numpy and pandas
+IMPORT_BUDGET = 2.0
+
+_SCRIPT = """
+import sys
+import time
+start = time.perf_counter()
+import stock_analyzer
+from stock_analyzer import stock_analyzer
+elapsed = time.perf_counter() - start
+print(elapsed, "altair" in sys.modules)
+"""
+
+
+def test_import_time():
+    timings = []
+    for _ in range(3):
+        output = subprocess.run(
+            [sys.executable, "-c", _SCRIPT],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        assert output[1] == "False", "altair should be imported lazily"
+        timings.append(float(output[0]))
+    assert min(timings) < IMPORT_BUDGET
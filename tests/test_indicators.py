@@ -0,0 +1,148 @@
+from stock_analyzer import indicators
+from pytest import raises
+import pandas as pd
+import numpy as np
+
+
+def _bars(rows=300, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.normal(size=rows).cumsum()
+    spread = np.abs(rng.normal(size=rows))
+    return pd.DataFrame(
+        {"High": close + spread, "Low": close - spread, "Close": close}
+    )
+
+
+def _ewm(series, alpha):
+    return series.ewm(alpha=alpha, adjust=False).mean()
+
+
+def test_moving_averages():
+    bars = _bars()
+    close = bars["Close"]
+    # warm-up rows are padded with the first value, as in movingAverage
+    padded = pd.concat([pd.Series([close[0]] * 9), close], ignore_index=True)
+    weights = np.arange(1, 11)
+    expected = padded.rolling(10).apply(
+        lambda window: (window * weights).sum() / weights.sum(), raw=True
+    )[9:]
+    wma = indicators.weightedMovingAverage(bars, 10, ["h", "l", "c"])
+    assert wma.columns.to_list() == ["h", "l", "c"]
+    assert np.allclose(wma["c"], expected)
+
+    def weighted(series, window):
+        return indicators.weightedMovingAverage(
+            series.to_frame(), window, ["x"]
+        )["x"]
+
+    hma = indicators.hullMovingAverage(bars[["Close"]], 16, ["hma"])
+    assert np.allclose(
+        hma["hma"], weighted(2 * weighted(close, 8) - weighted(close, 16), 4)
+    )
+
+    alpha = 2 / 21
+    once = _ewm(close, alpha)
+    twice = _ewm(once, alpha)
+    dema = indicators.doubleExponentialMovingAverage(bars, 20, ["h", "l", "c"])
+    assert np.allclose(dema["c"], 2 * once - twice)
+    tema = indicators.tripleExponentialMovingAverage(bars, 20, ["h", "l", "c"])
+    assert np.allclose(tema["c"], 3 * once - 3 * twice + _ewm(twice, alpha))
+
+
+def test_oscillators_and_bands():
+    bars = _bars()
+    close = bars["Close"]
+
+    result = indicators.macd(bars[["Close"]], 12, 26, 9)
+    assert result.columns.to_list() == [
+        ("Close", "macd"),
+        ("Close", "signal"),
+        ("Close", "histogram"),
+    ]
+    line = _ewm(close, 2 / 13) - _ewm(close, 2 / 27)
+    assert np.allclose(result["Close"]["macd"], line)
+    assert np.allclose(result["Close"]["signal"], _ewm(line, 0.2))
+    assert np.allclose(
+        result["Close"]["histogram"], line - _ewm(line, 0.2)
+    )
+
+    bands = indicators.bollingerBands(bars[["Close"]], 20, 2.5)
+    assert np.allclose(
+        bands["Close"]["middle"][19:], close.rolling(20).mean()[19:]
+    )
+    assert np.allclose(
+        (bands["Close"]["upper"] - bands["Close"]["lower"])[19:],
+        5 * close.rolling(20).std(ddof=0)[19:],
+    )
+
+    change = close.diff().fillna(0)
+    gain = _ewm(change.clip(lower=0), 1 / 14)
+    loss = _ewm(-change.clip(upper=0), 1 / 14)
+    rsi = indicators.relativeStrengthIndex(bars[["Close"]], ["rsi"])
+    assert np.isnan(rsi["rsi"][0])
+    assert np.allclose(rsi["rsi"][1:], (100 - 100 / (1 + gain / loss))[1:])
+
+    previous = close.shift().fillna(close[0])
+    true_range = pd.concat(
+        [
+            bars["High"] - bars["Low"],
+            (bars["High"] - previous).abs(),
+            (bars["Low"] - previous).abs(),
+        ],
+        axis=1,
+    ).max(axis=1)
+    atr = indicators.averageTrueRange(bars, 14)
+    assert atr.columns.to_list() == ["atr"]
+    assert np.allclose(atr["atr"], _ewm(true_range, 1 / 14))
+
+
+def test_panels():
+    first, second = _bars(120, 1), _bars(200, 2)
+    panel = pd.concat(
+        [first.assign(ticker="A"), second.assign(ticker="B")]
+    ).sort_index(kind="stable")
+    wide = pd.concat({"A": first, "B": second.iloc[:120]}, axis=1)
+
+    for function, args in [
+        (indicators.hullMovingAverage, (9, ["h", "l", "c"])),
+        (indicators.tripleExponentialMovingAverage, (9, ["h", "l", "c"])),
+        (indicators.relativeStrengthIndex, (["h", "l", "c"],)),
+        (indicators.macd, ()),
+        (indicators.bollingerBands, ()),
+        (indicators.averageTrueRange, ()),
+    ]:
+        long_result = function(panel, *args, by="ticker")
+        assert long_result["ticker"].to_list() == panel["ticker"].to_list()
+        wide_result = function(wide, *args)
+        for ticker, bars in [("A", first), ("B", second)]:
+            expected = function(bars, *args).values
+            rows = (long_result["ticker"] == ticker).values
+            assert np.allclose(
+                long_result[rows].iloc[:, 1:].values.astype(float),
+                expected,
+                equal_nan=True,
+            )
+            assert np.allclose(
+                wide_result[ticker].values,
+                function(bars.iloc[:120], *args).values,
+                equal_nan=True,
+            )
+
+
+def test_errors():
+    bars = _bars()
+    with raises(ValueError) as execinfo_1:
+        indicators.macd(bars, slow=0)
+    assert (
+        str(execinfo_1.value)
+        == "The value of window must be a positive integer."
+    )
+
+    with raises(ValueError) as execinfo_2:
+        indicators.bollingerBands(bars, 20, -1)
+    assert str(execinfo_2.value) == "The value of width must be positive."
+
+    bars.loc[3, "Low"] = np.nan
+    with raises(ValueError) as execinfo_3:
+        indicators.averageTrueRange(bars)
+    assert str(execinfo_3.value) == "Column Low has 1 NaN values at rows [3]."
@@ -0,0 +1,81 @@
+from stock_analyzer import instrumentation, stock_analyzer
+from pytest import raises
+import logging
+import pandas as pd
+import numpy as np
+
+
+def test_profile():
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame(
+        rng.normal(100, 5, size=(200, 3)), columns=["Open", "Close", "High"]
+    )
+    names = ["avgOpen", "avgClose", "avgHigh"]
+
+    # nothing is recorded outside a profile
+    assert instrumentation.phase("kernel") is instrumentation._NOOP
+    with instrumentation.profile(trace_memory=True) as prof:
+        stock_analyzer.movingAverage(data, 10, names)
+        stock_analyzer.exponentialSmoothing(data, names, 0.2)
+        stock_analyzer.summaryStats(data, measurements=["Close"])
+        stock_analyzer.visMovingAverage(data, "Close", 10)
+        with raises(ValueError):
+            stock_analyzer.movingAverage(data, 0, names)
+    stock_analyzer.movingAverage(data, 10, names)
+
+    functions = [record["function"] for record in prof.records]
+    assert functions == [
+        "movingAverage",
+        "exponentialSmoothing",
+        "summaryStats",
+        "movingAverage",
+        "visMovingAverage",
+        "movingAverage",
+    ]
+    record = prof.records[0]
+    assert set(record["phases"]) == {"coerce", "validate", "kernel", "output"}
+    assert sum(record["phases"].values()) <= record["seconds"]
+    assert (record["rows"], record["columns"]) == (200, 3)
+    assert record["bytes"] == 200 * 3 * 8
+    assert record["peak_bytes"] > 0
+    assert prof.records[2]["columns"] == 1
+    assert "chart" in prof.records[4]["phases"]
+    assert prof.records[4]["peak_bytes"] is not None
+    # nested calls are recorded without their own peak
+    assert prof.records[3]["peak_bytes"] is None
+    assert prof.records[5]["error"] == "ValueError"
+
+    summary = prof.asDict()
+    assert summary["movingAverage"]["calls"] == 3
+    assert summary["movingAverage"]["errors"] == 1
+    assert summary["movingAverage"]["values"] == 200 * 3 + 200
+
+    text = prof.toPrometheus()
+    assert '# TYPE stock_analyzer_calls_total counter' in text
+    assert 'stock_analyzer_calls_total{function="movingAverage"} 3' in text
+    assert (
+        'stock_analyzer_phase_seconds_total{function="summaryStats",'
+        'phase="kernel"}' in text
+    )
+
+
+def test_register(caplog):
+    data = pd.DataFrame({"Close": [1.0, 2.0, 3.0, 4.0]})
+    records = []
+    callback = instrumentation.loggingCallback()
+    instrumentation.register(records.append)
+    instrumentation.register(callback)
+    try:
+        with caplog.at_level(logging.INFO, logger="stock_analyzer"):
+            stock_analyzer.rollingStats(data, 2, measurements=["Close"])
+    finally:
+        instrumentation.unregister(records.append)
+        instrumentation.unregister(callback)
+    stock_analyzer.rollingStats(data, 2, measurements=["Close"])
+
+    assert len(records) == 1
+    assert records[0]["function"] == "rollingStats"
+    assert records[0]["peak_bytes"] is None
+    assert caplog.records[0].getMessage().startswith(
+        "rollingStats rows=4 columns=1 bytes=32 seconds="
+    )
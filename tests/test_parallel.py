@@ -0,0 +1,120 @@
+from stock_analyzer import stock_analyzer
+from stock_analyzer.parallel import analyzeUniverse
+from pytest import raises
+from pandas.testing import assert_frame_equal
+import pandas as pd
+import numpy as np
+
+
+def test_analyzeUniverse():
+    rng = np.random.default_rng(0)
+    wide = pd.DataFrame(
+        rng.normal(100, 5, size=(300, 7)),
+        columns=["a", "b", "c", "d", "e", "f", "g"],
+    )
+    long = pd.DataFrame(
+        {
+            "ticker": rng.choice(["AAA", "BBB", "CCC", "DDD"], size=500),
+            "Close": rng.normal(100, 5, size=500),
+            "Open": rng.normal(100, 5, size=500),
+        }
+    )
+    names = ["avg" + name for name in wide.columns]
+
+    for max_workers in [1, 3]:
+        # wide frames are split by columns
+        assert_frame_equal(
+            analyzeUniverse(
+                wide, "movingAverage", 10, names, max_workers=max_workers
+            ),
+            stock_analyzer.movingAverage(wide, 10, names),
+        )
+        assert_frame_equal(
+            analyzeUniverse(
+                wide,
+                "exponentialSmoothing",
+                names,
+                alpha=0.2,
+                max_workers=max_workers,
+            ),
+            stock_analyzer.exponentialSmoothing(wide, names, alpha=0.2),
+        )
+        assert_frame_equal(
+            analyzeUniverse(
+                wide,
+                "summaryStats",
+                measurements=["a", "c", "g"],
+                max_workers=max_workers,
+            ),
+            stock_analyzer.summaryStats(wide, measurements=["a", "c", "g"]),
+        )
+
+        # long-format panels are split by tickers
+        result = analyzeUniverse(
+            long,
+            "movingAverage",
+            4,
+            ["avgClose", "avgOpen"],
+            by="ticker",
+            max_workers=max_workers,
+        )
+        expected = stock_analyzer.movingAverage(
+            long, 4, ["avgClose", "avgOpen"], by="ticker"
+        )
+        assert_frame_equal(result, expected)
+        result = analyzeUniverse(
+            long,
+            "summaryStats",
+            measurements=["Close"],
+            by="ticker",
+            max_workers=max_workers,
+        )
+        expected = stock_analyzer.summaryStats(
+            long, measurements=["Close"], by="ticker"
+        )
+        assert_frame_equal(result, expected)
+
+    # NaN policies are applied inside every shard
+    gappy = wide.mask(rng.random(wide.shape) < 0.1)
+    for policy in ["skip", "propagate"]:
+        assert_frame_equal(
+            analyzeUniverse(
+                gappy,
+                "exponentialSmoothing",
+                names,
+                nan_policy=policy,
+                max_workers=3,
+            ),
+            stock_analyzer.exponentialSmoothing(
+                gappy, names, nan_policy=policy
+            ),
+        )
+
+    with raises(ValueError) as execinfo_1:
+        analyzeUniverse(wide, "visMovingAverage", "a", 3)
+    assert (
+        str(execinfo_1.value)
+        == "The analysis must be one of summaryStats, movingAverage and \
+exponentialSmoothing."
+    )
+
+    with raises(ValueError) as execinfo_2:
+        analyzeUniverse(wide, "movingAverage", 0, names)
+    assert (
+        str(execinfo_2.value)
+        == "The value of window must be a positive integer."
+    )
+
+    with raises(ValueError) as execinfo_3:
+        analyzeUniverse(wide, "summaryStats", ["a"], spans=[5, 50])
+    assert (
+        str(execinfo_3.value)
+        == "Time spans are not supported by analyzeUniverse."
+    )
+
+    with raises(ValueError) as execinfo_4:
+        analyzeUniverse(wide, "exponentialSmoothing", names, alpha="auto")
+    assert (
+        str(execinfo_4.value)
+        == "alpha='auto' is not supported by analyzeUniverse."
+    )
@@ -0,0 +1,122 @@
+from stock_analyzer import resample, stock_analyzer
+from pytest import raises
+import pandas as pd
+import numpy as np
+
+
+def _ticks(rows=2000, seed=0, days=3, start="2021-03-01"):
+    rng = np.random.default_rng(seed)
+    seconds = np.sort(rng.integers(3600, days * 24 * 3600, size=rows))
+    return pd.DataFrame(
+        {
+            "Price": 100 * np.exp(rng.normal(0, 0.001, size=rows).cumsum()),
+            "Volume": rng.integers(1, 100, size=rows).astype(float),
+        },
+        index=pd.Timestamp(start) + pd.to_timedelta(seconds, "s"),
+    ).rename_axis("Time")
+
+
+def _expected(ticks, freq):
+    groups = ticks.resample(freq)
+    expected = groups["Price"].ohlc()
+    expected.columns = ["Open", "High", "Low", "Close"]
+    expected["Volume"] = groups["Volume"].sum()
+    expected["VWAP"] = (ticks["Price"] * ticks["Volume"]).resample(
+        freq
+    ).sum() / expected["Volume"]
+    return expected.dropna(subset=["Open"])
+
+
+def test_resampleBars():
+    ticks = _ticks()
+    # the bars and labels of DataFrame.resample, also for frequencies that
+    # do not divide a day and for calendar periods
+    for sample, freqs in [
+        (ticks, ["15min", "7min", "1H", "1D", "2D"]),
+        (_ticks(5000, days=100), ["7min", "2D", "W", "M", "MS", "Q"]),
+    ]:
+        for freq in freqs:
+            bars = resample.resampleBars(sample, freq, price="Price")
+            pd.testing.assert_frame_equal(
+                bars, _expected(sample, freq), check_freq=False
+            )
+
+    # the open and close are the first and last valid prices of every bar
+    gappy = ticks.copy()
+    hours = gappy.index.floor("1H")
+    edges = (hours != np.roll(hours, 1)) | (hours != np.roll(hours, -1))
+    gappy.loc[edges, "Price"] = np.nan
+    pd.testing.assert_frame_equal(
+        resample.resampleBars(gappy, "1H", price="Price"),
+        _expected(gappy, "1H"),
+        check_freq=False,
+    )
+
+    # bars of bars keep the open, extremes, close and total volume
+    hourly = resample.resampleBars(ticks, "1H", price="Price")
+    daily = resample.resampleBars(hourly, "1D")
+    expected = _expected(ticks, "1D")
+    pd.testing.assert_frame_equal(
+        daily.drop(columns="VWAP"),
+        expected.drop(columns="VWAP"),
+        check_freq=False,
+    )
+    typical = hourly[["High", "Low", "Close"]].mean(axis=1)
+    assert np.allclose(
+        daily["VWAP"],
+        (typical * hourly["Volume"]).resample("1D").sum()
+        / hourly["Volume"].resample("1D").sum(),
+    )
+
+    # calendar frequencies and unsorted rows
+    weekly = resample.resampleBars(
+        ticks.sample(frac=1, random_state=0), "W", price="Price", volume=None
+    )
+    assert weekly.columns.to_list() == ["Open", "High", "Low", "Close"]
+    assert weekly.index[0] == pd.Timestamp("2021-03-07")
+    assert np.isclose(weekly["Close"][0], ticks["Price"].iloc[-1])
+
+
+def test_resampleBars_panel():
+    first, second = _ticks(seed=1), _ticks(seed=2)
+    panel = pd.concat(
+        [first.assign(ticker="A"), second.assign(ticker="B")]
+    ).sort_index(kind="stable")
+    bars = resample.resampleBars(panel, "4H", price="Price", by="ticker")
+    assert bars.columns[0] == "ticker"
+    for ticker, ticks in [("A", first), ("B", second)]:
+        pd.testing.assert_frame_equal(
+            bars[bars["ticker"] == ticker].drop(columns="ticker"),
+            _expected(ticks, "4H"),
+            check_freq=False,
+        )
+
+    stats = stock_analyzer.summaryStats(bars, ["Close", "VWAP"], by="ticker")
+    assert stats["ticker"].to_list() == ["A", "A", "B", "B"]
+
+    zoned = resample.resampleBars(
+        first.tz_localize("America/New_York"), "1D", price="Price"
+    )
+    assert str(zoned.index.tz) == "America/New_York"
+    assert np.allclose(zoned, _expected(first, "1D"))
+
+    # bars below a day keep their length across daylight saving changes
+    for start in ["2021-03-13", "2021-11-06"]:
+        ticks = _ticks(seed=3, start=start).tz_localize("UTC")
+        ticks = ticks.tz_convert("America/New_York")
+        for freq in ["1H", "4H", "1D"]:
+            pd.testing.assert_frame_equal(
+                resample.resampleBars(ticks, freq, price="Price"),
+                _expected(ticks, freq),
+                check_freq=False,
+            )
+
+    with raises(ValueError) as execinfo_1:
+        resample.resampleBars(first.reset_index(), "1D", price="Price")
+    assert (
+        str(execinfo_1.value) == "Resampling needs data with a DatetimeIndex."
+    )
+
+    with raises(ValueError) as execinfo_2:
+        resample.resampleBars(first, "fortnight", price="Price")
+    assert str(execinfo_2.value) == "The frequency 'fortnight' is not valid."
@@ -0,0 +1,119 @@
+from stock_analyzer import risk, stock_analyzer
+from pytest import raises
+import pandas as pd
+import numpy as np
+
+
+def _prices(rows=400, seed=0):
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0.0003, 0.01, size=rows)
+    shocks = rng.normal(0, 0.01, size=(rows, 2))
+    shocks[:, 0] += 1.5 * market
+    return pd.DataFrame(
+        {
+            "Close": 100 * np.exp(shocks[:, 0].cumsum()),
+            "Open": 50 * np.exp(shocks[:, 1].cumsum()),
+            "Index": 1000 * np.exp(market.cumsum()),
+        }
+    )
+
+
+def _expected(prices, benchmark, periods=252, risk_free=0.02, level=0.9):
+    returns = np.log(prices).diff().dropna()
+    target = risk_free / periods
+    downside = np.sqrt((np.minimum(returns - target, 0) ** 2).mean())
+    cutoff = np.quantile(returns, 1 - level)
+    market = np.log(benchmark).diff().dropna()
+    return {
+        "annual_return": returns.mean() * periods,
+        "annual_volatility": returns.std() * np.sqrt(periods),
+        "sharpe": (returns.mean() - target) / returns.std() * np.sqrt(periods),
+        "sortino": (returns.mean() - target) / downside * np.sqrt(periods),
+        "max_drawdown": (prices / prices.cummax() - 1).min(),
+        "var": -cutoff,
+        "cvar": -returns[returns <= cutoff].mean(),
+        "beta": np.cov(returns, market)[0, 1] / market.var(),
+    }
+
+
+def test_riskStats():
+    prices = _prices()
+    result = risk.riskStats(
+        prices,
+        ["Close", "Open"],
+        risk_free=0.02,
+        level=0.9,
+        benchmark="Index",
+    )
+    assert result.columns.to_list() == [
+        "measurement",
+        "annual_return",
+        "annual_volatility",
+        "sharpe",
+        "sortino",
+        "max_drawdown",
+        "var",
+        "cvar",
+        "beta",
+    ]
+    for row, name in enumerate(["Close", "Open"]):
+        expected = _expected(prices[name], prices["Index"])
+        for key, value in expected.items():
+            assert np.isclose(result[key][row], value), key
+    assert 1.2 < result["beta"][0] < 1.8
+
+    simple = risk.riskStats(prices, returns="simple", periods=12)
+    assert np.isclose(
+        simple["annual_volatility"][0],
+        prices["Close"].pct_change().std() * np.sqrt(12),
+    )
+
+    # tickers of different lengths in one long-format panel
+    panel = pd.concat(
+        [prices.iloc[:150].assign(ticker="A"), prices.assign(ticker="B")]
+    ).sort_index(kind="stable")
+    result = risk.riskStats(
+        panel,
+        ["Close"],
+        by="ticker",
+        risk_free=0.02,
+        level=0.9,
+        benchmark="Index",
+    )
+    assert result["ticker"].to_list() == ["A", "B"]
+    for row, part in enumerate([prices.iloc[:150], prices]):
+        expected = _expected(part["Close"], part["Index"])
+        for key, value in expected.items():
+            assert np.isclose(result[key][row], value), key
+
+
+def test_summaryStats_risk():
+    prices = _prices()
+    summary = stock_analyzer.summaryStats(prices, ["Close", "Open"], risk=True)
+    plain = stock_analyzer.summaryStats(prices, ["Close", "Open"])
+    measured = risk.riskStats(prices, ["Close", "Open"])
+    pd.testing.assert_frame_equal(summary[plain.columns], plain)
+    pd.testing.assert_frame_equal(
+        summary[measured.columns], measured, check_exact=False
+    )
+
+    spans = stock_analyzer.summaryStats(
+        prices, ["Close"], spans=[100], risk=True
+    )
+    assert np.isclose(
+        spans["max_drawdown"][0],
+        risk.riskStats(prices.iloc[-100:])["max_drawdown"][0],
+    )
+
+    with raises(ValueError) as execinfo_1:
+        risk.riskStats(prices, level=95)
+    assert (
+        str(execinfo_1.value) == "The value of level must be between 0 and 1."
+    )
+
+    with raises(ValueError) as execinfo_2:
+        risk.riskStats(prices, benchmark="SPY")
+    assert (
+        str(execinfo_2.value)
+        == "Your specified benchmark 'SPY' is not a column name of the data."
+    )
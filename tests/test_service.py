@@ -0,0 +1,169 @@
+from stock_analyzer import service, stock_analyzer
+from pytest import raises
+import asyncio
+import json
+import pandas as pd
+import numpy as np
+
+
+def _frames(count=3, rows=80, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        pd.DataFrame(
+            100 + rng.normal(0, 1, size=(rows - 10 * i, 2)).cumsum(axis=0),
+            index=pd.bdate_range("2021-01-01", periods=rows - 10 * i),
+            columns=["Open", "Close"],
+        ).rename_axis("Date")
+        for i in range(count)
+    ]
+
+
+def test_batching():
+    frames = _frames()
+
+    async def run():
+        async with service.AnalysisService(max_workers=2) as analyses:
+            stats = await asyncio.gather(
+                *(analyses.summaryStats(frame, ["Close"]) for frame in frames)
+            )
+            smoothed = await asyncio.gather(
+                *(
+                    analyses.movingAverage(frame, 5, ["maOpen", "maClose"])
+                    for frame in frames
+                )
+            )
+            return stats, smoothed, analyses.info()
+
+    stats, smoothed, info = asyncio.run(run())
+    assert info["requests"] == 6
+    assert info["batches"] == 2
+    assert info["inflight"] == 0
+    for frame, stat, average in zip(frames, stats, smoothed):
+        pd.testing.assert_frame_equal(
+            stat,
+            stock_analyzer.summaryStats(frame, ["Close"]),
+            check_exact=False,
+        )
+        pd.testing.assert_frame_equal(
+            average,
+            stock_analyzer.movingAverage(frame, 5, ["maOpen", "maClose"]),
+            check_exact=False,
+        )
+
+
+def test_coalescing_and_errors():
+    frames = _frames()
+    broken = frames[1].copy()
+    broken.iloc[3, 0] = np.nan
+
+    async def run():
+        analyses = service.AnalysisService(batch_delay=0.01)
+
+        async def mutated():
+            # the first caller changes its result before the others resolve
+            result = await analyses.exponentialSmoothing(
+                frames[0], ["a", "b"], 0.5
+            )
+            result["a"] = -999.0
+            return result
+
+        shared = await asyncio.gather(
+            mutated(),
+            *(
+                analyses.exponentialSmoothing(frames[0], ["a", "b"], 0.5)
+                for _ in range(3)
+            ),
+        )
+        outcomes = await asyncio.gather(
+            *(
+                analyses.exponentialSmoothing(frame, ["a", "b"], 0.5)
+                for frame in [frames[0], broken, frames[2]]
+            ),
+            return_exceptions=True,
+        )
+        info = analyses.info()
+        analyses.close()
+        return shared, outcomes, info
+
+    shared, outcomes, info = asyncio.run(run())
+    assert info["coalesced"] == 3
+    assert (shared[0]["a"] == -999.0).all()
+    assert all(result is not shared[1] for result in shared[2:])
+    for result in shared[1:]:
+        pd.testing.assert_frame_equal(
+            result,
+            stock_analyzer.exponentialSmoothing(frames[0], ["a", "b"], 0.5),
+        )
+    assert isinstance(outcomes[1], ValueError)
+    assert str(outcomes[1]) == "Column Open has 1 NaN values at rows [3]."
+    pd.testing.assert_frame_equal(
+        outcomes[2],
+        stock_analyzer.exponentialSmoothing(frames[2], ["a", "b"], 0.5),
+        check_exact=False,
+    )
+
+    stats = asyncio.run(service.asummaryStats(frames[0], ["Open"]))
+    pd.testing.assert_frame_equal(
+        stats, stock_analyzer.summaryStats(frames[0], ["Open"])
+    )
+
+    with raises(TypeError) as execinfo_1:
+        asyncio.run(service.amovingAverage(frames[0], 5, ["a", "b"], span=3))
+    assert str(execinfo_1.value).startswith(
+        "Invalid arguments for movingAverage:"
+    )
+
+
+def test_server():
+    frame = _frames(1)[0]
+
+    async def request(port, path, body):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        content = json.dumps(body).encode()
+        head = f"POST {path} HTTP/1.1\r\nContent-Length: {len(content)}"
+        writer.write(f"{head}\r\n\r\n".encode() + content)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        head, _, payload = response.decode().partition("\r\n\r\n")
+        return int(head.split(" ")[1]), json.loads(payload)
+
+    async def run():
+        server = await service.startServer(port=0)
+        port = server.sockets[0].getsockname()[1]
+        data = json.loads(frame.to_json(orient="split", date_format="iso"))
+        async with server:
+            args = {"window": 3, "newColumnNames": ["a", "b"]}
+            ok = await request(
+                port, "/movingAverage", {"data": data, "args": args}
+            )
+            args = {"measurements": ["High"]}
+            bad = await request(
+                port, "/summaryStats", {"data": data, "args": args}
+            )
+            missing = await request(port, "/forecast", {})
+            listed = await request(port, "/summaryStats", [1, 2])
+
+        class Failing:
+            async def summaryStats(self, data, **kwargs):
+                raise RuntimeError("worker lost")
+
+        server = await service.startServer(port=0, service=Failing())
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            failed = await request(port, "/summaryStats", {"data": data})
+        return ok, bad, missing, listed, failed
+
+    ok, bad, missing, listed, failed = asyncio.run(run())
+    assert ok[0] == 200
+    expected = stock_analyzer.movingAverage(frame, 3, ["a", "b"])
+    assert ok[1]["columns"] == ["a", "b"]
+    assert pd.DatetimeIndex(ok[1]["index"]).equals(expected.index)
+    assert np.allclose(ok[1]["data"], expected.values)
+    assert bad[0] == 400
+    assert missing[0] == 404
+    assert listed == (
+        400,
+        {"error": "The request body must be a JSON object."},
+    )
+    assert failed == (500, {"error": "RuntimeError: worker lost"})
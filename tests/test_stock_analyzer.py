@@ -2,6 +2,8 @@ from stock_analyzer import stock_analyzer
 from pytest import raises
 import pandas as pd
 import numpy as np
+import math
+import tracemalloc
 
 
 def test_SummaryStats():
@@ -143,6 +145,123 @@ def test_SummaryStats():
     assert isinstance(df_summaryStats, type(pd.DataFrame()))
     assert len(df_summaryStats) == 2
 
+    # agrees with the pandas reductions, across several row blocks
+    rng = np.random.default_rng(0)
+    data_7 = pd.DataFrame(
+        rng.normal(1e6, 5, size=(5000, 3)), columns=["a", "b", "c"]
+    )
+    data_7.iloc[rng.integers(0, 5000, 200), 1] = np.nan
+    data_7["c"] = np.nan
+    df_summaryStats_7 = stock_analyzer.summaryStats(
+        data_7, measurements=["a", "b", "c"]
+    )
+    expected = data_7.agg(["mean", "min", "max", "std"]).T
+    assert np.allclose(
+        df_summaryStats_7[["mean", "min", "max", "volatility"]].values,
+        expected.values,
+        equal_nan=True,
+    )
+
+    from stock_analyzer._kernels import columnStats
+
+    blocked = columnStats(data_7.values, block=7)
+    assert np.allclose(blocked["std"][:2], expected["std"].values[:2])
+    assert np.isnan(blocked["mean"][2]) and blocked["count"][2] == 0
+
+
+def test_summaryStats_spans():
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame(
+        rng.normal(100, 5, size=(60, 2)),
+        columns=["Open", "Close"],
+        index=pd.date_range("2021-01-01", periods=60, name="Date"),
+    )
+
+    spans = stock_analyzer.summaryStats(
+        data, measurements=["Open", "Close"], spans=[10, "7D", 100]
+    )
+    assert spans.columns.to_list()[:3] == [
+        "start_date",
+        "end_date",
+        "measurement",
+    ]
+    assert len(spans) == 6
+    assert spans["start_date"].to_list()[::2] == [
+        pd.Timestamp("2021-02-20"),
+        pd.Timestamp("2021-02-23"),
+        pd.Timestamp("2021-01-01"),
+    ]
+    assert (spans["end_date"] == pd.Timestamp("2021-03-01")).all()
+    expected = stock_analyzer.summaryStats(
+        data.iloc[-10:], measurements=["Open", "Close"]
+    )
+    assert np.allclose(
+        spans.iloc[:2, 3:].values.astype(float), expected.iloc[:, 1:].values
+    )
+
+    with raises(ValueError) as execinfo_1:
+        stock_analyzer.summaryStats(
+            data.reset_index(drop=True), measurements=["Open"], spans=["7D"]
+        )
+    assert (
+        str(execinfo_1.value)
+        == "Time spans given as offsets need data with a DatetimeIndex."
+    )
+
+    with raises(ValueError) as execinfo_2:
+        stock_analyzer.summaryStats(data, measurements=["Open"], spans=[0])
+    assert str(execinfo_2.value) == "The time spans must be positive."
+
+
+def test_rollingStats():
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame(
+        rng.normal(100, 5, size=(300, 2)), columns=["Open", "Close"]
+    )
+    data.iloc[rng.integers(0, 300, 20), 1] = np.nan
+
+    for window in [1, 5, 50, 400]:
+        stats = stock_analyzer.rollingStats(
+            data, window, measurements=["Open", "Close"]
+        )
+        assert stats.index.equals(data.index)
+        assert stats.columns.to_list()[:5] == [
+            ("Open", "mean"),
+            ("Open", "min"),
+            ("Open", "max"),
+            ("Open", "volatility"),
+            ("Open", "return"),
+        ]
+        rolling = data.rolling(window, min_periods=1)
+        for name, expected in [
+            ("mean", rolling.mean()),
+            ("min", rolling.min()),
+            ("max", rolling.max()),
+            ("volatility", rolling.std()),
+        ]:
+            assert np.allclose(
+                stats.xs(name, axis=1, level=1).values,
+                expected.values,
+                equal_nan=True,
+            )
+
+        # the last row covers the same rows as summaryStats on the tail
+        tail = stock_analyzer.summaryStats(
+            data.iloc[-window:], measurements=["Open", "Close"]
+        )
+        assert np.allclose(
+            stats.iloc[-1].values.reshape(2, 5),
+            tail.iloc[:, 1:].values.astype(float),
+            equal_nan=True,
+        )
+
+    with raises(ValueError) as execinfo_1:
+        stock_analyzer.rollingStats(data, 0, measurements=["Open"])
+    assert (
+        str(execinfo_1.value)
+        == "The value of window must be a positive integer."
+    )
+
 
 def test_movingAverage():
 
@@ -229,7 +348,10 @@ def test_movingAverage():
         stock_analyzer.movingAverage(
             data_2, 3, ["movingAverage" + name for name in source.columns]
         )
-    assert str(execinfo_2.value) == "Column e has Nan at [1] [3] [5] "
+    assert (
+        str(execinfo_2.value)
+        == "Column e has 3 NaN values at rows [1, 3, 5]."
+    )
 
     # String test
     data_3 = pd.DataFrame(
@@ -254,6 +376,147 @@ def test_movingAverage():
         == "Column e can't be converted to floating point"
     )
 
+    # agrees with the windowed average definition
+    rng = np.random.default_rng(0)
+    data_4 = pd.DataFrame(
+        rng.normal(100, 5, size=(500, 3)), columns=["a", "b", "c"]
+    )
+    for window in [1, 7, 50, 600]:
+        padded = np.vstack(
+            [np.repeat(data_4.values[:1], window - 1, axis=0), data_4.values]
+        )
+        expected = np.array(
+            [
+                padded[i: i + window].mean(axis=0)
+                for i in range(len(data_4))
+            ]
+        )
+        result = stock_analyzer.movingAverage(data_4, window, ["a", "b", "c"])
+        assert np.allclose(result.values, expected)
+        result_stable = stock_analyzer.movingAverage(
+            data_4, window, ["a", "b", "c"], stable=True
+        )
+        assert np.allclose(result_stable.values, expected)
+
+    # stable mode re-bases across blocks
+    from stock_analyzer._kernels import rollingMean
+
+    assert np.allclose(
+        rollingMean(data_4.values, 20, stable=True, block=30),
+        rollingMean(data_4.values, 20),
+    )
+
+    # panels, NaN-aware and time windows re-base as well: on a long series
+    # far from its first value the last windows stay exact
+    walk = 1e6 * np.exp(rng.normal(0, 0.01, size=200000).cumsum())
+    long = pd.DataFrame(
+        {"a": walk},
+        index=pd.date_range("2000-01-01", periods=len(walk), freq="min"),
+    )
+    n = len(walk)
+    exact = [math.fsum(walk[i - 19: i + 1]) / 20 for i in range(n - 5, n)]
+    gappy = long.copy()
+    gappy.iloc[5, 0] = np.nan
+    panel = pd.concat([long.assign(t="A"), long.assign(t="B")])
+    for result in [
+        stock_analyzer.movingAverage(panel, 20, ["m"], by="t", stable=True)[
+            "m"
+        ].values[:n],
+        stock_analyzer.movingAverage(
+            gappy, 20, ["m"], stable=True, nan_policy="skip"
+        )["m"].values,
+        stock_analyzer.movingAverage(long, "20min", ["m"], stable=True)[
+            "m"
+        ].values,
+    ]:
+        assert np.allclose(result[-5:], exact, rtol=1e-13, atol=0)
+
+    # wrong window value tests
+    for window in [0, -3, 2.5]:
+        with raises(ValueError) as execinfo_5:
+            stock_analyzer.movingAverage(data_4, window, ["a", "b", "c"])
+        assert (
+            str(execinfo_5.value)
+            == "The value of window must be a positive integer."
+        )
+
+
+def test_smoothing_memory():
+    rng = np.random.default_rng(0)
+    source = pd.DataFrame(
+        rng.normal(100, 5, size=(50000, 4)), columns=["a", "b", "c", "d"]
+    )
+    original = source.copy()
+    names = ["A", "B", "C", "D"]
+    output_bytes = source.shape[0] * source.shape[1] * 8
+
+    for smoother in [
+        lambda **kwargs: stock_analyzer.movingAverage(
+            source, 20, names, **kwargs
+        ),
+        lambda **kwargs: stock_analyzer.exponentialSmoothing(
+            source, names, 0.3, **kwargs
+        ),
+    ]:
+        expected = smoother()
+
+        # float32 results
+        result_32 = smoother(dtype="float32")
+        assert (result_32.dtypes == np.float32).all()
+        assert np.allclose(result_32.values, expected.values, rtol=1e-5)
+
+        # results written into a preallocated array
+        out = np.empty(source.shape)
+        tracemalloc.start()
+        result_out = smoother(out=out)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert np.shares_memory(result_out.values, out)
+        assert np.allclose(out, expected.values)
+        assert peak < 0.5 * output_bytes
+
+        # a single output buffer otherwise
+        tracemalloc.start()
+        smoother()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert peak < 1.5 * output_bytes
+
+        with raises(ValueError) as execinfo_1:
+            smoother(out=np.empty((3, 4)))
+        assert (
+            str(execinfo_1.value)
+            == "The out array must have the shape of the smoothed data."
+        )
+        with raises(ValueError) as execinfo_2:
+            smoother(dtype="int64")
+        assert str(execinfo_2.value) == "The dtype must be float32 or float64."
+
+    # float32 moving averages and exponential smoothing of a trending price
+    # stay within a few ulp of the float64 result, for short and long
+    # windows and small and large alphas
+    walk = np.abs(rng.normal(0, 1, size=50000).cumsum())
+    trend = pd.DataFrame({"Close": 50 + 460 * walk / walk.max()})
+    for window in [1, 20, 500]:
+        result_32 = stock_analyzer.movingAverage(
+            trend, window, ["A"], dtype="float32"
+        )
+        expected = stock_analyzer.movingAverage(trend, window, ["A"])
+        assert np.allclose(
+            result_32.values, expected.values, rtol=4e-7, atol=0
+        ), window
+    for alpha in [0.001, 0.01, 0.3, 0.9]:
+        result_32 = stock_analyzer.exponentialSmoothing(
+            trend, ["A"], alpha, dtype="float32"
+        )
+        expected = stock_analyzer.exponentialSmoothing(trend, ["A"], alpha)
+        assert np.allclose(
+            result_32.values, expected.values, rtol=4e-7, atol=0
+        ), alpha
+
+    # smoothing in place never touches the input data
+    assert source.equals(original)
+
 
 def test_exponentialSmoothing():
     source = pd.DataFrame(
@@ -319,7 +582,10 @@ def test_exponentialSmoothing():
         stock_analyzer.exponentialSmoothing(
             data_2, [name for name in source.columns]
         )
-    assert str(execinfo_2.value) == "Column e has Nan at [1] [3] "
+    assert (
+        str(execinfo_2.value)
+        == "Column e has 2 NaN values at rows [1, 3]."
+    )
 
     # String test
     data_3 = pd.DataFrame(
@@ -355,6 +621,22 @@ def test_exponentialSmoothing():
         )
     assert str(execinfo_5.value) == "The value of alpha must between 0 and 1."
 
+    # agrees with the recursive definition for a range of alphas
+    rng = np.random.default_rng(0)
+    data_6 = pd.DataFrame(
+        rng.normal(100, 5, size=(3000, 3)), columns=["a", "b", "c"]
+    )
+    for alpha in [0, 0.01, 0.3, 0.9, 0.999999, 1]:
+        expected = np.empty(data_6.shape)
+        prev = data_6.values[0]
+        for i, row in enumerate(data_6.values):
+            prev = alpha * row + (1 - alpha) * prev
+            expected[i] = prev
+        result = stock_analyzer.exponentialSmoothing(
+            data_6, ["a", "b", "c"], alpha=alpha
+        )
+        assert np.allclose(result.values, expected, rtol=1e-12)
+
 
 def test_visMovingAverage():
 
@@ -423,6 +705,25 @@ def test_visMovingAverage():
     ), "y_axis should be mapped to the y axis"
     assert sma_example_2.layer[1].mark == "line", "mark should be a line"
 
+    # only the plotted columns are smoothed, into one chart dataframe
+    assert sma_example_2.data.columns.to_list() == [
+        "Year",
+        "3",
+        "movingAverage3",
+    ]
+    sma_example_3 = stock_analyzer.visMovingAverage(source_2, ["2", "4"], 3)
+    assert len(sma_example_3.layer) == 4
+    assert (
+        sma_example_3.layer[3].encoding.y.shorthand == "movingAverage4"
+    ), "y_axis should be mapped to the y axis"
+    assert sma_example_3.data.columns.to_list() == [
+        "Year",
+        "2",
+        "4",
+        "movingAverage2",
+        "movingAverage4",
+    ]
+
     # test exception handling
     with raises(ValueError) as bad_ex:
         stock_analyzer.visMovingAverage(source_2, "hello", 3)
@@ -503,6 +804,30 @@ def test_visExpSmoothing():
     assert exp_plot_2.layer[0].mark == "line", "mark should be a line"
     assert exp_plot_2.layer[1].mark == "line", "mark should be a line"
 
+    # long series are decimated, keeping the extremes
+    rng = np.random.default_rng(0)
+    source_3 = pd.DataFrame(
+        {"Close": np.cumsum(rng.normal(0, 1, 10000)) + 100}
+    )
+    exp_plot_3 = stock_analyzer.visExpSmoothing(
+        source_3, "Close", 0.1, max_points=200
+    )
+    chart_data = exp_plot_3.data
+    assert len(chart_data) <= 200
+    assert chart_data["Close"].max() == source_3["Close"].max()
+    assert chart_data["Close"].min() == source_3["Close"].min()
+    assert chart_data["index"].iloc[0] == 0
+    assert chart_data["index"].iloc[-1] == 9999
+    assert chart_data["index"].is_monotonic_increasing
+
+    with raises(ValueError) as bad_ex_3:
+        stock_analyzer.visExpSmoothing(source_3, "Close", 0.1, max_points=5)
+    assert (
+        str(bad_ex_3.value)
+        == "The value of max_points is too small to keep the extremes \
+of every plotted series."
+    )
+
     # test exception handling
     with raises(ValueError) as bad_ex_2:
         stock_analyzer.visExpSmoothing(source_2, "hello", 0.5)
@@ -511,3 +836,442 @@ def test_visExpSmoothing():
         == "Your input name does not match with the dataframe column name! \
             Please enter valid column name!"
     )
+
+
+def test_panel():
+    rng = np.random.default_rng(0)
+    tickers = ["AAA", "BBB", "CCC"]
+    frames = {
+        ticker: pd.DataFrame(
+            rng.normal(100 * (i + 1), 5, size=(40 + 10 * i, 2)),
+            columns=["Open", "Close"],
+            index=pd.date_range("2021-01-01", periods=40 + 10 * i),
+        )
+        for i, ticker in enumerate(tickers)
+    }
+    # interleave the tickers, keeping each one in time order
+    long = pd.concat(
+        [frame.assign(ticker=ticker) for ticker, frame in frames.items()]
+    ).sort_index(kind="stable")
+    names = ["smoothOpen", "smoothClose"]
+
+    # long-format panel
+    stats = stock_analyzer.summaryStats(
+        long, measurements=["Open", "Close"], by="ticker"
+    )
+    assert stats.columns.to_list()[:2] == ["ticker", "measurement"]
+    assert len(stats) == len(tickers) * 2
+    avgs = stock_analyzer.movingAverage(long, 5, names, by="ticker")
+    smoothed = stock_analyzer.exponentialSmoothing(
+        long, names, alpha=0.4, by="ticker"
+    )
+    assert avgs.index.equals(long.index)
+    assert avgs.columns.to_list() == ["ticker"] + names
+    for ticker, frame in frames.items():
+        expected = stock_analyzer.summaryStats(
+            frame, measurements=["Open", "Close"]
+        )
+        result = stats[stats["ticker"] == ticker]
+        assert np.allclose(
+            result.iloc[:, 2:].values.astype(float),
+            expected.iloc[:, 1:].values.astype(float),
+        )
+        rows = (long["ticker"] == ticker).values
+        assert np.allclose(
+            avgs.loc[rows, names].values,
+            stock_analyzer.movingAverage(frame, 5, names).values,
+        )
+        assert np.allclose(
+            smoothed.loc[rows, names].values,
+            stock_analyzer.exponentialSmoothing(frame, names, 0.4).values,
+        )
+
+    # ticker as an index level
+    indexed = long.set_index("ticker", append=True)
+    avgs_2 = stock_analyzer.movingAverage(indexed, 5, names, by="ticker")
+    assert avgs_2.index.equals(indexed.index)
+    assert np.allclose(avgs_2.values, avgs[names].values)
+
+    # MultiIndex columns
+    wide = pd.concat(
+        {ticker: frame.iloc[:40] for ticker, frame in frames.items()}, axis=1
+    )
+    stats_3 = stock_analyzer.summaryStats(wide, measurements=["Close"])
+    assert stats_3["ticker"].to_list() == tickers
+    avgs_3 = stock_analyzer.movingAverage(wide, 5, names)
+    assert avgs_3.columns.to_list()[:2] == [
+        ("AAA", "smoothOpen"),
+        ("AAA", "smoothClose"),
+    ]
+    assert np.allclose(
+        avgs_3["AAA"].values,
+        stock_analyzer.movingAverage(frames["AAA"], 5, names).values,
+    )
+    assert np.allclose(
+        stats_3["mean"].values,
+        [frame["Close"].iloc[:40].mean() for frame in frames.values()],
+    )
+
+    with raises(ValueError) as execinfo_1:
+        stock_analyzer.summaryStats(wide, measurements=["High"])
+    assert (
+        str(execinfo_1.value)
+        == "Your specified measurement 'High' is not a \
+                    column name of the data. \
+            Please double check the column names in data."
+    )
+
+    with raises(ValueError) as execinfo_2:
+        stock_analyzer.movingAverage(long, 5, names, by="symbol")
+    assert (
+        str(execinfo_2.value)
+        == "Your specified ticker column 'symbol' is not a column name or \
+index level of the data."
+    )
+
+
+def test_nan_policy():
+    data = pd.DataFrame(
+        {
+            "a": [np.nan, 1.0, np.nan, 3.0, 5.0, np.nan, 9.0],
+            "b": [2.0, 2.0, 4.0, 4.0, 6.0, 6.0, 8.0],
+        }
+    )
+    names = ["avgA", "avgB"]
+
+    skip = stock_analyzer.movingAverage(data, 2, names, nan_policy="skip")
+    assert np.allclose(
+        skip["avgA"], [np.nan, 1, 1, 3, 4, 5, 9], equal_nan=True
+    )
+    assert np.allclose(skip["avgB"], [2, 2, 3, 4, 5, 6, 7])
+    ffill = stock_analyzer.movingAverage(data, 2, names, nan_policy="ffill")
+    assert np.allclose(
+        ffill["avgA"], [np.nan, 1, 1, 2, 4, 5, 7], equal_nan=True
+    )
+    propagate = stock_analyzer.movingAverage(
+        data, 2, names, nan_policy="propagate"
+    )
+    assert np.allclose(
+        propagate["avgA"],
+        [np.nan, np.nan, np.nan, np.nan, 4, np.nan, np.nan],
+        equal_nan=True,
+    )
+
+    skip = stock_analyzer.exponentialSmoothing(
+        data, names, 0.5, nan_policy="skip"
+    )
+    assert np.allclose(
+        skip["avgA"], [np.nan, 1, 1, 2, 3.5, 3.5, 6.25], equal_nan=True
+    )
+    ffill = stock_analyzer.exponentialSmoothing(
+        data, names, 0.5, nan_policy="ffill"
+    )
+    assert np.allclose(
+        ffill["avgA"], [np.nan, 1, 1, 2, 3.5, 4.25, 6.625], equal_nan=True
+    )
+    propagate = stock_analyzer.exponentialSmoothing(
+        data, names, 0.5, nan_policy="propagate"
+    )
+    assert np.isnan(propagate["avgA"]).all()
+    # columns without NaN are smoothed as usual
+    assert np.allclose(
+        propagate[["avgB"]],
+        stock_analyzer.exponentialSmoothing(data[["b"]], ["avgB"], 0.5),
+    )
+
+    # every ticker of a long panel is handled on its own
+    panel = pd.concat(
+        [data.assign(ticker="X"), data.iloc[::-1].assign(ticker="Y")]
+    )
+    for policy in ["skip", "ffill", "propagate"]:
+        result = stock_analyzer.movingAverage(
+            panel, 3, names, by="ticker", nan_policy=policy
+        )
+        for ticker, part in panel.groupby("ticker"):
+            assert np.allclose(
+                result[panel["ticker"] == ticker][names],
+                stock_analyzer.movingAverage(
+                    part.drop(columns="ticker"), 3, names, nan_policy=policy
+                ),
+                equal_nan=True,
+            )
+
+    # only the first few positions are reported
+    gappy = pd.DataFrame({"a": np.where(np.arange(100) % 3, 1.0, np.nan)})
+    with raises(ValueError) as execinfo_1:
+        stock_analyzer.exponentialSmoothing(gappy, ["a"])
+    assert (
+        str(execinfo_1.value)
+        == "Column a has 34 NaN values at rows [0, 3, 6, 9, 12, ...]."
+    )
+
+    with raises(ValueError) as execinfo_2:
+        stock_analyzer.movingAverage(data, 2, names, nan_policy="drop")
+    assert (
+        str(execinfo_2.value)
+        == "The nan_policy must be one of raise, skip, ffill and propagate."
+    )
+
+
+def test_movingAverage_time_window():
+    rng = np.random.default_rng(0)
+    # irregular intraday bars with gaps
+    times = pd.DatetimeIndex(
+        np.sort(rng.integers(0, 3 * 10 ** 5, size=1000)) * 10 ** 9
+        + pd.Timestamp("2021-03-01").value
+    )
+    data = pd.DataFrame(
+        rng.normal(100, 5, size=(1000, 2)), index=times, columns=["a", "b"]
+    )
+    for window in ["30min", "2H", pd.Timedelta("1D")]:
+        result = stock_analyzer.movingAverage(data, window, ["avgA", "avgB"])
+        assert result.index.equals(data.index)
+        assert np.allclose(result.values, data.rolling(window).mean().values)
+
+    # NaN values are skipped like pandas does
+    gappy = data.mask(rng.random(data.shape) < 0.1)
+    assert np.allclose(
+        stock_analyzer.movingAverage(
+            gappy, "30min", ["avgA", "avgB"], nan_policy="skip"
+        ).values,
+        gappy.rolling("30min").mean().values,
+        equal_nan=True,
+    )
+
+    # every ticker of a long panel gets its own windows
+    panel = pd.concat(
+        [data.assign(ticker="X"), data.iloc[::2].assign(ticker="Y")]
+    )
+    result = stock_analyzer.movingAverage(
+        panel, "1H", ["avgA", "avgB"], by="ticker"
+    )
+    for ticker, part in panel.groupby("ticker"):
+        assert np.allclose(
+            result[panel["ticker"] == ticker][["avgA", "avgB"]].values,
+            part[["a", "b"]].rolling("1H").mean().values,
+        )
+
+    with raises(ValueError) as execinfo_1:
+        stock_analyzer.movingAverage(data.reset_index(drop=True), "1H", "a")
+    assert (
+        str(execinfo_1.value)
+        == "Time-based windows need data with a DatetimeIndex."
+    )
+
+    with raises(ValueError) as execinfo_2:
+        stock_analyzer.movingAverage(data.iloc[::-1], "1H", ["a", "b"])
+    assert (
+        str(execinfo_2.value)
+        == "The DatetimeIndex must be increasing for time-based windows."
+    )
+
+    with raises(ValueError) as execinfo_3:
+        stock_analyzer.movingAverage(data, "monthly", ["a", "b"])
+    assert (
+        str(execinfo_3.value)
+        == "The value of window must be a positive integer or a positive \
+time span such as '30min'."
+    )
+
+
+def test_sweeps():
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame(
+        100 + rng.normal(size=(300, 2)).cumsum(axis=0),
+        index=pd.bdate_range("2020-01-01", periods=300, name="Date"),
+        columns=["Open", "Close"],
+    )
+    windows = [1, 5, 20, 400]
+    fits, errors = stock_analyzer.movingAverageSweep(
+        data, windows, output="array"
+    )
+    assert fits.shape == (4, 300, 2)
+    for i, window in enumerate(windows):
+        expected = stock_analyzer.movingAverage(data, window, ["o", "c"])
+        assert np.allclose(fits[i], expected.values)
+        residuals = data.values[1:] - expected.values[:-1]
+        assert np.allclose(
+            errors[errors["window"] == window][["mse", "mae"]].values,
+            np.column_stack(
+                [(residuals ** 2).mean(axis=0), np.abs(residuals).mean(axis=0)]
+            ),
+        )
+    assert errors.columns.to_list() == ["window", "measurement", "mse", "mae"]
+    assert errors["measurement"].to_list() == ["Open", "Close"] * 4
+
+    alphas = [0, 0.05, 0.5, 1]
+    fits, errors = stock_analyzer.exponentialSmoothingSweep(data, alphas)
+    assert fits.columns.to_list() == ["alpha", "Date", "measurement", "value"]
+    assert len(fits) == 4 * 300 * 2
+    for alpha in alphas:
+        expected = stock_analyzer.exponentialSmoothing(data, ["o", "c"], alpha)
+        tidy = fits[fits["alpha"] == alpha].pivot(
+            index="Date", columns="measurement", values="value"
+        )
+        assert np.allclose(tidy[["Open", "Close"]].values, expected.values)
+    only_errors, same_errors = stock_analyzer.exponentialSmoothingSweep(
+        data, alphas, output=None
+    )
+    assert only_errors is None
+    assert np.allclose(same_errors[["mse", "mae"]], errors[["mse", "mae"]])
+
+    with raises(ValueError) as execinfo_1:
+        stock_analyzer.exponentialSmoothingSweep(data, [0.2, 1.5])
+    assert str(execinfo_1.value) == "The value of alpha must between 0 and 1."
+
+    with raises(ValueError) as execinfo_2:
+        stock_analyzer.movingAverageSweep(data, [5], output="list")
+    assert str(execinfo_2.value) == "The output must be frame, array or None."
+
+    with raises(ValueError) as execinfo_3:
+        stock_analyzer.movingAverageSweep(data, [])
+    assert (
+        str(execinfo_3.value) == "At least one parameter value must be given."
+    )
+
+
+def test_optimalAlpha():
+    rng = np.random.default_rng(0)
+    level = 100 + rng.normal(size=(400, 3)).cumsum(axis=0)
+    data = pd.DataFrame(
+        level + rng.normal(size=(400, 3)) * [0.1, 1, 5],
+        columns=["Open", "Close", "Volume"],
+    )
+    alphas = stock_analyzer.optimalAlpha(data)
+    assert alphas.index.to_list() == ["Open", "Close", "Volume"]
+    grid = np.linspace(0, 1, 2001)
+    _, errors = stock_analyzer.exponentialSmoothingSweep(
+        data, grid, output=None
+    )
+    best = errors.loc[errors.groupby("measurement")["mse"].idxmin()]
+    assert np.allclose(
+        alphas.values,
+        best.set_index("measurement").loc[alphas.index, "alpha"],
+        atol=0.002,
+    )
+
+    smoothed = stock_analyzer.exponentialSmoothing(
+        data, ["o", "c", "v"], alpha="auto"
+    )
+    assert np.allclose(smoothed.attrs["alpha"].values, alphas.values)
+    for name, alpha in zip(["Open", "Close", "Volume"], alphas.values):
+        expected = stock_analyzer.exponentialSmoothing(
+            data[[name]], ["x"], alpha
+        )
+        assert np.allclose(smoothed[name[0].lower()], expected["x"])
+
+    panel = pd.concat(
+        [data.iloc[:150].assign(ticker="A"), data.assign(ticker="B")]
+    ).sample(frac=1, random_state=0).sort_index(kind="stable")
+    panel_alphas = stock_analyzer.optimalAlpha(panel, by="ticker")
+    assert sorted(panel_alphas.index) == ["A", "B"]
+    assert np.allclose(panel_alphas.loc["B"], alphas.values)
+    assert np.allclose(
+        panel_alphas.loc["A"], stock_analyzer.optimalAlpha(data.iloc[:150])
+    )
+    smoothed = stock_analyzer.exponentialSmoothing(
+        panel, ["o", "c", "v"], alpha="auto", by="ticker"
+    )
+    assert np.allclose(smoothed.attrs["alpha"].values, panel_alphas.values)
+    expected = stock_analyzer.exponentialSmoothing(
+        data, ["o", "c", "v"], alpha=alphas["Open"]
+    )
+    assert np.allclose(
+        smoothed[smoothed["ticker"] == "B"]["o"].values, expected["o"]
+    )
+
+    with raises(ValueError) as execinfo_1:
+        stock_analyzer.exponentialSmoothing(
+            data, ["o", "c", "v"], alpha="auto", nan_policy="ffill"
+        )
+    assert (
+        str(execinfo_1.value)
+        == "alpha='auto' only supports the nan_policy raise."
+    )
+
+    with raises(ValueError) as execinfo_2:
+        stock_analyzer.exponentialSmoothing(data, ["o", "c", "v"], "best")
+    assert str(execinfo_2.value) == "The value of alpha must between 0 and 1."
+
+
+def test_forecast():
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame(
+        100 + rng.normal(size=(200, 2)).cumsum(axis=0),
+        columns=["Open", "Close"],
+    )
+    result = stock_analyzer.forecast(data, 3, alpha=0.4)
+    assert result.index.to_list() == [1, 2, 3]
+    assert result.columns.to_list() == [
+        (name, statistic)
+        for name in ["Open", "Close"]
+        for statistic in ["forecast", "lower", "upper"]
+    ]
+    smoothed = stock_analyzer.exponentialSmoothing(data, ["o", "c"], 0.4)
+    assert np.allclose(result["Close"]["forecast"], smoothed["c"].iloc[-1])
+    residuals = data["Close"].values[1:] - smoothed["c"].values[:-1]
+    half = 1.959964 * np.sqrt(
+        (residuals ** 2).mean() * (1 + 0.16 * np.arange(3))
+    )
+    assert np.allclose(
+        result["Close"]["upper"] - result["Close"]["forecast"], half
+    )
+
+    averaged = stock_analyzer.movingAverage(data, 10, ["o", "c"])
+    result = stock_analyzer.forecast(
+        data, 2, method="movingAverage", window=10, interval=None
+    )
+    assert result.columns.to_list() == [
+        ("Open", "forecast"),
+        ("Close", "forecast"),
+    ]
+    assert np.allclose(result.values, averaged.values[-1])
+
+    # Holt's linear trend method, step by step
+    alpha, beta = 0.5, 0.2
+    close = data["Close"].values
+    level, trend = close[0], close[1] - close[0]
+    for value in close[1:]:
+        previous = level
+        level = alpha * value + (1 - alpha) * (level + trend)
+        trend = beta * (level - previous) + (1 - beta) * trend
+    result = stock_analyzer.forecast(data, 4, alpha=alpha, beta=beta)
+    assert np.allclose(
+        result["Close"]["forecast"], level + trend * np.arange(1, 5)
+    )
+
+    panel = pd.concat(
+        [data.iloc[:50].assign(ticker="A"), data.assign(ticker="B")],
+        ignore_index=True,
+    )
+    result = stock_analyzer.forecast(panel, 2, alpha="auto", by="ticker")
+    assert result.index.names == ["ticker", "step"]
+    assert np.allclose(
+        result.loc["B"].values,
+        stock_analyzer.forecast(data, 2, alpha="auto").values,
+    )
+    assert np.allclose(
+        result.loc["A"].values,
+        stock_analyzer.forecast(data.iloc[:50], 2, alpha="auto").values,
+    )
+
+    with raises(ValueError) as execinfo_1:
+        stock_analyzer.forecast(data, 0)
+    assert (
+        str(execinfo_1.value)
+        == "The value of horizon must be a positive integer."
+    )
+
+    with raises(ValueError) as execinfo_2:
+        stock_analyzer.forecast(data, 2, method="movingAverage", beta=0.1)
+    assert (
+        str(execinfo_2.value)
+        == "A trend is only supported for exponentialSmoothing."
+    )
+
+    with raises(ValueError) as execinfo_3:
+        stock_analyzer.forecast(data, 2, interval=95)
+    assert (
+        str(execinfo_3.value)
+        == "The value of interval must be between 0 and 1."
+    )
@@ -0,0 +1,83 @@
+from stock_analyzer import stock_analyzer
+from stock_analyzer.streaming import ExponentialSmoother, MovingAverageSmoother
+from pytest import raises
+import pandas as pd
+import numpy as np
+
+
+def test_MovingAverageSmoother():
+    rng = np.random.default_rng(0)
+    source = pd.DataFrame(
+        rng.normal(100, 5, size=(400, 3)), columns=["1", "2", "3"]
+    )
+    names = ["movingAverage" + name for name in source.columns]
+
+    for window in [1, 5, 30]:
+        smoother = MovingAverageSmoother(window, names)
+        # batches smaller than, equal to and larger than the window
+        bounds = [0, 0, 3, 4, 9, 9 + window, 60, 61, 250, 400]
+        parts = [
+            smoother.update(source.iloc[start:stop])
+            for start, stop in zip(bounds[:-1], bounds[1:])
+        ]
+        streamed = pd.concat(parts)
+        batch = stock_analyzer.movingAverage(source, window, names)
+
+        assert streamed.columns.to_list() == names
+        assert streamed.index.equals(source.index)
+        assert np.allclose(streamed.values, batch.values)
+
+    # column count changes
+    with raises(ValueError) as execinfo_1:
+        smoother.update(source.iloc[:2, :2])
+    assert (
+        str(execinfo_1.value)
+        == "The number of columns must not change between updates."
+    )
+
+    # wrong window value
+    with raises(ValueError) as execinfo_2:
+        MovingAverageSmoother(0, names)
+    assert (
+        str(execinfo_2.value)
+        == "The value of window must be a positive integer."
+    )
+
+    # NaN in the new rows
+    data_3 = pd.DataFrame([[1, 2], [np.nan, 2]], columns=["e", "2"])
+    with raises(ValueError) as execinfo_3:
+        MovingAverageSmoother(3, ["e", "2"]).update(data_3)
+    assert str(execinfo_3.value) == "Column e has 1 NaN values at rows [1]."
+
+
+def test_ExponentialSmoother():
+    rng = np.random.default_rng(0)
+    source = pd.DataFrame(
+        rng.normal(100, 5, size=(400, 3)), columns=["1", "2", "3"]
+    )
+    names = ["expSmoothing" + name for name in source.columns]
+
+    for alpha in [0, 0.3, 1]:
+        smoother = ExponentialSmoother(names, alpha=alpha)
+        bounds = [0, 0, 1, 7, 200, 400]
+        streamed = pd.concat(
+            [
+                smoother.update(source.iloc[start:stop])
+                for start, stop in zip(bounds[:-1], bounds[1:])
+            ]
+        )
+        batch = stock_analyzer.exponentialSmoothing(source, names, alpha)
+
+        assert streamed.index.equals(source.index)
+        assert np.allclose(streamed.values, batch.values)
+
+    with raises(ValueError) as execinfo_1:
+        smoother.update(source.iloc[:2, :2])
+    assert (
+        str(execinfo_1.value)
+        == "The number of columns must not change between updates."
+    )
+
+    with raises(ValueError) as execinfo_2:
+        ExponentialSmoother(names, alpha=1.5)
+    assert str(execinfo_2.value) == "The value of alpha must between 0 and 1."